@@ -1,4 +1,5 @@
 from django.contrib import messages
+from django.conf import settings
 from django.contrib.auth import get_user_model, login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import SetPasswordForm
@@ -9,7 +10,7 @@ from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_decode
 from django.db.models import Count
 from django.views.decorators.http import require_POST
-from apps.core.integrations.sova import SovaClient
+from apps.projects.services.sova_catalogue import get_sova_accounts_with_projects
 from apps.projects.models import ProjectMeta
 from .utils.org_access import get_accessible_orgunit_ids
 from apps.processes.views import (
@@ -26,6 +27,7 @@ from django.db.models.functions import Coalesce
 
 from apps.processes.models import (
     AssessmentUsage,
+    BulkSendJob,
     Candidate,
     TestProcess,
     TestInvitation,
@@ -106,7 +108,15 @@ import uuid
 
 from apps.processes.forms import CandidateCreateForm
 from apps.processes.models import ProcessLabel
-from apps.processes.services.send_tests import send_assessments_and_emails
+from apps.processes.services.send_tests import (
+    can_resume_job,
+    claim_send_job,
+    create_send_job,
+    get_visible_send_job,
+    run_send_job,
+    serialize_send_job,
+    start_send_job,
+)
 
 
 User = get_user_model()
@@ -1754,6 +1764,7 @@ def admin_process_detail(request, pk):
         TestInvitation.objects
         .filter(process=process)
         .select_related("candidate")
+        .without_ai_content()
         .order_by("-created_at")
     )
 
@@ -1764,12 +1775,16 @@ def admin_process_detail(request, pk):
 
     total_sent = invitations.count()
 
+    latest_send_job = get_visible_send_job(process)
+
     return render(request, "admin/accounts/customer/process_detail.html", {
         "process": process,
         "invitations": invitations,
         "status_counts": status_counts,
         "total_sent": total_sent,
         "self_reg_url": request.build_absolute_uri(process.get_self_registration_url()),
+        "latest_send_job": latest_send_job,
+        "latest_send_job_can_resume": bool(latest_send_job and can_resume_job(latest_send_job)),
     })
 
 
@@ -2524,11 +2539,10 @@ def admin_process_create_for_user(request, user_pk):
         kwargs={"pk": user_obj.pk}
     )
 
-    client = SovaClient()
     error = None
 
     try:
-        accounts = client.get_accounts_with_projects()
+        accounts = get_sova_accounts_with_projects()
     except Exception as e:
         accounts = []
         error = str(e)
@@ -2682,11 +2696,10 @@ def admin_process_update(request, pk):
     old_proj = (obj.project_code or "").strip()
     locked = obj.is_template_locked()
 
-    client = SovaClient()
     error = None
 
     try:
-        accounts = client.get_accounts_with_projects()
+        accounts = get_sova_accounts_with_projects()
     except Exception as e:
         accounts = []
         error = str(e)
@@ -2845,28 +2858,34 @@ def admin_process_send_tests(request, pk):
         messages.warning(request, "Välj minst en kandidat.")
         return redirect("accounts:admin_process_detail", pk=process.pk)
 
-    invitations = (
+    invitation_ids = list(
         TestInvitation.objects
         .filter(process=process, id__in=invitation_ids)
-        .select_related("candidate")
+        .values_list("id", flat=True)
     )
 
-    result = send_assessments_and_emails(
+    job = create_send_job(
         process=process,
-        invitations=invitations,
+        invitation_ids=invitation_ids,
         actor_user=request.user,
         context="admin",
     )
 
-    if result["sent_count"]:
-        messages.success(request, f"Skickade test till {result['sent_count']} kandidat(er).")
+    if settings.BULK_SEND_ASYNC:
+        start_send_job(job)
+        messages.info(request, f"Skickar test till {job.total} kandidat(er). Förloppet visas i listan.")
+        return redirect("accounts:admin_process_detail", pk=process.pk)
+
+    job = run_send_job(job)
 
-    if result["errors"]:
-        for err in result["errors"]:
-            messages.error(request, f"Kunde inte skicka till {err['email']}: {err['error']}")
+    if job.sent_count:
+        messages.success(request, f"Skickade test till {job.sent_count} kandidat(er).")
 
-    if result["sent_count"] == 0:
-        if result["skipped_count"]:
+    for err in job.errors():
+        messages.error(request, f"Kunde inte skicka till {err['email']}: {err['error']}")
+
+    if job.sent_count == 0:
+        if job.skipped_count:
             messages.info(request, "Inget skickades (alla markerade var redan skickade/igång/klara).")
         else:
             messages.warning(request, "Inget skickades. Kolla felmeddelanden ovan.")
@@ -2874,6 +2893,30 @@ def admin_process_send_tests(request, pk):
     return redirect("accounts:admin_process_detail", pk=process.pk)
 
 
+@admin_required
+def admin_process_send_job_status(request, pk, job_id):
+    process = get_object_or_404(TestProcess, pk=pk)
+    job = get_object_or_404(BulkSendJob, pk=job_id, process=process)
+
+    return JsonResponse(serialize_send_job(job))
+
+
+@admin_required
+@require_POST
+def admin_process_send_job_resume(request, pk, job_id):
+    process = get_object_or_404(TestProcess, pk=pk)
+    job = get_object_or_404(BulkSendJob, pk=job_id, process=process)
+
+    if not claim_send_job(job):
+        messages.info(request, "Utskicket pågår redan eller är klart.")
+        return redirect("accounts:admin_process_detail", pk=process.pk)
+
+    start_send_job(job)
+
+    messages.info(request, f"Försöker igen för {len(job.pending_invitation_ids())} kandidat(er).")
+    return redirect("accounts:admin_process_detail", pk=process.pk)
+
+
 
 @admin_required
 def admin_process_invitation_statuses(request, pk):
@@ -2882,7 +2925,7 @@ def admin_process_invitation_statuses(request, pk):
     qs = (
         TestInvitation.objects
         .filter(process=process)
-        .select_related("candidate")
+        .without_ai_content()
         .order_by("created_at")
     )
 
@@ -3156,6 +3199,7 @@ def company_process_detail(request, company_pk, process_pk):
         TestInvitation.objects
         .filter(process=process)
         .select_related("candidate")
+        .without_ai_content()
         .order_by("-created_at")
     )
 
@@ -3164,6 +3208,7 @@ def company_process_detail(request, company_pk, process_pk):
         .filter(process=process)
         .select_related("candidate", "created_by")
         .prefetch_related("reports")
+        .without_ai_content()
         .order_by("-created_at")
     )
 
@@ -3595,14 +3640,13 @@ def company_process_create(request, company_pk):
     company = get_object_or_404(Company, pk=company_pk)
     org_units = OrgUnit.objects.filter(company=company).order_by("name")
 
-    client = SovaClient()
     error = None
 
     # --------------------------------------------------
     # 1. Hämta SOVA-projekt från API
     # --------------------------------------------------
     try:
-        accounts = client.get_accounts_with_projects()
+        accounts = get_sova_accounts_with_projects()
     except Exception as e:
         accounts = []
         error = str(e)
@@ -12,7 +12,7 @@ import os
 
 
 from django.shortcuts import get_object_or_404
-from openai import OpenAI
+from apps.core.ai.openai_client import get_openai_client
 
 from apps.processes.models import TestProcess
 from apps.ai_chat.services.candidate_chat_context import (
@@ -208,7 +208,7 @@ def chat_stream_api(request):
             status=500,
         )
 
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client()
 
     def stream_response():
         try:
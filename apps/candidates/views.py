@@ -207,6 +207,7 @@ def candidate_list(request):
         TestInvitation.objects
         .filter(process_id__in=accessible_process_ids)
         .select_related("process")
+        .without_ai_content(keep=["sova_activities"])
     )
 
     # ---------------------------------------------------------
@@ -217,6 +218,7 @@ def candidate_list(request):
         .filter(process_id__in=accessible_process_ids)
         .select_related("process", "candidate")
         .prefetch_related("assessment_results__scores")
+        .without_ai_content()
     )
 
     live_candidate_ids = {
@@ -1,3 +1,159 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import (
+    AICallMetric,
+    AIRateLimitBucket,
+    AIResultCache,
+    SovaProjectResultsSnapshot,
+    WebhookDelivery,
+)
+
+
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "provider",
+        "status",
+        "request_id",
+        "attempts",
+        "invitation",
+        "received_at",
+        "processed_at",
+    )
+
+    list_filter = (
+        "provider",
+        "status",
+        "received_at",
+    )
+
+    search_fields = (
+        "request_id",
+        "payload_hash",
+    )
+
+    raw_id_fields = (
+        "invitation",
+    )
+
+    readonly_fields = (
+        "payload_hash",
+        "received_at",
+        "locked_at",
+        "next_attempt_at",
+        "processed_at",
+    )
+
+    ordering = ("-received_at",)
+
+
+@admin.register(SovaProjectResultsSnapshot)
+class SovaProjectResultsSnapshotAdmin(admin.ModelAdmin):
+    list_display = (
+        "sova_project_id",
+        "candidate_count",
+        "fetched_at",
+        "refresh_started_at",
+    )
+
+    search_fields = (
+        "sova_project_id",
+    )
+
+    readonly_fields = (
+        "candidates",
+        "candidate_count",
+        "fetched_at",
+        "refresh_started_at",
+        "last_error",
+    )
+
+
+@admin.register(AIResultCache)
+class AIResultCacheAdmin(admin.ModelAdmin):
+    list_display = (
+        "key",
+        "model",
+        "temperature",
+        "content_length",
+        "hit_count",
+        "created_at",
+        "last_used_at",
+    )
+
+    list_filter = (
+        "model",
+    )
+
+    search_fields = (
+        "key",
+    )
+
+    readonly_fields = (
+        "key",
+        "model",
+        "temperature",
+        "content",
+        "content_length",
+        "hit_count",
+        "created_at",
+        "last_used_at",
+    )
+
+    ordering = ("-last_used_at",)
+
+
+@admin.register(AICallMetric)
+class AICallMetricAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "feature",
+        "kind",
+        "model",
+        "cached",
+        "is_repair",
+        "output_repair",
+        "success",
+        "prompt_tokens",
+        "completion_tokens",
+        "ttft_ms",
+        "duration_ms",
+        "retries",
+    )
+
+    list_filter = (
+        "feature",
+        "kind",
+        "cached",
+        "is_repair",
+        "output_repair",
+        "prompt_key",
+        "success",
+        "created_at",
+    )
+
+    search_fields = (
+        "feature",
+        "model",
+        "prompt_hash",
+        "error",
+    )
+
+    ordering = ("-created_at",)
+
+
+@admin.register(AIRateLimitBucket)
+class AIRateLimitBucketAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "requests",
+        "tokens",
+        "refilled_at",
+        "backoff_until",
+        "interactive_waiting_until",
+    )
+
+    search_fields = (
+        "name",
+    )
@@ -1,5 +1,6 @@
 from .openai_client import get_openai_client, get_chat_model
 from .rag import retrieve_context
+from .result_cache import bypass_result_cache
 
 
 def ask_ai(message: str, scope: str = "base", top_k: int = 5) -> str:
@@ -24,9 +25,11 @@ User message:
 {message}
 """.strip()
 
-    resp = client.chat.completions.create(
-        model=get_chat_model(),
-        messages=[{"role": "user", "content": user_prompt}],
-        temperature=0.2,
-    )
+    # A chat answer is never reused.
+    with bypass_result_cache(store=False):
+        resp = client.chat.completions.create(
+            model=get_chat_model(),
+            messages=[{"role": "user", "content": user_prompt}],
+            temperature=0.2,
+        )
     return resp.choices[0].message.content or ""
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import Iterable
 from .openai_client import get_openai_client, get_chat_model
 from .rag import retrieve_context
+from .result_cache import bypass_result_cache
 
 
 def stream_ai(message: str, scope: str = "base", top_k: int = 5) -> Iterable[str]:
@@ -27,12 +28,14 @@ User message:
 """.strip()
 
     # 2) Streama svaret från OpenAI
-    stream = client.chat.completions.create(
-        model=get_chat_model(),
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.2,
-        stream=True,
-    )
+    # A chat answer is never reused.
+    with bypass_result_cache(store=False):
+        stream = client.chat.completions.create(
+            model=get_chat_model(),
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            stream=True,
+        )
 
     for event in stream:
         delta = event.choices[0].delta
@@ -9,6 +9,11 @@ from .openai_client import (
     get_openai_client,
     get_chat_model,
 )
+from .structured_output import (
+    parse_with_repair,
+    questions_response_format,
+    structured_output_enabled,
+)
 from .language import (
     get_ai_language_instruction,
     get_ai_language_update_fields,
@@ -35,11 +40,15 @@ def build_cognitive_questions_prompt(
     owner,
     cognitive_results: list[dict[str, Any]],
     language_code: str = "en",
+    structured_output: bool = False,
 ) -> str:
     """
     Build a prompt for practical, purpose-aware cognitive
     follow-up questions.
 
+    With structured_output the answer is one JSON object constrained
+    by questions_response_format instead of NDJSON events.
+
     This module generates questions only. It does not generate
     or update the cognitive interpretation.
     """
@@ -94,6 +103,43 @@ the selected process purpose.
 
 Keep the questions broadly applicable. Do not invent specific role
 tasks, systems, responsibilities or working conditions.
+""".strip()
+
+    if structured_output:
+        output_format_instruction = """
+OUTPUT FORMAT
+Return one JSON object with a title, a label, exactly 3 questions
+(each with question, why and listen_for) and a context_note briefly
+explaining the evidence and context used.
+""".strip()
+
+    else:
+        output_format_instruction = """
+STREAMING OUTPUT FORMAT
+Return newline-delimited JSON, also called NDJSON.
+
+Every JSON object must be on one single line.
+Do not use Markdown.
+Do not use code fences.
+Do not add text outside the JSON objects.
+
+Return events in this exact order:
+
+1. One meta event:
+
+{"type":"meta","title":"Cognitive questions","label":"AI-supported questions"}
+
+2. One questions event containing exactly 3 objects:
+
+{"type":"questions","items":[{"question":"Question one","why":"Why this question is useful","listen_for":"Concrete evidence to look for"},{"question":"Question two","why":"Why this question is useful","listen_for":"Concrete evidence to look for"},{"question":"Question three","why":"Why this question is useful","listen_for":"Concrete evidence to look for"}]}
+
+3. One context_note event:
+
+{"type":"context_note","text":"Brief explanation of the evidence and context used."}
+
+4. One final done event:
+
+{"type":"done"}
 """.strip()
 
     return f"""
@@ -226,31 +272,7 @@ LANGUAGE
 {language_instruction}
 Translate every user-facing JSON string, including title and label.
 
-STREAMING OUTPUT FORMAT
-Return newline-delimited JSON, also called NDJSON.
-
-Every JSON object must be on one single line.
-Do not use Markdown.
-Do not use code fences.
-Do not add text outside the JSON objects.
-
-Return events in this exact order:
-
-1. One meta event:
-
-{{"type":"meta","title":"Cognitive questions","label":"AI-supported questions"}}
-
-2. One questions event containing exactly 3 objects:
-
-{{"type":"questions","items":[{{"question":"Question one","why":"Why this question is useful","listen_for":"Concrete evidence to look for"}},{{"question":"Question two","why":"Why this question is useful","listen_for":"Concrete evidence to look for"}},{{"question":"Question three","why":"Why this question is useful","listen_for":"Concrete evidence to look for"}}]}}
-
-3. One context_note event:
-
-{{"type":"context_note","text":"Brief explanation of the evidence and context used."}}
-
-4. One final done event:
-
-{{"type":"done"}}
+{output_format_instruction}
 """.strip()
 
 
@@ -647,6 +669,78 @@ def _extract_cognitive_question_events(
     return events
 
 
+def _collect_cognitive_question_events(
+    raw_text: str,
+) -> dict[str, dict[str, Any] | None]:
+    """
+    The first meta, context_note and valid questions event of a
+    response. questions is None without exactly three valid questions.
+    """
+
+    meta_event: dict[str, Any] | None = None
+    context_event: dict[str, Any] | None = None
+    questions_event: dict[str, Any] | None = None
+
+    for event in _extract_cognitive_question_events(
+        raw_text
+    ):
+        event_type = str(
+            event.get("type")
+            or ""
+        ).strip().lower()
+
+        if (
+            event_type == "meta"
+            and meta_event is None
+        ):
+            meta_event = event
+            continue
+
+        if (
+            event_type == "context_note"
+            and context_event is None
+        ):
+            context_event = {
+                "type": "context_note",
+                "text": str(
+                    event.get("text")
+                    or event.get("context_note")
+                    or event.get("content")
+                    or ""
+                ).strip(),
+            }
+
+            continue
+
+        if (
+            event_type in {
+                "questions",
+                "question_list",
+                "cognitive_questions",
+            }
+            and questions_event is None
+        ):
+            questions = (
+                _normalise_cognitive_questions(
+                    _get_cognitive_question_items(
+                        event
+                    )
+                )
+            )
+
+            if len(questions) == 3:
+                questions_event = {
+                    "type": "questions",
+                    "items": questions,
+                }
+
+    return {
+        "meta": meta_event,
+        "questions": questions_event,
+        "context_note": context_event,
+    }
+
+
 def stream_cognitive_questions(
     *,
     owner,
@@ -674,10 +768,13 @@ def stream_cognitive_questions(
 
     client = get_openai_client()
 
+    structured_output = structured_output_enabled()
+
     prompt = build_cognitive_questions_prompt(
         owner=owner,
         cognitive_results=cognitive_results,
         language_code=language_code,
+        structured_output=structured_output,
     )
 
     system_message = (
@@ -689,6 +786,17 @@ def stream_cognitive_questions(
         f"{system_language_instruction}"
     )
 
+    # A schema-constrained answer instead of NDJSON events.
+    response_options = (
+        {
+            "response_format": questions_response_format(
+                "cognitive_questions"
+            ),
+        }
+        if structured_output
+        else {}
+    )
+
     stream = client.chat.completions.create(
         model=get_chat_model(),
 
@@ -705,6 +813,7 @@ def stream_cognitive_questions(
 
         temperature=0.2,
         stream=True,
+        **response_options,
     )
 
     response_parts: list[str] = []
@@ -750,71 +859,20 @@ def stream_cognitive_questions(
             "The AI returned an empty cognitive questions response."
         )
 
-    events = (
-        _extract_cognitive_question_events(
-            full_response
-        )
-    )
-
-    meta_event: dict[str, Any] | None = None
-    context_event: dict[str, Any] | None = None
-    questions_event: dict[str, Any] | None = None
-
-    for event in events:
-        event_type = str(
-            event.get("type")
-            or ""
-        ).strip().lower()
-
-        if (
-            event_type == "meta"
-            and meta_event is None
-        ):
-            meta_event = event
-            continue
-
-        if (
-            event_type == "context_note"
-            and context_event is None
-        ):
-            context_event = {
-                "type": "context_note",
-                "text": str(
-                    event.get("text")
-                    or event.get("context_note")
-                    or event.get("content")
-                    or ""
-                ).strip(),
-            }
-
-            continue
-
-        if event_type in {
-            "questions",
-            "question_list",
-            "cognitive_questions",
-        }:
-            questions = (
-                _normalise_cognitive_questions(
-                    _get_cognitive_question_items(
-                        event
-                    )
-                )
-            )
-
-            if len(questions) == 3:
-                questions_event = {
-                    "type": "questions",
-                    "items": questions,
-                }
-
-                continue
-
     # --------------------------------------------------------
     # Repair a missing or malformed questions event
     # --------------------------------------------------------
-    if questions_event is None:
-        repair_prompt = f"""
+    def request_repair() -> str:
+        if structured_output:
+            repair_prompt = (
+                "The previous response was malformed. "
+                "Generate the result again and follow the "
+                "JSON structure exactly.\n\n"
+                + prompt
+            )
+
+        else:
+            repair_prompt = f"""
 The previous response did not contain exactly three valid cognitive
 questions.
 
@@ -864,10 +922,11 @@ ORIGINAL REQUEST
 
                 temperature=0.1,
                 stream=False,
+                **response_options,
             )
         )
 
-        repair_content = str(
+        return str(
             repair_response
             .choices[0]
             .message
@@ -875,57 +934,46 @@ ORIGINAL REQUEST
             or ""
         ).strip()
 
-        repair_events = (
-            _extract_cognitive_question_events(
-                repair_content
-            )
+    def parse(text: str) -> dict[str, Any] | None:
+        collected = _collect_cognitive_question_events(
+            text
         )
 
-        for event in repair_events:
-            event_type = str(
-                event.get("type")
-                or ""
-            ).strip().lower()
-
-            if event_type not in {
-                "questions",
-                "question_list",
-                "cognitive_questions",
-            }:
-                continue
-
-            repaired_questions = (
-                _normalise_cognitive_questions(
-                    _get_cognitive_question_items(
-                        event
-                    )
-                )
-            )
+        if collected["questions"] is None:
+            return None
 
-            if len(repaired_questions) == 3:
-                questions_event = {
-                    "type": "questions",
-                    "items": repaired_questions,
-                }
+        return collected
 
-                break
+    # Malformed JSON is repaired locally first and generated again
+    # only when that fails.
+    parsed = parse_with_repair(
+        full_response,
+        parse=parse,
+        request_repair=request_repair,
+    )
 
-    if questions_event is None:
+    if parsed is None:
         print(
             "[COGNITIVE QUESTIONS RAW RESPONSE]",
             full_response,
         )
 
-        print(
-            "[COGNITIVE QUESTIONS PARSED EVENTS]",
-            events,
-        )
-
         raise ValueError(
             "The AI response did not contain "
             "three valid cognitive questions."
         )
 
+    meta_event = parsed["meta"]
+    questions_event = parsed["questions"]
+
+    # A repair call answers with the questions only.
+    context_event = (
+        parsed["context_note"]
+        or _collect_cognitive_question_events(
+            full_response
+        )["context_note"]
+    )
+
     if meta_event is None:
         meta_event = {
             "type": "meta",
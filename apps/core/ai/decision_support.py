@@ -18,6 +18,7 @@ from .openai_client import (
     get_chat_model,
     get_openai_client,
 )
+from .stream_events import iter_stream_events
 from .shared_context import (
     build_shared_ai_context,
     get_process_purpose_key,
@@ -1125,8 +1126,6 @@ def apply_pre_interview_decision_support_event(
 # NDJSON parsing
 # ============================================================
 
-_JSON_DECODER = json.JSONDecoder()
-
 
 def _normalise_event_type(
     value: Any,
@@ -1179,120 +1178,6 @@ def _normalise_event_type(
     )
 
 
-def _extract_json_events_from_buffer(
-    buffer: str,
-) -> tuple[list[dict[str, Any]], str]:
-    """
-    Extract complete JSON objects from a streaming text buffer.
-
-    Unlike line-based NDJSON parsing, this also supports JSON
-    objects formatted across multiple lines.
-    """
-
-    events: list[dict[str, Any]] = []
-    remaining = buffer
-
-    while True:
-        remaining = remaining.lstrip()
-
-        if not remaining:
-            return events, ""
-
-        # Ignore Markdown code-fence openings.
-        if remaining.startswith("```"):
-            newline_index = remaining.find(
-                "\n"
-            )
-
-            if newline_index == -1:
-                return events, remaining
-
-            remaining = remaining[
-                newline_index + 1:
-            ]
-
-            continue
-
-        object_start = remaining.find("{")
-
-        if object_start == -1:
-            # Keep a small trailing fragment in case the next
-            # stream chunk completes an opening JSON object.
-            return events, remaining[-200:]
-
-        if object_start > 0:
-            remaining = remaining[
-                object_start:
-            ]
-
-        try:
-            payload, end_index = (
-                _JSON_DECODER.raw_decode(
-                    remaining
-                )
-            )
-        except json.JSONDecodeError:
-            # The JSON object is probably incomplete. Keep it
-            # until more stream content arrives.
-            return events, remaining
-
-        remaining = remaining[
-            end_index:
-        ]
-
-        if not isinstance(
-            payload,
-            dict,
-        ):
-            continue
-
-        event_type = _normalise_event_type(
-            payload.get("type")
-        )
-
-        if not event_type:
-            continue
-
-        payload["type"] = event_type
-        events.append(payload)
-
-
-
-def _parse_event_line(
-    raw_line: str,
-) -> dict[str, Any] | None:
-    line = raw_line.strip()
-
-    if not line:
-        return None
-
-    if line in {
-        "```",
-        "```json",
-        "```ndjson",
-    }:
-        return None
-
-    try:
-        event = json.loads(line)
-    except json.JSONDecodeError:
-        return None
-
-    if not isinstance(event, dict):
-        return None
-
-    event_type = _normalise_event_type(
-        event.get("type")
-    )
-
-    if not event_type:
-        return None
-
-    event["type"] = event_type
-
-    return event
-
-
 # ============================================================
 # Streaming
 # ============================================================
@@ -1353,57 +1238,11 @@ def stream_pre_interview_decision_support(
         stream=True,
     )
 
-    buffer = ""
-
-    for response_event in stream:
-        delta = (
-            response_event
-            .choices[0]
-            .delta
-        )
-
-        if (
-            not delta
-            or not delta.content
-        ):
-            continue
-
-        buffer += delta.content
-
-        parsed_events, buffer = (
-            _extract_json_events_from_buffer(
-                buffer
-            )
-        )
-
-        for parsed_event in parsed_events:
-            yield parsed_event
-
-    parsed_events, buffer = (
-        _extract_json_events_from_buffer(
-            buffer
-        )
-    )
-
-    for parsed_event in parsed_events:
-        yield parsed_event
-
-    trailing_content = (
-        buffer
-        .replace("```json", "")
-        .replace("```ndjson", "")
-        .replace("```", "")
-        .strip()
+    yield from iter_stream_events(
+        stream,
+        normalise_type=_normalise_event_type,
     )
 
-    if trailing_content:
-        final_event = _parse_event_line(
-            trailing_content
-        )
-
-        if final_event:
-            yield final_event
-
 
 # ============================================================
 # Saving
@@ -2192,59 +2031,11 @@ def stream_post_interview_decision_support(
         stream=True,
     )
 
-    buffer = ""
-
-    for response_event in stream:
-        delta = (
-            response_event
-            .choices[0]
-            .delta
-        )
-
-        if (
-            not delta
-            or not delta.content
-        ):
-            continue
-
-        buffer += delta.content
-
-        parsed_events, buffer = (
-            _extract_json_events_from_buffer(
-                buffer
-            )
-        )
-
-        for parsed_event in parsed_events:
-            yield parsed_event
-
-    # Flush any complete JSON objects remaining after
-    # the final streamed chunk.
-    parsed_events, buffer = (
-        _extract_json_events_from_buffer(
-            buffer
-        )
+    yield from iter_stream_events(
+        stream,
+        normalise_type=_normalise_event_type,
     )
 
-    for parsed_event in parsed_events:
-        yield parsed_event
-
-    trailing_content = (
-        buffer
-        .replace("```json", "")
-        .replace("```ndjson", "")
-        .replace("```", "")
-        .strip()
-    )
-
-    if trailing_content:
-        final_event = _parse_event_line(
-            trailing_content
-        )
-
-        if final_event:
-            yield final_event
-
 
 def save_post_interview_decision_support(
     *,
@@ -2763,50 +2554,11 @@ def stream_post_interview_decision_support(
         stream=True,
     )
 
-    buffer = ""
-
-    for response_event in stream:
-        delta = response_event.choices[0].delta
-
-        if not delta or not delta.content:
-            continue
-
-        buffer += delta.content
-
-        parsed_events, buffer = (
-            _extract_json_events_from_buffer(
-                buffer
-            )
-        )
-
-        for parsed_event in parsed_events:
-            yield parsed_event
-
-    parsed_events, buffer = (
-        _extract_json_events_from_buffer(
-            buffer
-        )
-    )
-
-    for parsed_event in parsed_events:
-        yield parsed_event
-
-    trailing_content = (
-        buffer
-        .replace("```json", "")
-        .replace("```ndjson", "")
-        .replace("```", "")
-        .strip()
+    yield from iter_stream_events(
+        stream,
+        normalise_type=_normalise_event_type,
     )
 
-    if trailing_content:
-        final_event = _parse_event_line(
-            trailing_content
-        )
-
-        if final_event:
-            yield final_event
-
 
 def save_post_interview_decision_support(
     *,
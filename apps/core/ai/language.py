@@ -173,14 +173,49 @@ def mark_ai_content_outdated_if_language_changed(
     result_field: str,
     status_field: str,
     language_code: str | None,
+    allow_translation: bool = False,
 ) -> bool:
-    """Mark completed saved content outdated when its language differs."""
+    """
+    Mark completed saved content outdated when its language differs
+    and no stored variant in that language can replace it.
+
+    allow_translation lets a missing language be translated instead
+    (AI_TRANSLATE_LANGUAGE_VARIANTS). Only a section's own stream view
+    passes it, so a page never waits for more than one translation.
+    """
+    # Imported here: the variants service imports the processes models.
+    from apps.processes.services.ai_content_variants import (
+        restore_switched_ai_content,
+        switch_ai_content_language,
+        translate_switched_ai_content,
+    )
+
     saved_result = getattr(owner, result_field, None)
     current_status = (
         getattr(owner, status_field, None)
         or "not_started"
     )
 
+    if saved_result and current_status == "outdated":
+        restored = restore_switched_ai_content(
+            owner,
+            content_key=content_key,
+            result_field=result_field,
+            status_field=status_field,
+            language_code=language_code,
+        )
+
+        if not restored and allow_translation:
+            translate_switched_ai_content(
+                owner,
+                content_key=content_key,
+                result_field=result_field,
+                status_field=status_field,
+                language_code=language_code,
+            )
+
+        return False
+
     if not saved_result or current_status != "completed":
         return False
 
@@ -191,6 +226,16 @@ def mark_ai_content_outdated_if_language_changed(
     ):
         return False
 
+    if switch_ai_content_language(
+        owner,
+        content_key=content_key,
+        result_field=result_field,
+        status_field=status_field,
+        language_code=language_code,
+        allow_translation=allow_translation,
+    ):
+        return False
+
     setattr(owner, status_field, "outdated")
     owner.save(update_fields=[status_field])
     return True
@@ -0,0 +1,516 @@
+"""
+Offline OpenAI-compatible server for benchmarks and local development.
+
+MockOpenAIServer answers POST /v1/chat/completions (streamed and not)
+and POST /v1/embeddings on a local port, so the AI views can run
+without an API key and without spending tokens. Point the OpenAI
+client at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1; the
+manage.py commands mock_openai_server and benchmark_ai_pipeline do
+that.
+
+Each answer is, in order of preference:
+
+1. The recorded answer to the exact same request in AIResultCache
+   (replay_cache), matched with the result cache's own request hash.
+2. A synthetic answer in the format the request asks for: generated
+   from the json_schema response_format, or the JSON example events
+   the prompt itself shows, with longer text fields padded to about
+   text_length characters. A prompt without JSON examples gets plain
+   text.
+
+Streams are sent as server-sent events in chunks of chunk_size
+characters, after ttft seconds and with chunk_delay seconds between
+chunks. Every request's server-side duration is kept in
+request_log, so a benchmark can subtract the time spent "in the
+model" from its own wall time.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.db import connections
+
+from .result_cache import build_cache_key
+from .stream_events import parse_json_events
+
+logger = logging.getLogger(__name__)
+
+
+FILLER_WORDS = (
+    "the candidate may prefer structured work and appears to value "
+    "clear expectations while results suggest openness to new ideas "
+    "which could be useful to explore in the interview"
+).split()
+
+# Strings with fewer words are labels, names or fixed values and are
+# kept as the prompt shows them.
+PADDED_MIN_WORDS = 4
+
+# Items of a synthetic array built from a json_schema.
+SCHEMA_ARRAY_ITEMS = 3
+
+
+def _filler(length, seed):
+    rng = random.Random(seed)
+    words = []
+    size = 0
+
+    while size < length:
+        word = rng.choice(FILLER_WORDS)
+        words.append(word)
+        size += len(word) + 1
+
+    return " ".join(words).capitalize() + "."
+
+
+def _pad(value, text_length, seed=0):
+    if isinstance(value, dict):
+        return {
+            key: item if key == "type" else _pad(item, text_length, seed + index)
+            for index, (key, item) in enumerate(value.items())
+        }
+
+    if isinstance(value, list):
+        return [
+            _pad(item, text_length, seed + index)
+            for index, item in enumerate(value)
+        ]
+
+    if isinstance(value, str) and len(value.split()) >= PADDED_MIN_WORDS:
+        return _filler(text_length, seed)
+
+    return value
+
+
+def _from_schema(schema, text_length, seed=0):
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    kind = schema.get("type")
+
+    if isinstance(kind, list):
+        kind = next((item for item in kind if item != "null"), "null")
+
+    if kind == "object":
+        return {
+            name: _from_schema(item, text_length, seed + index)
+            for index, (name, item) in enumerate(
+                (schema.get("properties") or {}).items()
+            )
+        }
+
+    if kind == "array":
+        return [
+            _from_schema(schema.get("items") or {}, text_length, seed + index)
+            for index in range(SCHEMA_ARRAY_ITEMS)
+        ]
+
+    if kind in ("integer", "number"):
+        return 1
+
+    if kind == "boolean":
+        return True
+
+    if kind == "null":
+        return None
+
+    return _filler(text_length, seed)
+
+
+def _prompt_text(body):
+    for message in reversed(body.get("messages") or []):
+        if message.get("role") != "user":
+            continue
+
+        content = message.get("content")
+
+        if isinstance(content, list):
+            return "\n".join(
+                part.get("text") or ""
+                for part in content
+                if isinstance(part, dict)
+            )
+
+        return str(content or "")
+
+    return ""
+
+
+def _last_json_object(text):
+    decoder = json.JSONDecoder()
+    found = None
+    position = text.find("{")
+
+    while position != -1:
+        try:
+            payload, end = decoder.raw_decode(text, position)
+        except json.JSONDecodeError:
+            position = text.find("{", position + 1)
+            continue
+
+        if isinstance(payload, dict):
+            found = payload
+
+        position = text.find("{", end)
+
+    return found
+
+
+def synthetic_answer(body, *, text_length=400):
+    """
+    An answer in the format the request asks for (see module docstring).
+    """
+
+    response_format = body.get("response_format") or {}
+
+    if response_format.get("type") == "json_schema":
+        schema = (response_format.get("json_schema") or {}).get("schema") or {}
+        return json.dumps(_from_schema(schema, text_length), ensure_ascii=False)
+
+    prompt = _prompt_text(body)
+    events = parse_json_events(prompt)
+
+    if events:
+        done = next(
+            (
+                index
+                for index, event in enumerate(events)
+                if event.get("type") == "done"
+            ),
+            len(events) - 1,
+        )
+
+        return "\n".join(
+            json.dumps(_pad(event, text_length, index), ensure_ascii=False)
+            for index, event in enumerate(events[:done + 1])
+        )
+
+    example = _last_json_object(prompt)
+
+    if example is not None:
+        return json.dumps(_pad(example, text_length), ensure_ascii=False)
+
+    return "\n\n".join(
+        _filler(text_length, seed)
+        for seed in range(3)
+    )
+
+
+def recorded_answer(body):
+    """
+    The AIResultCache answer to exactly this request, or None.
+    """
+
+    from apps.core.models import AIResultCache
+
+    try:
+        return (
+            AIResultCache.objects
+            .filter(key=build_cache_key(body))
+            .values_list("content", flat=True)
+            .first()
+        )
+
+    finally:
+        connections.close_all()
+
+
+def _embedding(text, dimensions):
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+
+    return [
+        rng.uniform(-1, 1)
+        for _ in range(dimensions)
+    ]
+
+
+def add_mock_arguments(parser):
+    """
+    Answer settings as management command options, shared by
+    mock_openai_server and benchmark_ai_pipeline.
+    """
+
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4,
+        help="Characters per streamed chunk (about one token).",
+    )
+
+    parser.add_argument(
+        "--ttft",
+        type=float,
+        default=0.0,
+        help="Seconds before the first streamed chunk.",
+    )
+
+    parser.add_argument(
+        "--chunk-delay",
+        type=float,
+        default=0.0,
+        help="Seconds between two streamed chunks.",
+    )
+
+    parser.add_argument(
+        "--text-length",
+        type=int,
+        default=400,
+        help="Characters per padded text field of a synthetic answer.",
+    )
+
+    parser.add_argument(
+        "--replay-cache",
+        action="store_true",
+        help=(
+            "Answer requests recorded in AIResultCache with the "
+            "recorded answer instead of a synthetic one."
+        ),
+    )
+
+
+def mock_options(options):
+    return {
+        "chunk_size": options["chunk_size"],
+        "ttft": options["ttft"],
+        "chunk_delay": options["chunk_delay"],
+        "text_length": options["text_length"],
+        "replay_cache": options["replay_cache"],
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    server: "_HTTPServer"
+
+    def log_message(self, format, *args):
+        logger.debug("mock OpenAI: " + format, *args)
+
+    def do_POST(self):
+        started = time.monotonic()
+
+        length = int(self.headers.get("Content-Length") or 0)
+
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json({"error": {"message": "Invalid JSON body.", "type": "invalid_request_error"}}, 400)
+            return
+
+        if self.path.endswith("/chat/completions"):
+            chars = self._chat(body)
+
+        elif self.path.endswith("/embeddings"):
+            chars = self._embeddings(body)
+
+        else:
+            self._send_json({"error": {"message": f"Unknown path {self.path}.", "type": "invalid_request_error"}}, 404)
+            return
+
+        self.server.mock.log_request(
+            path=self.path,
+            stream=bool(body.get("stream")),
+            chars=chars,
+            duration=time.monotonic() - started,
+        )
+
+    def _send_json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _chat(self, body):
+        mock = self.server.mock
+        answer = mock.answer(body)
+        model = body.get("model") or "mock"
+        created = int(time.time())
+
+        prompt_chars = sum(
+            len(str(message.get("content") or ""))
+            for message in body.get("messages") or []
+        )
+        usage = {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": len(answer) // 4,
+            "total_tokens": (prompt_chars + len(answer)) // 4,
+        }
+
+        if not body.get("stream"):
+            time.sleep(mock.ttft + mock.chunk_delay * (len(answer) // mock.chunk_size))
+
+            self._send_json({
+                "id": "chatcmpl-mock",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": answer},
+                        "finish_reason": "stop",
+                    },
+                ],
+                "usage": usage,
+            })
+            return len(answer)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(choices, **extra):
+            payload = {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            self._write_chunk(f"data: {json.dumps(payload)}\n\n")
+
+        time.sleep(mock.ttft)
+
+        for position in range(0, len(answer), mock.chunk_size):
+            if position:
+                time.sleep(mock.chunk_delay)
+
+            event([
+                {
+                    "index": 0,
+                    "delta": {"content": answer[position:position + mock.chunk_size]},
+                    "finish_reason": None,
+                },
+            ])
+
+        event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+
+        if (body.get("stream_options") or {}).get("include_usage"):
+            event([], usage=usage)
+
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+        return len(answer)
+
+    def _embeddings(self, body):
+        inputs = body.get("input")
+
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        model = body.get("model") or "mock"
+        dimensions = body.get("dimensions") or (3072 if "large" in model else 1536)
+
+        self._send_json({
+            "object": "list",
+            "model": model,
+            "data": [
+                {
+                    "object": "embedding",
+                    "index": index,
+                    "embedding": _embedding(str(text), dimensions),
+                }
+                for index, text in enumerate(inputs or [])
+            ],
+            "usage": {
+                "prompt_tokens": sum(len(str(text)) // 4 for text in inputs or []),
+                "total_tokens": sum(len(str(text)) // 4 for text in inputs or []),
+            },
+        })
+
+        return 0
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockOpenAIServer"
+
+
+class MockOpenAIServer:
+    """
+    The server and its answer settings. Use start()/stop(), or the
+    instance as a context manager, to run it in a background thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        host="127.0.0.1",
+        port=0,
+        chunk_size=4,
+        ttft=0.0,
+        chunk_delay=0.0,
+        text_length=400,
+        replay_cache=False,
+    ):
+        self.chunk_size = max(chunk_size, 1)
+        self.ttft = ttft
+        self.chunk_delay = chunk_delay
+        self.text_length = text_length
+        self.replay_cache = replay_cache
+
+        self.request_log = []
+        self._log_lock = threading.Lock()
+
+        self.httpd = _HTTPServer((host, port), _Handler)
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def answer(self, body):
+        if self.replay_cache:
+            recorded = recorded_answer(body)
+
+            if recorded is not None:
+                return recorded
+
+        return synthetic_answer(body, text_length=self.text_length)
+
+    def log_request(self, **entry):
+        with self._log_lock:
+            self.request_log.append(entry)
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            name="mock-openai",
+            daemon=True,
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
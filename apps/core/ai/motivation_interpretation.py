@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from typing import Any, Iterable
 from django.utils import timezone
 
@@ -8,6 +7,7 @@ from .openai_client import (
     get_openai_client,
     get_chat_model,
 )
+from .stream_events import iter_stream_events
 from .language import (
     get_ai_language_instruction,
     get_ai_language_update_fields,
@@ -659,34 +659,6 @@ def apply_motivation_interpretation_event(
     return interpretation
 
 
-def _parse_event_line(
-    raw_line: str,
-) -> dict[str, Any] | None:
-    line = raw_line.strip()
-
-    if not line:
-        return None
-
-    if line in {
-        "```",
-        "```json",
-        "```ndjson",
-    }:
-        return None
-
-    try:
-        event = json.loads(line)
-    except json.JSONDecodeError:
-        return None
-
-    if not isinstance(event, dict):
-        return None
-
-    if not event.get("type"):
-        return None
-
-    return event
-
 def get_motivation_interpretation_system_prompt(
     language_code: str = "en",
 ) -> str:
@@ -769,55 +741,11 @@ def stream_motivation_interpretation(
         stream=True,
     )
 
-    buffer = ""
-
-    for response_event in stream:
-        choices = getattr(
-            response_event,
-            "choices",
-            None,
-        )
-
-        if not choices:
-            continue
-
-        delta = getattr(
-            choices[0],
-            "delta",
-            None,
-        )
-
-        content = getattr(
-            delta,
-            "content",
-            None,
-        )
-
-        if not content:
-            continue
-
-        buffer += content
-
-        while "\n" in buffer:
-            raw_line, buffer = buffer.split(
-                "\n",
-                1,
-            )
-
-            event = _parse_event_line(
-                raw_line
-            )
-
-            if event:
-                yield event
-
-    final_event = _parse_event_line(
-        buffer
+    yield from iter_stream_events(
+        stream,
+        line_delimited=True,
     )
 
-    if final_event:
-        yield final_event
-
 def save_motivation_interpretation(
     *,
     owner,
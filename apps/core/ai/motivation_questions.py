@@ -12,6 +12,11 @@ from .openai_client import (
     get_chat_model,
     get_openai_client,
 )
+from .structured_output import (
+    parse_with_repair,
+    questions_response_format,
+    structured_output_enabled,
+)
 from .language import (
     get_ai_language_instruction,
     get_ai_language_update_fields,
@@ -533,6 +538,17 @@ def stream_motivation_questions(
         f"{system_language_instruction}"
     )
 
+    # A schema-constrained answer instead of free-form JSON.
+    response_options = (
+        {
+            "response_format": questions_response_format(
+                "motivation_questions"
+            ),
+        }
+        if structured_output_enabled()
+        else {}
+    )
+
     stream = client.chat.completions.create(
         model=get_chat_model(),
 
@@ -549,6 +565,7 @@ def stream_motivation_questions(
 
         temperature=0.2,
         stream=True,
+        **response_options,
     )
 
     raw_content = (
@@ -557,12 +574,7 @@ def stream_motivation_questions(
         )
     )
 
-    result = _parse_result(
-        raw_content
-    )
-
-    # Repair malformed or incomplete JSON once.
-    if result is None:
+    def request_repair() -> str:
         repair_response = (
             client.chat.completions.create(
                 model=get_chat_model(),
@@ -588,10 +600,11 @@ def stream_motivation_questions(
 
                 temperature=0.1,
                 stream=False,
+                **response_options,
             )
         )
 
-        repair_content = str(
+        return str(
             repair_response
             .choices[0]
             .message
@@ -599,9 +612,13 @@ def stream_motivation_questions(
             or ""
         ).strip()
 
-        result = _parse_result(
-            repair_content
-        )
+    # Malformed or incomplete JSON is repaired locally first and
+    # generated again only when that fails.
+    result = parse_with_repair(
+        raw_content,
+        parse=_parse_result,
+        request_repair=request_repair,
+    )
 
     if result is None:
         print(
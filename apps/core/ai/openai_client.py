@@ -1,12 +1,168 @@
+"""
+Process-wide OpenAI clients.
+
+get_openai_client() returns one shared client per worker process
+instead of building a new client, and a new connection pool, for every
+call. The underlying httpx client keeps connections alive between
+requests and speaks HTTP/2 when the h2 package is installed.
+
+Calls through the sync client are answered from the result cache when
+possible (result_cache) and recorded as AICallMetric rows (telemetry).
+Calls that reach the model first wait for the shared rate limit budget,
+and every response updates the rate limit state (rate_limits).
+
+Timeouts, retries and pool sizes come from the OPENAI_* settings. The
+clients are rebuilt when the process id changes, so workers forked by
+gunicorn (also with --preload) never share the parent's sockets.
+
+get_async_openai_client() is the AsyncOpenAI counterpart. Async
+connection pools belong to one event loop, so there is one async
+client per running loop.
+"""
+
+import asyncio
+import importlib.util
 import os
-from openai import OpenAI
+import threading
+import weakref
 
+import httpx
+from django.conf import settings
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 
-def get_openai_client() -> OpenAI:
+from .rate_limits import RateLimitedOpenAIClient, arecord_response, record_response
+from .result_cache import CachedOpenAIClient
+from .telemetry import InstrumentedOpenAIClient, acount_attempt, count_attempt
+
+# httpx only speaks HTTP/2 with the h2 package installed.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+_lock = threading.Lock()
+_pid = None
+_client = None
+_client_key = None
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _api_key() -> str:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("Missing OPENAI_API_KEY environment variable")
-    return OpenAI(api_key=api_key)
+    return api_key
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        getattr(settings, "OPENAI_TIMEOUT", 120.0),
+        connect=getattr(settings, "OPENAI_CONNECT_TIMEOUT", 10.0),
+    )
+
+
+def _http_options(request_hook, response_hook) -> dict:
+    return {
+        "event_hooks": {
+            "request": [request_hook],
+            "response": [response_hook],
+        },
+        "http2": HTTP2_AVAILABLE and getattr(settings, "OPENAI_HTTP2", True),
+        "timeout": _timeout(),
+        "limits": httpx.Limits(
+            max_connections=getattr(settings, "OPENAI_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=getattr(settings, "OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20),
+            keepalive_expiry=getattr(settings, "OPENAI_KEEPALIVE_EXPIRY", 60.0),
+        ),
+    }
+
+
+def _client_options(api_key: str) -> dict:
+    return {
+        "api_key": api_key,
+        "timeout": _timeout(),
+        "max_retries": getattr(settings, "OPENAI_MAX_RETRIES", 2),
+    }
+
+
+def _check_pid() -> None:
+    """
+    Forget clients inherited from a parent process. They are dropped
+    rather than closed: the parent still owns those connections.
+    """
+
+    global _pid, _client, _client_key, _async_clients
+
+    pid = os.getpid()
+
+    if _pid != pid:
+        _pid = pid
+        _client = None
+        _client_key = None
+        _async_clients = weakref.WeakKeyDictionary()
+
+
+def get_openai_client() -> OpenAI:
+    global _client, _client_key
+
+    api_key = _api_key()
+
+    with _lock:
+        _check_pid()
+
+        if _client is None or _client_key != api_key:
+            _client = InstrumentedOpenAIClient(
+                CachedOpenAIClient(
+                    RateLimitedOpenAIClient(
+                        OpenAI(
+                            http_client=DefaultHttpxClient(**_http_options(count_attempt, record_response)),
+                            **_client_options(api_key),
+                        )
+                    )
+                )
+            )
+            _client_key = api_key
+
+        return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Shared AsyncOpenAI client for the running event loop. Results are
+    not cached here and calls do not wait for the shared rate limit
+    budget; only the sync client goes through result_cache and
+    rate_limits.
+    """
+
+    api_key = _api_key()
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        _check_pid()
+
+        entry = _async_clients.get(loop)
+
+        if entry is None or entry[0] != api_key:
+            entry = (
+                api_key,
+                AsyncOpenAI(
+                    http_client=DefaultAsyncHttpxClient(**_http_options(acount_attempt, arecord_response)),
+                    **_client_options(api_key),
+                ),
+            )
+            _async_clients[loop] = entry
+
+        return entry[1]
+
+
+def reset_openai_clients() -> None:
+    """
+    Drop the shared clients, e.g. after changing the OPENAI_* settings.
+    """
+
+    global _pid
+
+    with _lock:
+        _pid = None
+        _check_pid()
 
 
 def get_chat_model() -> str:
@@ -14,4 +170,4 @@ def get_chat_model() -> str:
 
 
 def get_embed_model() -> str:
-    return os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-large")
\ No newline at end of file
+    return os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-large")
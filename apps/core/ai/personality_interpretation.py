@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from typing import Any, Iterable
 
 from django.utils import timezone
@@ -9,6 +8,7 @@ from .openai_client import (
     get_openai_client,
     get_chat_model,
 )
+from .stream_events import iter_stream_events
 
 from .shared_context import (
     build_shared_ai_context,
@@ -474,34 +474,6 @@ def apply_personality_interpretation_event(
 
     return interpretation
 
-def _parse_event_line(
-    raw_line: str,
-) -> dict[str, Any] | None:
-    line = raw_line.strip()
-
-    if not line:
-        return None
-
-    if line in {
-        "```",
-        "```json",
-        "```ndjson",
-    }:
-        return None
-
-    try:
-        event = json.loads(line)
-    except json.JSONDecodeError:
-        return None
-
-    if not isinstance(event, dict):
-        return None
-
-    if not event.get("type"):
-        return None
-
-    return event
-
 def stream_personality_interpretation(
     *,
     owner,
@@ -554,36 +526,11 @@ def stream_personality_interpretation(
         stream=True,
     )
 
-    buffer = ""
-
-    for response_event in stream:
-        delta = response_event.choices[0].delta
-
-        if not delta or not delta.content:
-            continue
-
-        buffer += delta.content
-
-        while "\n" in buffer:
-            raw_line, buffer = buffer.split(
-                "\n",
-                1,
-            )
-
-            parsed_event = _parse_event_line(
-                raw_line
-            )
-
-            if parsed_event:
-                yield parsed_event
-
-    final_event = _parse_event_line(
-        buffer
+    yield from iter_stream_events(
+        stream,
+        line_delimited=True,
     )
 
-    if final_event:
-        yield final_event
-
 def save_personality_interpretation(
     *,
     owner,
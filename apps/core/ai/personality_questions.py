@@ -14,6 +14,8 @@ from .openai_client import (
     get_openai_client,
     get_chat_model,
 )
+from .stream_events import iter_stream_events, parse_json_events
+from .telemetry import repair_call
 
 from .prompt_templates import get_ai_prompt_instructions
 
@@ -833,34 +835,6 @@ def apply_personality_questions_event(
     return result
 
 
-def _parse_event_line(
-    raw_line: str,
-) -> dict[str, Any] | None:
-    line = raw_line.strip()
-
-    if not line:
-        return None
-
-    if line in {
-        "```",
-        "```json",
-        "```ndjson",
-    }:
-        return None
-
-    try:
-        event = json.loads(line)
-    except json.JSONDecodeError:
-        return None
-
-    if not isinstance(event, dict):
-        return None
-
-    if not event.get("type"):
-        return None
-
-    return event
-
 def _build_personality_questions_repair_prompt(
     *,
     owner,
@@ -979,16 +953,12 @@ def _parse_repaired_personality_questions(
     try:
         event = json.loads(text)
     except json.JSONDecodeError:
-        event = None
-
-        for line in text.splitlines():
-            parsed_event = _parse_event_line(
-                line
-            )
+        events = parse_json_events(
+            text,
+            line_delimited=True,
+        )
 
-            if parsed_event:
-                event = parsed_event
-                break
+        event = events[0] if events else None
 
     if not isinstance(event, dict):
         return None
@@ -1209,31 +1179,32 @@ def _generate_repaired_personality_questions_event(
     try:
         client = get_openai_client()
 
-        response = client.chat.completions.create(
-            model=get_chat_model(),
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a careful workplace personality "
-                        "assessment consultant. Return the requested "
-                        "JSON object exactly."
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": (
-                        _build_personality_questions_repair_prompt(
-                            owner=owner,
-                            personality_results=personality_results,
-                            selected_traits=selected_traits,
-                        )
-                    ),
-                },
-            ],
-            temperature=0.1,
-            stream=False,
-        )
+        with repair_call():
+            response = client.chat.completions.create(
+                model=get_chat_model(),
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "You are a careful workplace personality "
+                            "assessment consultant. Return the requested "
+                            "JSON object exactly."
+                        ),
+                    },
+                    {
+                        "role": "user",
+                        "content": (
+                            _build_personality_questions_repair_prompt(
+                                owner=owner,
+                                personality_results=personality_results,
+                                selected_traits=selected_traits,
+                            )
+                        ),
+                    },
+                ],
+                temperature=0.1,
+                stream=False,
+            )
 
         raw_content = (
             response.choices[0].message.content
@@ -1303,8 +1274,6 @@ def stream_personality_questions(
         stream=True,
     )
 
-    buffer = ""
-
     selected_traits = normalise_selected_traits(
         selected_traits=(
             owner.selected_personality_traits
@@ -1392,41 +1361,16 @@ def stream_personality_questions(
 
         return event
 
-    for response_event in stream:
-        delta = response_event.choices[0].delta
-
-        if not delta or not delta.content:
-            continue
-
-        buffer += delta.content
-
-        while "\n" in buffer:
-            raw_line, buffer = buffer.split(
-                "\n",
-                1,
-            )
-
-            parsed_event = _parse_event_line(
-                raw_line
-            )
-
-            prepared_event = prepare_event(
-                parsed_event
-            )
-
-            if prepared_event:
-                yield prepared_event
-
-    final_event = _parse_event_line(
-        buffer
-    )
-
-    prepared_final_event = prepare_event(
-        final_event
-    )
+    for parsed_event in iter_stream_events(
+        stream,
+        line_delimited=True,
+    ):
+        prepared_event = prepare_event(
+            parsed_event
+        )
 
-    if prepared_final_event:
-        yield prepared_final_event
+        if prepared_event:
+            yield prepared_event
 
     # Preserve explicit user selection when one exists.
     user_selected_traits = normalise_selected_traits(
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 
 
@@ -893,14 +900,194 @@ def get_default_ai_prompt(
     ).strip()
 
 
-def get_ai_prompt_instructions(
+# ============================================================
+# Resolved prompt cache
+# ============================================================
+#
+# Every generation resolves its section's prompt, so the active
+# overrides are kept in memory per worker, keyed by (key, language).
+#
+# Saving or deleting an AIPromptTemplate clears the cache of the
+# worker that made the change right away (apps.processes.signals).
+# Other workers compare the table's row count and latest updated_at
+# at most every AI_PROMPT_CACHE_CHECK_SECONDS and clear their cache
+# when it changed. That is one small query per interval instead of
+# one query per generation. 0 turns the cache off.
+#
+# The last prompt resolved in a context is picked up by the next chat
+# call (apps.core.ai.telemetry), so its AICallMetric row records the
+# prompt's key and content hash.
+# ============================================================
+
+DEFAULT_PROMPT_CACHE_CHECK_SECONDS = 5
+
+
+@dataclass(frozen=True)
+class ResolvedAIPrompt:
+    key: str
+    language: str
+    text: str
+    # "override" (AIPromptTemplate) or "default" (caller or registry)
+    source: str
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Stable SHA-256 of the prompt text, the same in every worker,
+        for keying caches and telemetry on the prompt version.
+        """
+
+        return prompt_content_hash(
+            self.text
+        )
+
+
+_cache_lock = threading.Lock()
+_override_cache: dict[tuple[str, str], str | None] = {}
+_cache_fingerprint: tuple[Any, ...] | None = None
+_cache_checked_at = 0.0
+
+_last_resolved = ContextVar("ai_last_resolved_prompt", default=None)
+
+
+@lru_cache(maxsize=256)
+def prompt_content_hash(
+    text: str,
+) -> str:
+    return hashlib.sha256(
+        text.encode("utf-8")
+    ).hexdigest()
+
+
+def _prompt_cache_check_seconds() -> float:
+    return getattr(
+        settings,
+        "AI_PROMPT_CACHE_CHECK_SECONDS",
+        DEFAULT_PROMPT_CACHE_CHECK_SECONDS,
+    )
+
+
+def clear_ai_prompt_cache() -> None:
+    """
+    Forget every resolved override in this worker.
+    """
+
+    global _cache_fingerprint, _cache_checked_at
+
+    with _cache_lock:
+        _override_cache.clear()
+        _cache_fingerprint = None
+        _cache_checked_at = 0.0
+
+
+def _check_prompt_cache() -> None:
+    global _cache_fingerprint, _cache_checked_at
+
+    from django.db.models import Count, Max
+
+    from apps.processes.models import AIPromptTemplate
+
+    now = time.monotonic()
+
+    if now - _cache_checked_at < _prompt_cache_check_seconds():
+        return
+
+    state = AIPromptTemplate.objects.aggregate(
+        count=Count("id"),
+        updated_at=Max("updated_at"),
+    )
+    fingerprint = (
+        state["count"],
+        state["updated_at"],
+    )
+
+    with _cache_lock:
+        if fingerprint != _cache_fingerprint:
+            _override_cache.clear()
+            _cache_fingerprint = fingerprint
+
+        _cache_checked_at = now
+
+
+def _load_override_text(
+    key: str,
+    language: str,
+) -> str | None:
+    from apps.processes.models import AIPromptTemplate
+
+    try:
+        prompt_template = AIPromptTemplate.objects.get(
+            key=key,
+            language=language,
+            is_active=True,
+        )
+
+    except ObjectDoesNotExist:
+        return None
+
+    prompt_text = (
+        prompt_template.prompt_text
+        or ""
+    ).strip()
+
+    return prompt_text or None
+
+
+def _get_override_text(
+    key: str,
+    language: str,
+) -> str | None:
+    if _prompt_cache_check_seconds() <= 0:
+        return _load_override_text(
+            key,
+            language,
+        )
+
+    _check_prompt_cache()
+
+    cache_key = (
+        key,
+        language,
+    )
+
+    with _cache_lock:
+        if cache_key in _override_cache:
+            return _override_cache[cache_key]
+
+    prompt_text = _load_override_text(
+        key,
+        language,
+    )
+
+    with _cache_lock:
+        _override_cache[cache_key] = prompt_text
+
+    return prompt_text
+
+
+def take_resolved_ai_prompt() -> ResolvedAIPrompt | None:
+    """
+    The prompt last resolved in this context, once: the next call
+    gets None until another prompt is resolved.
+    """
+
+    resolved = _last_resolved.get()
+
+    if resolved is not None:
+        _last_resolved.set(None)
+
+    return resolved
+
+
+def resolve_ai_prompt(
     *,
     key: str,
     language: str,
     default: str | None = None,
-) -> str:
+) -> ResolvedAIPrompt:
     """
-    Return the currently active GLOBAL business guidance.
+    Return the currently active GLOBAL business guidance, with where
+    it came from and its content hash.
 
     Priority:
 
@@ -911,12 +1098,26 @@ def get_ai_prompt_instructions(
     Customer/company-specific prompts are intentionally not supported here.
     """
 
-    from apps.processes.models import AIPromptTemplate
-
     normalized_language = normalize_prompt_language(
         language
     )
 
+    prompt_text = _get_override_text(
+        key,
+        normalized_language,
+    )
+
+    if prompt_text:
+        resolved = ResolvedAIPrompt(
+            key=key,
+            language=normalized_language,
+            text=prompt_text,
+            source="override",
+        )
+        _last_resolved.set(resolved)
+
+        return resolved
+
     if default is None:
         protected_default = get_default_ai_prompt(
             key=key,
@@ -928,25 +1129,33 @@ def get_ai_prompt_instructions(
             default
         ).strip()
 
-    try:
-        prompt_template = AIPromptTemplate.objects.get(
-            key=key,
-            language=normalized_language,
-            is_active=True,
-        )
+    resolved = ResolvedAIPrompt(
+        key=key,
+        language=normalized_language,
+        text=protected_default,
+        source="default",
+    )
+    _last_resolved.set(resolved)
 
-    except ObjectDoesNotExist:
-        return protected_default
+    return resolved
 
-    prompt_text = (
-        prompt_template.prompt_text
-        or ""
-    ).strip()
 
-    if not prompt_text:
-        return protected_default
+def get_ai_prompt_instructions(
+    *,
+    key: str,
+    language: str,
+    default: str | None = None,
+) -> str:
+    """
+    Return the currently active GLOBAL business guidance text
+    (see resolve_ai_prompt).
+    """
 
-    return prompt_text
+    return resolve_ai_prompt(
+        key=key,
+        language=language,
+        default=default,
+    ).text
 
 
 def list_ai_prompt_definitions() -> list[dict[str, Any]]:
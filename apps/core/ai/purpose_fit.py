@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from typing import Any, Iterable
 
 from .shared_context import (
@@ -10,6 +9,7 @@ from .shared_context import (
 from django.utils import timezone
 
 from .openai_client import get_openai_client, get_chat_model
+from .stream_events import iter_stream_events
 from .language import (
     get_ai_language_instruction,
     get_ai_system_language_instruction,
@@ -917,32 +917,6 @@ def apply_purpose_fit_event(
     return purpose_fit
 
 
-def _parse_event_line(
-    raw_line: str,
-) -> dict[str, Any] | None:
-    line = raw_line.strip()
-
-    if not line:
-        return None
-
-    # Safety in case the model adds Markdown fences.
-    if line in {"```", "```json", "```ndjson"}:
-        return None
-
-    try:
-        event = json.loads(line)
-    except json.JSONDecodeError:
-        return None
-
-    if not isinstance(event, dict):
-        return None
-
-    if not event.get("type"):
-        return None
-
-    return event
-
-
 def stream_candidate_purpose_fit(
     invitation,
     *,
@@ -999,34 +973,10 @@ def stream_candidate_purpose_fit(
         stream=True,
     )
 
-    buffer = ""
-
-    for response_event in stream:
-        delta = response_event.choices[0].delta
-
-        if not delta or not delta.content:
-            continue
-
-        buffer += delta.content
-
-        while "\n" in buffer:
-            raw_line, buffer = buffer.split(
-                "\n",
-                1,
-            )
-
-            parsed_event = _parse_event_line(
-                raw_line
-            )
-
-            if parsed_event:
-                yield parsed_event
-
-    # Parse the final line if the model did not end with newline.
-    final_event = _parse_event_line(buffer)
-
-    if final_event:
-        yield final_event
+    yield from iter_stream_events(
+        stream,
+        line_delimited=True,
+    )
 
 
 def save_candidate_purpose_fit(
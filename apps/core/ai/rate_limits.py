@@ -0,0 +1,587 @@
+"""
+OpenAI rate limiting shared by every worker process.
+
+Recruiters opening candidates and background work (pre-generation,
+process-wide regeneration) all spend the same OpenAI requests-per-
+minute and tokens-per-minute limits. Without coordination, gunicorn
+workers find out about the limit only when OpenAI answers 429.
+
+Budget: every model (chat or embedding) has one AIRateLimitBucket row
+in the database. It holds the requests and tokens still available,
+refilled continuously up to AI_RATE_LIMIT_REQUESTS_PER_MINUTE and
+AI_RATE_LIMIT_TOKENS_PER_MINUTE. The database works across workers and
+hosts without Redis. Rows are updated with compare-and-set on a version
+counter, so no lock is held while waiting.
+
+Before each call, RateLimitedOpenAIClient takes one request and the
+estimated tokens from the bucket (acquire). Tokens are estimated as
+prompt characters / 4 plus max_tokens, or
+AI_RATE_LIMIT_COMPLETION_ESTIMATE when max_tokens is not set. When the
+usage is known, the difference is given back or taken. A caller that
+finds the bucket empty waits until it has refilled, instead of sending
+the call and getting a 429. Such a wait can take minutes, so code
+that holds a lease (an AIGenerationJob) wraps its calls in
+while_waiting() and renews the lease from the callback.
+
+Priority: calls are interactive unless made inside
+ai_priority(BACKGROUND). Background calls:
+- leave the last (1 - AI_RATE_LIMIT_BACKGROUND_SHARE) of each budget to
+  interactive calls;
+- take nothing while an interactive call is waiting for budget.
+A recruiter's stream therefore starts as soon as budget frees up, even
+while a bulk job is using the rest.
+
+429s: every response of the shared clients passes through
+record_response. A 429 starts a backoff period, in this process and in
+the bucket for the other workers. The period is the Retry-After header
+when OpenAI sends one, otherwise an exponential delay that grows with
+each 429 in a row.
+
+With both per-minute limits at 0 (the default), only the 429 backoff
+of this process applies.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# Backoff after the first 429 without Retry-After, doubled per 429 in
+# a row up to MAX_BACKOFF.
+BASE_BACKOFF = 2.0
+MAX_BACKOFF = 60.0
+
+# Longest single sleep while waiting for budget, so a waiting caller
+# notices budget given back by others.
+MAX_POLL_INTERVAL = 1.0
+
+# How long an interactive caller's "waiting" mark holds off background
+# calls; renewed on every poll.
+INTERACTIVE_WAIT_MARK = timedelta(seconds=2)
+
+# Seconds between two calls of the while_waiting() callback while a
+# caller waits for budget.
+WAIT_CALLBACK_INTERVAL = 15.0
+
+DEFAULT_COMPLETION_ESTIMATE = 1500
+DEFAULT_BACKGROUND_SHARE = 0.8
+DEFAULT_MAX_WAIT = {
+    INTERACTIVE: 120,
+    BACKGROUND: 900,
+}
+
+_priority = ContextVar("ai_priority", default=INTERACTIVE)
+_on_wait = ContextVar("ai_rate_limit_on_wait", default=None)
+
+_lock = threading.Lock()
+_backoff_until = 0.0
+_consecutive = 0
+_rate_limited_count = 0
+
+
+# ---------------------------------------------------------------------
+# Priority
+# ---------------------------------------------------------------------
+
+def current_ai_priority():
+    return _priority.get()
+
+
+@contextmanager
+def ai_priority(priority):
+    """
+    Make the model calls inside the block interactive or background.
+    Threads do not inherit it; pass current_ai_priority() along.
+    """
+
+    token = _priority.set(priority or INTERACTIVE)
+
+    try:
+        yield
+
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def while_waiting(callback):
+    """
+    Call callback every WAIT_CALLBACK_INTERVAL seconds while a call
+    made inside the block waits for budget, e.g. to renew a heartbeat.
+    Threads do not inherit it.
+    """
+
+    token = _on_wait.set(callback)
+
+    try:
+        yield
+
+    finally:
+        _on_wait.reset(token)
+
+
+# ---------------------------------------------------------------------
+# 429 responses
+# ---------------------------------------------------------------------
+
+def _retry_after(response):
+    """
+    Seconds from the Retry-After header (or OpenAI's retry-after-ms),
+    or None.
+    """
+
+    headers = response.headers
+
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+
+        if not value:
+            continue
+
+        try:
+            return min(float(value) * scale, MAX_BACKOFF)
+        except ValueError:
+            continue
+
+    return None
+
+
+def _note_response(response):
+    """
+    Update this process's backoff. Returns the delay a 429 asks for,
+    or None.
+    """
+
+    global _backoff_until, _consecutive, _rate_limited_count
+
+    with _lock:
+        if response.status_code != 429:
+            if response.status_code < 400:
+                _consecutive = 0
+            return None
+
+        _consecutive += 1
+        _rate_limited_count += 1
+
+        delay = _retry_after(response)
+
+        if delay is None:
+            delay = min(BASE_BACKOFF * 2 ** (_consecutive - 1), MAX_BACKOFF)
+
+        _backoff_until = max(_backoff_until, time.monotonic() + delay)
+
+    return delay
+
+
+def _request_model(request):
+    """
+    The model named in a request body, which is also the bucket name.
+    """
+
+    try:
+        return str(json.loads(request.content).get("model") or "")[:100] or None
+    except Exception:
+        return None
+
+
+def record_response(response):
+    delay = _note_response(response)
+
+    if delay is None or not limiter_enabled():
+        return
+
+    try:
+        _share_backoff(_request_model(response.request), delay)
+    except Exception:
+        logger.exception("Could not share the OpenAI rate limit backoff")
+
+
+async def arecord_response(response):
+    # No database access from the event loop: the backoff stays in
+    # this process.
+    _note_response(response)
+
+
+def backoff_remaining():
+    """
+    Seconds until new calls should start, 0 when not rate limited.
+    """
+
+    return max(_backoff_until - time.monotonic(), 0.0)
+
+
+def rate_limited_count():
+    """
+    429 responses seen by this process so far. Callers compare two
+    readings to learn whether their work was rate limited.
+    """
+
+    return _rate_limited_count
+
+
+# ---------------------------------------------------------------------
+# Shared token bucket
+# ---------------------------------------------------------------------
+
+def _limits():
+    return (
+        getattr(settings, "AI_RATE_LIMIT_REQUESTS_PER_MINUTE", 0),
+        getattr(settings, "AI_RATE_LIMIT_TOKENS_PER_MINUTE", 0),
+    )
+
+
+def limiter_enabled():
+    return any(_limits())
+
+
+def estimate_tokens(kwargs):
+    """
+    Rough token count of a call: prompt characters / 4 plus the
+    completion allowance.
+    """
+
+    characters = 0
+
+    for message in kwargs.get("messages") or ():
+        content = message.get("content") if isinstance(message, dict) else None
+
+        if isinstance(content, str):
+            characters += len(content)
+        elif isinstance(content, list):
+            characters += sum(len(str(part)) for part in content)
+
+    embedding_input = kwargs.get("input")
+
+    if isinstance(embedding_input, str):
+        characters += len(embedding_input)
+    elif isinstance(embedding_input, list):
+        characters += sum(len(str(item)) for item in embedding_input)
+
+    completion = 0
+
+    if "messages" in kwargs:
+        completion = (
+            kwargs.get("max_completion_tokens")
+            or kwargs.get("max_tokens")
+            or getattr(settings, "AI_RATE_LIMIT_COMPLETION_ESTIMATE", DEFAULT_COMPLETION_ESTIMATE)
+        )
+
+    return characters // 4 + completion
+
+
+def _get_bucket(name, now):
+    from apps.core.models import AIRateLimitBucket
+
+    requests_per_minute, tokens_per_minute = _limits()
+
+    try:
+        bucket, _ = AIRateLimitBucket.objects.get_or_create(
+            name=name,
+            defaults={
+                "requests": requests_per_minute,
+                "tokens": tokens_per_minute,
+                "refilled_at": now,
+            },
+        )
+    except IntegrityError:
+        bucket = AIRateLimitBucket.objects.get(name=name)
+
+    return bucket
+
+
+def _refill(bucket, now):
+    requests_per_minute, tokens_per_minute = _limits()
+    elapsed = max((now - bucket.refilled_at).total_seconds(), 0.0)
+
+    if requests_per_minute:
+        bucket.requests = min(
+            bucket.requests + elapsed * requests_per_minute / 60,
+            requests_per_minute,
+        )
+
+    if tokens_per_minute:
+        bucket.tokens = min(
+            bucket.tokens + elapsed * tokens_per_minute / 60,
+            tokens_per_minute,
+        )
+
+    bucket.refilled_at = now
+
+
+def _save_bucket(bucket, **fields):
+    """
+    Compare-and-set: True when nobody changed the row since it was read.
+    """
+
+    from apps.core.models import AIRateLimitBucket
+
+    updated = AIRateLimitBucket.objects.filter(
+        pk=bucket.pk,
+        version=bucket.version,
+    ).update(
+        requests=bucket.requests,
+        tokens=bucket.tokens,
+        refilled_at=bucket.refilled_at,
+        version=bucket.version + 1,
+        **fields,
+    )
+
+    return bool(updated)
+
+
+def _try_acquire(name, tokens, priority):
+    """
+    Take the budget for one call. Returns 0 when taken, otherwise the
+    seconds to wait before trying again.
+    """
+
+    requests_per_minute, tokens_per_minute = _limits()
+    now = timezone.now()
+    bucket = _get_bucket(name, now)
+    _refill(bucket, now)
+
+    if bucket.backoff_until and bucket.backoff_until > now:
+        return (bucket.backoff_until - now).total_seconds()
+
+    reserve = 0.0
+
+    if priority == BACKGROUND:
+        if bucket.interactive_waiting_until and bucket.interactive_waiting_until > now:
+            return MAX_POLL_INTERVAL
+
+        reserve = 1 - getattr(settings, "AI_RATE_LIMIT_BACKGROUND_SHARE", DEFAULT_BACKGROUND_SHARE)
+
+    # A call larger than the whole budget would wait forever; it only
+    # waits for a full bucket.
+    tokens = min(tokens, tokens_per_minute) if tokens_per_minute else 0
+
+    waits = []
+
+    if requests_per_minute:
+        needed = 1 + reserve * requests_per_minute
+        if bucket.requests < needed:
+            waits.append((needed - bucket.requests) * 60 / requests_per_minute)
+
+    if tokens_per_minute:
+        needed = tokens + reserve * tokens_per_minute
+        if bucket.tokens < needed:
+            waits.append((needed - bucket.tokens) * 60 / tokens_per_minute)
+
+    if waits:
+        fields = {}
+
+        if priority == INTERACTIVE:
+            fields["interactive_waiting_until"] = now + INTERACTIVE_WAIT_MARK
+
+        _save_bucket(bucket, **fields)
+
+        return max(waits)
+
+    if requests_per_minute:
+        bucket.requests -= 1
+
+    if tokens_per_minute:
+        bucket.tokens -= tokens
+
+    if not _save_bucket(bucket):
+        # Somebody else took budget in between; read again.
+        return 0.01
+
+    return 0
+
+
+def acquire(name, tokens, priority=None):
+    """
+    Wait until the bucket has budget for one call of about tokens
+    tokens, then take it. Gives up waiting after
+    AI_RATE_LIMIT_MAX_WAIT_INTERACTIVE or _BACKGROUND seconds and lets
+    the call through; OpenAI's own limit and the client's retries
+    still apply then. Without per-minute limits only this process's
+    429 backoff is waited for.
+    """
+
+    use_bucket = limiter_enabled()
+
+    if not use_bucket and not backoff_remaining():
+        return
+
+    priority = priority or current_ai_priority()
+    max_wait = getattr(
+        settings,
+        f"AI_RATE_LIMIT_MAX_WAIT_{priority.upper()}",
+        DEFAULT_MAX_WAIT.get(priority, DEFAULT_MAX_WAIT[INTERACTIVE]),
+    )
+    deadline = time.monotonic() + max_wait
+    waited = False
+
+    on_wait = _on_wait.get()
+    last_callback = time.monotonic()
+
+    while True:
+        # A 429 seen by this process counts even before the other
+        # workers have read it from the bucket.
+        wait = backoff_remaining()
+
+        if not wait and use_bucket:
+            try:
+                wait = _try_acquire(name, tokens, priority)
+            except Exception:
+                logger.exception("OpenAI rate limiter unavailable; not limiting")
+                return
+
+        if not wait:
+            break
+
+        remaining = deadline - time.monotonic()
+
+        if remaining <= 0:
+            logger.warning(
+                "OpenAI rate limiter: %s call to %s waited %ss, sending anyway",
+                priority,
+                name,
+                max_wait,
+            )
+            break
+
+        if on_wait and time.monotonic() - last_callback >= WAIT_CALLBACK_INTERVAL:
+            last_callback = time.monotonic()
+
+            try:
+                on_wait()
+            except Exception:
+                logger.exception("OpenAI rate limiter: wait callback failed")
+
+        waited = True
+        time.sleep(min(wait, MAX_POLL_INTERVAL, remaining))
+
+    if waited:
+        logger.info("OpenAI rate limiter: %s call to %s queued", priority, name)
+
+
+def settle(name, estimated, actual):
+    """
+    Correct the tokens taken for a call once its usage is known.
+    """
+
+    if not limiter_enabled() or not _limits()[1] or actual is None:
+        return
+
+    from apps.core.models import AIRateLimitBucket
+
+    try:
+        AIRateLimitBucket.objects.filter(name=name).update(
+            tokens=F("tokens") + (estimated - actual),
+            version=F("version") + 1,
+        )
+    except Exception:
+        logger.exception("Could not settle OpenAI rate limit tokens")
+
+
+def _share_backoff(name, delay):
+    from apps.core.models import AIRateLimitBucket
+
+    until = timezone.now() + timedelta(seconds=delay)
+    buckets = AIRateLimitBucket.objects.all()
+
+    if name:
+        buckets = buckets.filter(name=name)
+
+    buckets.filter(
+        backoff_until__isnull=True,
+    ).update(backoff_until=until, version=F("version") + 1)
+
+    buckets.filter(
+        backoff_until__lt=until,
+    ).update(backoff_until=until, version=F("version") + 1)
+
+
+# ---------------------------------------------------------------------
+# Client wrapper
+# ---------------------------------------------------------------------
+
+def _total_tokens(usage):
+    if usage is None:
+        return None
+
+    total = getattr(usage, "total_tokens", None)
+
+    if total is not None:
+        return total
+
+    return (getattr(usage, "prompt_tokens", 0) or 0) + (
+        getattr(usage, "completion_tokens", 0) or 0
+    )
+
+
+def _settle_stream(stream, name, estimated):
+    usage = None
+
+    try:
+        for event in stream:
+            if getattr(event, "usage", None) is not None:
+                usage = event.usage
+
+            yield event
+
+    finally:
+        settle(name, estimated, _total_tokens(usage))
+
+
+class _RateLimitedCreate:
+    def __init__(self, endpoint):
+        self._endpoint = endpoint
+
+    def __getattr__(self, name):
+        return getattr(self._endpoint, name)
+
+    def create(self, **kwargs):
+        if not limiter_enabled():
+            # Still honour a 429 backoff of this process.
+            acquire(str(kwargs.get("model") or "default")[:100], 0)
+            return self._endpoint.create(**kwargs)
+
+        name = str(kwargs.get("model") or "default")[:100]
+        estimated = estimate_tokens(kwargs)
+
+        acquire(name, estimated)
+
+        response = self._endpoint.create(**kwargs)
+
+        if kwargs.get("stream"):
+            return _settle_stream(response, name, estimated)
+
+        settle(name, estimated, _total_tokens(getattr(response, "usage", None)))
+
+        return response
+
+
+class RateLimitedOpenAIClient:
+    """
+    OpenAI client whose chat completions and embeddings wait for the
+    shared rate limit budget before they are sent.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = SimpleNamespace(
+            completions=_RateLimitedCreate(client.chat.completions),
+        )
+        self.embeddings = _RateLimitedCreate(client.embeddings)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
@@ -0,0 +1,401 @@
+"""
+Content-addressed cache in front of chat completions.
+
+Every chat.completions.create call made through get_openai_client()
+passes through CachedChatCompletions. The request is hashed (final
+messages, model, temperature, the remaining parameters and
+AI_RESULT_CACHE_VERSION) and a previous answer to the exact same request
+is returned from AIResultCache instead of calling the model again.
+
+The messages already contain the resolved prompt templates and language
+instructions, so an edited AIPromptTemplate or a different language
+gives a new key by itself. AI_RESULT_CACHE_VERSION is there to retire
+every stored answer at once, e.g. after a model upgrade.
+
+Streaming requests are recorded while the caller reads them and
+replayed as stream chunks, so the stream functions in apps.core.ai work
+unchanged on a hit. Only answers that finished normally are stored; a
+stream that was cut off or hit the token limit is not.
+
+Calls made inside bypass_result_cache() always reach the model: the
+regenerate buttons, where the recruiter asks for a new answer, repair
+calls and the chat assistant. A regenerated answer replaces the stored
+one. A caller that cannot parse an answer drops it again with
+discard_result(last_result_key()), so it is not served a second time.
+
+Stored answers are evicted after AI_RESULT_CACHE_MAX_AGE_DAYS without
+use, and the least recently used ones once the table grows beyond
+AI_RESULT_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the way requests are hashed changes.
+KEY_FORMAT = 1
+
+# Response id of answers served from the cache.
+CACHED_RESPONSE_ID = "cached"
+
+# Characters per chunk when a cached answer is replayed as a stream.
+REPLAY_CHUNK_CHARS = 400
+
+# Seconds between two eviction passes in one process.
+PRUNE_INTERVAL = 300
+
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+# None: use the cache. Otherwise whether a bypassed answer is stored.
+_bypass = ContextVar("ai_result_cache_bypass", default=None)
+_last_key = ContextVar("ai_result_cache_last_key", default=None)
+
+
+def cache_enabled():
+    return bool(getattr(settings, "AI_RESULT_CACHE", False))
+
+
+@contextmanager
+def bypass_result_cache(store=True):
+    """
+    Ask the model for a fresh answer to the calls made inside the
+    block. With store the answer replaces the stored one; otherwise it
+    is not stored at all. Threads do not inherit it.
+    """
+
+    token = _bypass.set(bool(store))
+
+    try:
+        yield
+
+    finally:
+        _bypass.reset(token)
+
+
+def last_result_key():
+    """
+    Cache key of the last answer served or stored in this context, or
+    None if the last call did not go through the cache.
+    """
+
+    return _last_key.get()
+
+
+def discard_result(key):
+    """
+    Drop a stored answer, e.g. one the caller could not parse.
+    """
+
+    from apps.core.models import AIResultCache
+
+    if key is None:
+        return
+
+    try:
+        AIResultCache.objects.filter(key=key).delete()
+
+    except Exception:
+        logger.exception("AI result cache: could not discard %s", key[:12])
+
+
+def build_cache_key(kwargs):
+    """
+    SHA-256 of everything that decides the answer. stream only decides
+    how the answer is delivered and is left out, so a streamed answer
+    also serves the same request made without streaming.
+    """
+
+    params = {
+        name: value
+        for name, value in kwargs.items()
+        if name not in {"stream", "stream_options", "timeout"}
+    }
+
+    payload = json.dumps(
+        {
+            "format": KEY_FORMAT,
+            "version": getattr(settings, "AI_RESULT_CACHE_VERSION", ""),
+            "model": params.pop("model", ""),
+            "temperature": params.pop("temperature", None),
+            "messages": params.pop("messages", []),
+            "params": params,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_result(key):
+    from apps.core.models import AIResultCache
+
+    max_age = timedelta(
+        days=getattr(settings, "AI_RESULT_CACHE_MAX_AGE_DAYS", 30)
+    )
+
+    now = timezone.now()
+
+    entry = (
+        AIResultCache.objects
+        .filter(key=key, last_used_at__gte=now - max_age)
+        .only("content")
+        .first()
+    )
+
+    if entry is None:
+        return None
+
+    AIResultCache.objects.filter(pk=entry.pk).update(
+        hit_count=F("hit_count") + 1,
+        last_used_at=now,
+    )
+
+    return entry.content
+
+
+def store_result(key, kwargs, content):
+    from apps.core.models import AIResultCache
+
+    now = timezone.now()
+
+    try:
+        AIResultCache.objects.update_or_create(
+            key=key,
+            defaults={
+                "model": str(kwargs.get("model") or "")[:100],
+                "temperature": kwargs.get("temperature"),
+                "content": content,
+                "content_length": len(content),
+                "last_used_at": now,
+            },
+        )
+
+    except IntegrityError:
+        # Another worker stored the same answer first.
+        return
+
+    prune_cache()
+
+
+def prune_cache(force=False):
+    """
+    Drop entries unused for longer than the max age, then the least
+    recently used ones beyond the max entry count. Runs at most once
+    per PRUNE_INTERVAL per process unless forced. Returns the number of
+    deleted entries.
+    """
+
+    global _last_prune
+
+    from apps.core.models import AIResultCache
+
+    with _prune_lock:
+        if not force and time.monotonic() - _last_prune < PRUNE_INTERVAL:
+            return 0
+
+        _last_prune = time.monotonic()
+
+    max_age = timedelta(
+        days=getattr(settings, "AI_RESULT_CACHE_MAX_AGE_DAYS", 30)
+    )
+    max_entries = getattr(settings, "AI_RESULT_CACHE_MAX_ENTRIES", 5000)
+
+    deleted, _ = AIResultCache.objects.filter(
+        last_used_at__lt=timezone.now() - max_age,
+    ).delete()
+
+    cutoff = next(
+        iter(
+            AIResultCache.objects
+            .order_by("-last_used_at")
+            .values_list("last_used_at", flat=True)
+            [max_entries:max_entries + 1]
+        ),
+        None,
+    )
+
+    if cutoff is not None:
+        evicted, _ = AIResultCache.objects.filter(
+            last_used_at__lte=cutoff,
+        ).delete()
+        deleted += evicted
+
+    if deleted:
+        logger.info("AI result cache: evicted %s entries", deleted)
+
+    return deleted
+
+
+def _completion_from_cache(content, model):
+    message = SimpleNamespace(
+        role="assistant",
+        content=content,
+    )
+
+    return SimpleNamespace(
+        id=CACHED_RESPONSE_ID,
+        object="chat.completion",
+        model=model,
+        usage=None,
+        choices=[
+            SimpleNamespace(
+                index=0,
+                message=message,
+                finish_reason="stop",
+            ),
+        ],
+    )
+
+
+def _stream_from_cache(content, model):
+    for start in range(0, len(content), REPLAY_CHUNK_CHARS):
+        yield SimpleNamespace(
+            id=CACHED_RESPONSE_ID,
+            object="chat.completion.chunk",
+            model=model,
+            usage=None,
+            choices=[
+                SimpleNamespace(
+                    index=0,
+                    delta=SimpleNamespace(
+                        role=None,
+                        content=content[start:start + REPLAY_CHUNK_CHARS],
+                    ),
+                    finish_reason=None,
+                ),
+            ],
+        )
+
+    yield SimpleNamespace(
+        id=CACHED_RESPONSE_ID,
+        object="chat.completion.chunk",
+        model=model,
+        usage=None,
+        choices=[
+            SimpleNamespace(
+                index=0,
+                delta=SimpleNamespace(role=None, content=None),
+                finish_reason="stop",
+            ),
+        ],
+    )
+
+
+def _record_stream(stream, key, kwargs):
+    """
+    Pass the stream through to the caller and store the answer once
+    the model reports that it finished.
+    """
+
+    parts = []
+    finish_reason = None
+
+    for event in stream:
+        for choice in getattr(event, "choices", None) or []:
+            delta = getattr(choice, "delta", None)
+
+            if delta is not None and getattr(delta, "content", None):
+                parts.append(delta.content)
+
+            if getattr(choice, "finish_reason", None):
+                finish_reason = choice.finish_reason
+
+        yield event
+
+    if finish_reason == "stop":
+        _safe_store(key, kwargs, "".join(parts))
+
+
+def _safe_store(key, kwargs, content):
+    if not content:
+        return
+
+    _last_key.set(key)
+
+    try:
+        store_result(key, kwargs, content)
+
+    except Exception:
+        logger.exception("AI result cache: could not store %s", key[:12])
+
+
+class CachedChatCompletions:
+    def __init__(self, completions):
+        self._completions = completions
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+    def create(self, **kwargs):
+        _last_key.set(None)
+
+        bypass = _bypass.get()
+
+        if not cache_enabled() or kwargs.get("n", 1) != 1 or bypass is False:
+            return self._completions.create(**kwargs)
+
+        key = build_cache_key(kwargs)
+        model = kwargs.get("model", "")
+
+        content = None
+
+        if bypass is None:
+            try:
+                content = get_cached_result(key)
+
+            except Exception:
+                logger.exception("AI result cache: lookup failed")
+
+        if content is not None:
+            logger.debug("AI result cache hit %s", key[:12])
+            _last_key.set(key)
+
+            if kwargs.get("stream"):
+                return _stream_from_cache(content, model)
+
+            return _completion_from_cache(content, model)
+
+        response = self._completions.create(**kwargs)
+
+        if kwargs.get("stream"):
+            return _record_stream(response, key, kwargs)
+
+        choice = response.choices[0]
+
+        if choice.finish_reason == "stop":
+            _safe_store(key, kwargs, choice.message.content or "")
+
+        return response
+
+
+class CachedOpenAIClient:
+    """
+    OpenAI client whose chat.completions.create goes through the
+    result cache. Everything else is the wrapped client.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = SimpleNamespace(
+            completions=CachedChatCompletions(client.chat.completions),
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
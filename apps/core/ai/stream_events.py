@@ -0,0 +1,218 @@
+"""
+Incremental JSON event parser for streamed model output.
+
+The AI modules ask the model for a stream of JSON objects, one event
+per object, and yield each event as soon as it is complete.
+JSONEventParser reads the stream chunk by chunk. It keeps the brace
+depth and the string/escape state between chunks, so every character
+is scanned once. Each object is decoded exactly once, when its closing
+brace arrives, however many chunks it spans.
+
+Text outside objects (Markdown fences, stray prose) is skipped. Objects
+without a "type" are dropped, as are objects that do not decode.
+
+With line_delimited (NDJSON), a newline inside an unfinished object
+drops that object. A malformed line then costs only that line, as
+with the line-based parsing it replaces. Without it, objects may be
+pretty-printed across lines.
+"""
+
+import json
+import re
+from typing import Any, Callable, Iterable
+
+# Characters that change the parser state, per state and mode.
+_IN_STRING = re.compile(r'["\\]')
+_IN_OBJECT = re.compile(r'[{}"]')
+_IN_STRING_LINES = re.compile(r'["\\\n]')
+_IN_OBJECT_LINES = re.compile(r'[{}"\n]')
+
+
+class JSONEventParser:
+    def __init__(
+        self,
+        *,
+        normalise_type: Callable[[Any], str] | None = None,
+        line_delimited: bool = False,
+    ):
+        self.normalise_type = normalise_type
+        self.line_delimited = line_delimited
+
+        self.events_parsed = 0
+        self.objects_dropped = 0
+
+        self._in_string_pattern = (
+            _IN_STRING_LINES if line_delimited else _IN_STRING
+        )
+        self._in_object_pattern = (
+            _IN_OBJECT_LINES if line_delimited else _IN_OBJECT
+        )
+
+        self._reset()
+
+    def _reset(self):
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._parts: list[str] = []
+
+    def feed(self, text: str) -> list[dict[str, Any]]:
+        """
+        Add a chunk and return the events it completed.
+        """
+
+        events: list[dict[str, Any]] = []
+        length = len(text)
+        pos = 0
+
+        # Object text in this chunk starts here (None outside objects).
+        start = 0 if self._depth else None
+
+        if self._escape and length:
+            self._escape = False
+            pos = 1
+
+        while pos < length:
+            if not self._depth:
+                pos = text.find("{", pos)
+
+                if pos == -1:
+                    break
+
+                start = pos
+                self._depth = 1
+                pos += 1
+                continue
+
+            if self._in_string:
+                match = self._in_string_pattern.search(text, pos)
+
+                if match is None:
+                    break
+
+                char = match.group()
+                pos = match.end()
+
+                if char == "\\":
+                    if pos >= length:
+                        self._escape = True
+                    pos += 1
+
+                elif char == '"':
+                    self._in_string = False
+
+                else:
+                    self._drop()
+                    start = None
+
+                continue
+
+            match = self._in_object_pattern.search(text, pos)
+
+            if match is None:
+                break
+
+            char = match.group()
+            pos = match.end()
+
+            if char == '"':
+                self._in_string = True
+
+            elif char == "{":
+                self._depth += 1
+
+            elif char == "}":
+                self._depth -= 1
+
+                if not self._depth:
+                    self._parts.append(text[start:pos])
+                    self._emit("".join(self._parts), events)
+                    self._parts = []
+                    start = None
+
+            else:
+                self._drop()
+                start = None
+
+        if self._depth and start is not None:
+            self._parts.append(text[start:])
+
+        return events
+
+    def close(self) -> list[dict[str, Any]]:
+        """
+        End of stream. An unfinished object is dropped.
+        """
+
+        if self._depth:
+            self._drop()
+
+        return []
+
+    def _drop(self):
+        self.objects_dropped += 1
+        self._reset()
+
+    def _emit(self, raw: str, events: list[dict[str, Any]]):
+        try:
+            payload = json.loads(raw)
+        except json.JSONDecodeError:
+            self.objects_dropped += 1
+            return
+
+        if not isinstance(payload, dict):
+            return
+
+        event_type = payload.get("type")
+
+        if self.normalise_type is not None:
+            event_type = self.normalise_type(event_type)
+
+            if event_type:
+                payload["type"] = event_type
+
+        if not event_type:
+            self.objects_dropped += 1
+            return
+
+        self.events_parsed += 1
+        events.append(payload)
+
+
+def parse_json_events(
+    text: str,
+    **options,
+) -> list[dict[str, Any]]:
+    """
+    Every event in a complete text, e.g. a non-streamed answer.
+    """
+
+    parser = JSONEventParser(**options)
+
+    return parser.feed(text) + parser.close()
+
+
+def iter_stream_events(
+    stream: Iterable[Any],
+    **options,
+) -> Iterable[dict[str, Any]]:
+    """
+    Events from a chat completion stream, as soon as each is complete.
+    """
+
+    parser = JSONEventParser(**options)
+
+    for response_event in stream:
+        choices = getattr(response_event, "choices", None)
+
+        if not choices:
+            continue
+
+        content = getattr(choices[0].delta, "content", None)
+
+        if not content:
+            continue
+
+        yield from parser.feed(content)
+
+    yield from parser.close()
@@ -0,0 +1,284 @@
+"""
+Structured answers for the question modules, and local repair of
+malformed JSON before asking the model again.
+
+cognitive_questions and motivation_questions used to make a second,
+non-streaming repair call whenever the streamed answer did not parse.
+With AI_STRUCTURED_OUTPUT they ask for a JSON-schema-constrained answer
+(questions_response_format), so the answer has the expected shape.
+
+parse_with_repair then handles what can still go wrong, cheapest first:
+
+1. The answer parses as it is.
+2. repair_json_text fixes it locally: Markdown fences, trailing commas
+   and an answer cut off before the end.
+3. Only then is the model asked again (request_repair).
+
+The outcome is stored on the answer's AICallMetric row
+(output_repair), so the admin AI usage page shows the repair rate per
+feature. An answer that needed a repair call is dropped from the result
+cache, and the repair call itself bypasses it.
+"""
+
+import json
+from typing import Any, Callable
+
+from django.conf import settings
+
+from .result_cache import bypass_result_cache, discard_result, last_result_key
+from .telemetry import last_call_metric_id, record_output_repair, repair_call
+
+# Tried in order on a cut-off answer: close it where it ends, then at
+# each earlier comma.
+MAX_TRUNCATION_CUTS = 8
+
+_CLOSERS = {
+    "{": "}",
+    "[": "]",
+}
+
+
+def structured_output_enabled():
+    return getattr(settings, "AI_STRUCTURED_OUTPUT", False)
+
+
+def questions_response_format(name):
+    """
+    response_format for an answer with title, label, questions and
+    context_note. Exactly three questions is checked locally; strict
+    schemas cannot express the array length.
+    """
+
+    text = {
+        "type": "string",
+    }
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "title": text,
+                    "label": text,
+                    "questions": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "question": text,
+                                "why": text,
+                                "listen_for": text,
+                            },
+                            "required": [
+                                "question",
+                                "why",
+                                "listen_for",
+                            ],
+                            "additionalProperties": False,
+                        },
+                    },
+                    "context_note": text,
+                },
+                "required": [
+                    "title",
+                    "label",
+                    "questions",
+                    "context_note",
+                ],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def _strip_fences(text):
+    text = text.strip()
+
+    if text.startswith("```"):
+        first_newline = text.find("\n")
+        text = text[first_newline + 1:] if first_newline != -1 else ""
+
+    closing = text.rfind("```")
+
+    if closing != -1:
+        text = text[:closing]
+
+    return text.strip()
+
+
+def _drop_trailing_comma(parts):
+    while parts and parts[-1].isspace():
+        parts.pop()
+
+    if parts and parts[-1] == ",":
+        parts.pop()
+
+
+def _close(parts, stack):
+    closed = "".join(parts).rstrip()
+
+    if closed.endswith(","):
+        closed = closed[:-1]
+
+    elif closed.endswith(":"):
+        closed += "null"
+
+    return closed + "".join(
+        _CLOSERS[opener]
+        for opener in reversed(stack)
+    )
+
+
+def repair_json_text(value):
+    """
+    Best-effort valid JSON from a malformed answer, or None.
+
+    Text outside JSON values (fences, prose) is dropped, trailing
+    commas are removed and an unfinished last value is closed, where it
+    ends or otherwise at an earlier comma. Several values (NDJSON) come
+    back one per line.
+    """
+
+    text = _strip_fences(str(value or ""))
+
+    values = []
+    parts = []
+    stack = []
+    cuts = []
+    in_string = False
+    escape = False
+
+    for char in text:
+        if not stack:
+            if char in _CLOSERS:
+                parts = [char]
+                stack = [char]
+                cuts = []
+            continue
+
+        if in_string:
+            parts.append(char)
+
+            if escape:
+                escape = False
+
+            elif char == "\\":
+                escape = True
+
+            elif char == '"':
+                in_string = False
+
+            continue
+
+        if char == '"':
+            in_string = True
+
+        elif char in _CLOSERS:
+            stack.append(char)
+
+        elif char in "}]":
+            if _CLOSERS[stack[-1]] != char:
+                # Mismatched bracket; the value cannot be repaired.
+                stack = []
+                continue
+
+            _drop_trailing_comma(parts)
+            stack.pop()
+
+        elif char == ",":
+            cuts.append((len(parts), list(stack)))
+
+        parts.append(char)
+
+        if not stack:
+            values.append("".join(parts))
+
+    if stack:
+        # A string cut off mid-way is dropped rather than kept
+        # half-written.
+        candidates = [] if in_string else [
+            _close(parts, stack),
+        ]
+        candidates += [
+            _close(parts[:length], cut_stack)
+            for length, cut_stack in reversed(cuts[-MAX_TRUNCATION_CUTS:])
+        ]
+
+        for candidate in candidates:
+            try:
+                json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+
+            values.append(candidate)
+            break
+
+    valid = []
+
+    for item in values:
+        try:
+            json.loads(item)
+        except json.JSONDecodeError:
+            continue
+
+        valid.append(item)
+
+    return "\n".join(valid) or None
+
+
+def parse_with_repair(
+    raw_text: str,
+    *,
+    parse: Callable[[str], Any],
+    request_repair: Callable[[], str] | None = None,
+):
+    """
+    parse(raw_text), falling back to a local repair and then to one
+    repair call. parse returns None for an unusable answer.
+
+    Call it right after the answer's stream is consumed, so the
+    outcome lands on that answer's AICallMetric row.
+    """
+
+    metric_id = last_call_metric_id()
+    cache_key = last_result_key()
+
+    result = parse(raw_text)
+    outcome = "valid"
+
+    if result is None:
+        repaired = repair_json_text(raw_text)
+
+        if repaired is not None:
+            result = parse(repaired)
+            outcome = "local"
+
+    if result is None and request_repair is not None:
+        with repair_call(), bypass_result_cache(store=False):
+            repair_text = request_repair()
+
+        result = parse(repair_text)
+
+        if result is None:
+            repaired = repair_json_text(repair_text)
+
+            if repaired is not None:
+                result = parse(repaired)
+
+        outcome = "model"
+
+    if result is None:
+        outcome = "failed"
+
+    if outcome in {"model", "failed"}:
+        discard_result(cache_key)
+
+    record_output_repair(
+        metric_id,
+        outcome,
+    )
+
+    return result
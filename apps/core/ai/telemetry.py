@@ -0,0 +1,438 @@
+"""
+Token and latency telemetry for model calls.
+
+get_openai_client() wraps chat.completions.create and embeddings.create
+so that every call writes one AICallMetric row. Each row records the
+feature, model, tokens, time to first token (streams), total duration,
+retries and whether it was a repair call or answered from the result
+cache. A chat call made right after its section resolved an AI prompt
+(prompt_templates.resolve_ai_prompt) also records that prompt's key and
+content hash, so answers can be compared per prompt version.
+
+The feature is the apps.core.ai module that made the call (e.g.
+"cognitive_questions"), unless the caller names one with
+ai_feature(). Repair calls are marked with repair_call(), and
+record_output_repair() notes on an answer's row whether its JSON had to
+be repaired (apps.core.ai.structured_output).
+
+Retries are counted by an httpx request hook: every HTTP attempt the
+OpenAI client makes while a call is active increments its counter.
+Streaming calls ask for usage in the last chunk (include_usage). That
+chunk has no choices and is consumed here, so stream readers never see
+it.
+
+Set AI_CALL_METRICS to False to stop recording.
+"""
+
+import logging
+import math
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .prompt_templates import take_resolved_ai_prompt
+from .result_cache import CACHED_RESPONSE_ID
+
+logger = logging.getLogger(__name__)
+
+
+_current_call = ContextVar("ai_current_call", default=None)
+_feature = ContextVar("ai_feature", default="")
+_repair = ContextVar("ai_repair", default=False)
+_last_metric_id = ContextVar("ai_last_metric_id", default=None)
+
+
+def metrics_enabled():
+    return bool(getattr(settings, "AI_CALL_METRICS", False))
+
+
+@contextmanager
+def ai_feature(feature):
+    """
+    Name the feature of the model calls made inside the block.
+    """
+
+    token = _feature.set(feature)
+
+    try:
+        yield
+
+    finally:
+        _feature.reset(token)
+
+
+@contextmanager
+def repair_call():
+    """
+    Mark the model calls made inside the block as repair calls.
+    """
+
+    token = _repair.set(True)
+
+    try:
+        yield
+
+    finally:
+        _repair.reset(token)
+
+
+def last_call_metric_id():
+    """
+    AICallMetric id of the last call finished in this context.
+    """
+
+    return _last_metric_id.get()
+
+
+def record_output_repair(metric_id, outcome):
+    """
+    Store how the answer of a recorded call was parsed: valid as it
+    was, repaired locally, via a repair call, or not at all.
+    """
+
+    from apps.core.models import AICallMetric
+
+    if metric_id is None:
+        return
+
+    try:
+        AICallMetric.objects.filter(pk=metric_id).update(
+            output_repair=outcome,
+        )
+
+    except Exception:
+        logger.exception("Could not record AI output repair")
+
+
+def count_attempt(request):
+    call = _current_call.get()
+
+    if call is not None:
+        call["attempts"] += 1
+
+
+async def acount_attempt(request):
+    count_attempt(request)
+
+
+def _caller_feature(frame):
+    module = frame.f_globals.get("__name__", "") if frame else ""
+    return module.rsplit(".", 1)[-1] or "unknown"
+
+
+def _new_call(*, kind, kwargs, frame, prompt=None):
+    return {
+        "feature": (_feature.get() or _caller_feature(frame))[:100],
+        "kind": kind,
+        "model": str(kwargs.get("model") or "")[:100],
+        "stream": bool(kwargs.get("stream")),
+        "cached": False,
+        "is_repair": _repair.get(),
+        "prompt_key": prompt.key[:100] if prompt else "",
+        "prompt_hash": prompt.content_hash if prompt else "",
+        "success": True,
+        "error": "",
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "ttft_ms": None,
+        "attempts": 0,
+        "started": time.monotonic(),
+    }
+
+
+def _elapsed_ms(call):
+    return int((time.monotonic() - call["started"]) * 1000)
+
+
+def _apply_usage(call, usage):
+    if usage is None:
+        return
+
+    call["prompt_tokens"] = getattr(usage, "prompt_tokens", 0) or 0
+    call["completion_tokens"] = getattr(usage, "completion_tokens", 0) or 0
+
+
+def _record(call):
+    from apps.core.models import AICallMetric
+
+    try:
+        metric = AICallMetric.objects.create(
+            feature=call["feature"],
+            kind=call["kind"],
+            model=call["model"],
+            stream=call["stream"],
+            cached=call["cached"],
+            is_repair=call["is_repair"],
+            prompt_key=call["prompt_key"],
+            prompt_hash=call["prompt_hash"],
+            success=call["success"],
+            error=call["error"][:2000],
+            prompt_tokens=call["prompt_tokens"],
+            completion_tokens=call["completion_tokens"],
+            ttft_ms=call["ttft_ms"],
+            duration_ms=_elapsed_ms(call),
+            retries=max(call["attempts"] - 1, 0),
+        )
+
+        _last_metric_id.set(metric.pk)
+
+    except Exception:
+        logger.exception("Could not record AI call metric")
+
+
+def _call_model(create, call, kwargs):
+    token = _current_call.set(call)
+
+    try:
+        return create(**kwargs)
+
+    except Exception as e:
+        call["success"] = False
+        call["error"] = f"{type(e).__name__}: {e}"
+        _record(call)
+        raise
+
+    finally:
+        _current_call.reset(token)
+
+
+def _measure_stream(stream, call):
+    finished = False
+
+    try:
+        for event in stream:
+            if getattr(event, "id", None) == CACHED_RESPONSE_ID:
+                call["cached"] = True
+
+            if not getattr(event, "choices", None):
+                usage = getattr(event, "usage", None)
+
+                if usage is not None:
+                    _apply_usage(call, usage)
+                    continue
+
+            elif call["ttft_ms"] is None and any(
+                getattr(getattr(choice, "delta", None), "content", None)
+                for choice in event.choices
+            ):
+                call["ttft_ms"] = _elapsed_ms(call)
+
+            yield event
+
+        finished = True
+
+    except Exception as e:
+        call["success"] = False
+        call["error"] = f"{type(e).__name__}: {e}"
+        raise
+
+    finally:
+        if not finished and call["success"]:
+            call["success"] = False
+            call["error"] = "Stream closed before the end."
+
+        _record(call)
+
+
+class InstrumentedChatCompletions:
+    def __init__(self, completions):
+        self._completions = completions
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+    def create(self, **kwargs):
+        _last_metric_id.set(None)
+
+        # Taken even when not recording, so it cannot stick to a later
+        # call.
+        prompt = take_resolved_ai_prompt()
+
+        if not metrics_enabled():
+            return self._completions.create(**kwargs)
+
+        call = _new_call(
+            kind="chat",
+            kwargs=kwargs,
+            frame=sys._getframe(1),
+            prompt=prompt,
+        )
+
+        if call["stream"]:
+            kwargs.setdefault("stream_options", {"include_usage": True})
+
+        response = _call_model(self._completions.create, call, kwargs)
+
+        if call["stream"]:
+            return _measure_stream(response, call)
+
+        call["cached"] = getattr(response, "id", None) == CACHED_RESPONSE_ID
+        _apply_usage(call, getattr(response, "usage", None))
+        _record(call)
+
+        return response
+
+
+class InstrumentedEmbeddings:
+    def __init__(self, embeddings):
+        self._embeddings = embeddings
+
+    def __getattr__(self, name):
+        return getattr(self._embeddings, name)
+
+    def create(self, **kwargs):
+        if not metrics_enabled():
+            return self._embeddings.create(**kwargs)
+
+        call = _new_call(
+            kind="embedding",
+            kwargs=kwargs,
+            frame=sys._getframe(1),
+        )
+
+        response = _call_model(self._embeddings.create, call, kwargs)
+
+        _apply_usage(call, getattr(response, "usage", None))
+        _record(call)
+
+        return response
+
+
+class InstrumentedOpenAIClient:
+    """
+    OpenAI client (or CachedOpenAIClient) whose chat completions and
+    embeddings are recorded as AICallMetric rows.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self.chat = SimpleNamespace(
+            completions=InstrumentedChatCompletions(client.chat.completions),
+        )
+        self.embeddings = InstrumentedEmbeddings(client.embeddings)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def _percentile(values, percent):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+
+    if not values:
+        return None
+
+    rank = math.ceil(percent / 100 * len(values))
+
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def _summarise(rows):
+    durations = sorted(row["duration_ms"] for row in rows)
+    ttfts = sorted(
+        row["ttft_ms"]
+        for row in rows
+        if row["ttft_ms"] is not None and not row["cached"]
+    )
+    model_durations = sorted(
+        row["duration_ms"]
+        for row in rows
+        if not row["cached"]
+    )
+
+    checked = [
+        row
+        for row in rows
+        if row["output_repair"]
+    ]
+    repaired = [
+        row
+        for row in checked
+        if row["output_repair"] != "valid"
+    ]
+
+    return {
+        "calls": len(rows),
+        "errors": sum(1 for row in rows if not row["success"]),
+        "cached": sum(1 for row in rows if row["cached"]),
+        "repairs": sum(1 for row in rows if row["is_repair"]),
+        "local_repairs": sum(1 for row in checked if row["output_repair"] == "local"),
+        # Share of parsed answers that were not valid JSON as returned.
+        "repair_rate": (
+            round(100 * len(repaired) / len(checked), 1)
+            if checked
+            else None
+        ),
+        "retries": sum(row["retries"] for row in rows),
+        "prompt_tokens": sum(row["prompt_tokens"] for row in rows),
+        "completion_tokens": sum(row["completion_tokens"] for row in rows),
+        "p50_ms": _percentile(model_durations, 50),
+        "p95_ms": _percentile(model_durations, 95),
+        "p50_ttft_ms": _percentile(ttfts, 50),
+        "p95_ttft_ms": _percentile(ttfts, 95),
+        "max_ms": durations[-1] if durations else None,
+    }
+
+
+def summarize_ai_call_metrics(*, days=14, feature=""):
+    """
+    Per-feature totals and per-feature-per-day rows for the last days.
+    Latency percentiles leave out cache hits, which never reach the
+    model.
+    """
+
+    from apps.core.models import AICallMetric
+
+    metrics = (
+        AICallMetric.objects
+        .filter(created_at__gte=timezone.now() - timedelta(days=days))
+        .annotate(day=TruncDate("created_at"))
+        .values(
+            "feature",
+            "day",
+            "cached",
+            "success",
+            "is_repair",
+            "output_repair",
+            "retries",
+            "prompt_tokens",
+            "completion_tokens",
+            "ttft_ms",
+            "duration_ms",
+        )
+    )
+
+    if feature:
+        metrics = metrics.filter(feature=feature)
+
+    by_feature = {}
+    by_day = {}
+
+    for row in metrics.iterator():
+        by_feature.setdefault(row["feature"], []).append(row)
+        by_day.setdefault((row["day"], row["feature"]), []).append(row)
+
+    return {
+        "features": sorted(
+            (
+                {"feature": key, **_summarise(rows)}
+                for key, rows in by_feature.items()
+            ),
+            key=lambda item: -(item["prompt_tokens"] + item["completion_tokens"]),
+        ),
+        "days": [
+            {"day": day, "feature": key, **_summarise(rows)}
+            for (day, key), rows in sorted(
+                by_day.items(),
+                key=lambda item: (-item[0][0].toordinal(), item[0][1]),
+            )
+        ],
+    }
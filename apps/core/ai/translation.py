@@ -0,0 +1,150 @@
+"""
+Translate a saved AI section into another language.
+
+Used when a user switches language and the section has no stored
+variant in that language yet (AI_TRANSLATE_LANGUAGE_VARIANTS). One
+translation request is much cheaper than running the full analysis
+prompt again, and the result says exactly the same thing.
+
+The saved JSON goes to the model as it is, and only its human-readable
+text may change. The answer is rejected (None) unless it has exactly
+the same structure. Keys, list lengths, numbers and identifier-like
+strings such as "high" or "openness" must be unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from typing import Any
+
+from django.conf import settings
+
+from .language import (
+    get_ai_language_instruction,
+    normalize_ai_language,
+    SUPPORTED_AI_LANGUAGES,
+)
+from .openai_client import get_chat_model, get_openai_client
+from .result_cache import discard_result, last_result_key
+
+logger = logging.getLogger(__name__)
+
+
+# Values that are identifiers rather than prose and must never change.
+_IDENTIFIER = re.compile(r"^[A-Za-z0-9_.:/\-]{0,40}$")
+
+
+def _merge_translation(original: Any, translated: Any) -> Any:
+    """
+    Return the original structure with translated prose, or raise
+    ValueError when the structures differ.
+    """
+
+    if isinstance(original, dict):
+        if not isinstance(translated, dict) or set(original) != set(translated):
+            raise ValueError("Translated keys differ.")
+
+        return {
+            key: (
+                value
+                if key.startswith("_")
+                else _merge_translation(value, translated[key])
+            )
+            for key, value in original.items()
+        }
+
+    if isinstance(original, list):
+        if not isinstance(translated, list) or len(original) != len(translated):
+            raise ValueError("Translated list length differs.")
+
+        return [
+            _merge_translation(value, translated_value)
+            for value, translated_value in zip(original, translated)
+        ]
+
+    if isinstance(original, str):
+        if _IDENTIFIER.match(original):
+            return original
+
+        if not isinstance(translated, str) or not translated.strip():
+            raise ValueError("Translated text is missing.")
+
+        return translated
+
+    return original
+
+
+def translate_ai_content(
+    content: dict[str, Any],
+    *,
+    source_language: str,
+    target_language: str,
+) -> dict[str, Any] | None:
+    """
+    The content with its prose translated, or None when the
+    translation failed or did not keep the structure.
+    """
+
+    source_language = normalize_ai_language(source_language)
+    target_language = normalize_ai_language(target_language)
+
+    if not content or source_language == target_language:
+        return None
+
+    client = get_openai_client()
+
+    try:
+        response = client.chat.completions.create(
+            model=get_chat_model(),
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "You translate saved assessment interpretations "
+                        "for Talena. Return only the JSON object you are "
+                        "given, with the same keys, the same list lengths "
+                        "and the same order. Translate human-readable text "
+                        "values only; keep identifiers, event types, "
+                        "trait keys, scores and fixed values unchanged. "
+                        "Do not add, remove or soften content."
+                    ),
+                },
+                {
+                    "role": "user",
+                    "content": (
+                        f"Translate from "
+                        f"{SUPPORTED_AI_LANGUAGES[source_language]} to "
+                        f"{SUPPORTED_AI_LANGUAGES[target_language]}.\n\n"
+                        f"{get_ai_language_instruction(target_language)}\n\n"
+                        + json.dumps(content, ensure_ascii=False)
+                    ),
+                },
+            ],
+            temperature=0,
+            response_format={"type": "json_object"},
+            timeout=getattr(settings, "AI_TRANSLATION_TIMEOUT", 30.0),
+        )
+
+        translated = json.loads(
+            response.choices[0].message.content or ""
+        )
+
+        result = _merge_translation(content, translated)
+
+    except Exception as e:
+        discard_result(last_result_key())
+
+        logger.warning(
+            "AI content translation %s -> %s failed: %s",
+            source_language,
+            target_language,
+            e,
+        )
+        return None
+
+    if "_language" in result:
+        result["_language"] = target_language
+
+    return result
@@ -1,15 +1,222 @@
+import logging
+import math
 import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 import json
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
-import json
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_ENV_BASE = "https://api-test.sovaonline.com"
 DEFAULT_BASE_PATH = "integrations/cleo-test/v4"
 DEFAULT_ORDER_BASE_PATH = "integrations/cleo-test/v4"
 
+# (connect, read) timeouts in seconds per endpoint. Override with
+# SOVA_TIMEOUT_<ENDPOINT>=<read seconds>, e.g. SOVA_TIMEOUT_PROJECT_CANDIDATES=90.
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_TIMEOUTS = {
+    "accounts": 25,
+    "projects": 25,
+    "order_assessment": 40,
+    "project_candidates": 60,
+}
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 8.0
+
+# Concurrent project fetches in get_accounts_with_projects() and the
+# overall deadline in seconds. Override with SOVA_FANOUT_WORKERS and
+# SOVA_FANOUT_DEADLINE.
+DEFAULT_FANOUT_WORKERS = 8
+DEFAULT_FANOUT_DEADLINE = 30.0
+
+# Number of recent latencies kept per endpoint for percentiles.
+LATENCY_SAMPLE_SIZE = 500
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# ------------------------------------------------------------
+# Process-wide pooled transport
+# ------------------------------------------------------------
+
+_session_lock = threading.Lock()
+_session = None
+_session_pid = None
+
+
+def get_sova_session() -> requests.Session:
+    """
+    Return the process-wide requests.Session used for all Sova calls.
+
+    The session keeps TLS connections alive between calls. It is
+    recreated after a fork so gunicorn workers never share sockets
+    with the master process.
+    """
+
+    global _session, _session_pid
+
+    pid = os.getpid()
+
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            pool_size = _env_int("SOVA_POOL_MAXSIZE", 20)
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=pool_size,
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+            _session = session
+            _session_pid = pid
+
+    return _session
+
+
+class SovaTransportStats:
+    """
+    Thread-safe per-endpoint counters for Sova calls.
+
+    Read with get_sova_transport_stats(); exposed to admins through
+    the core:admin_sova_stats view.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def _entry(self, endpoint):
+        entry = self._endpoints.get(endpoint)
+
+        if entry is None:
+            entry = {
+                "calls": 0,
+                "errors": 0,
+                "retries": 0,
+                "status_codes": {},
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "latencies": deque(maxlen=LATENCY_SAMPLE_SIZE),
+            }
+            self._endpoints[endpoint] = entry
+
+        return entry
+
+    def record(self, endpoint, *, elapsed_ms, status_code=None, error=False):
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["latencies"].append(elapsed_ms)
+
+            if error:
+                entry["errors"] += 1
+
+            if status_code is not None:
+                key = str(status_code)
+                entry["status_codes"][key] = entry["status_codes"].get(key, 0) + 1
+
+    def record_retry(self, endpoint):
+        with self._lock:
+            self._entry(endpoint)["retries"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+
+            for endpoint, entry in self._endpoints.items():
+                latencies = sorted(entry["latencies"])
+
+                def percentile(p):
+                    if not latencies:
+                        return None
+                    index = min(len(latencies) - 1, int(round(p * (len(latencies) - 1))))
+                    return round(latencies[index], 1)
+
+                result[endpoint] = {
+                    "calls": entry["calls"],
+                    "errors": entry["errors"],
+                    "retries": entry["retries"],
+                    "status_codes": dict(entry["status_codes"]),
+                    "avg_ms": (
+                        round(entry["total_ms"] / entry["calls"], 1)
+                        if entry["calls"]
+                        else None
+                    ),
+                    "p50_ms": percentile(0.50),
+                    "p95_ms": percentile(0.95),
+                    "p99_ms": percentile(0.99),
+                    "max_ms": round(entry["max_ms"], 1),
+                }
+
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+
+transport_stats = SovaTransportStats()
+
+
+def get_sova_transport_stats() -> dict:
+    return transport_stats.snapshot()
+
+
+def _retry_delay(attempt, response=None):
+    """
+    Exponential backoff with full jitter. A Retry-After header from
+    Sova wins when it is present and reasonable.
+    """
+
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        try:
+            if retry_after is not None:
+                delay = float(retry_after)
+
+                # nan and inf would reach time.sleep(); negative
+                # values mean "now".
+                if math.isfinite(delay):
+                    return min(max(0.0, delay), DEFAULT_BACKOFF_MAX)
+        except ValueError:
+            pass
+
+    base = _env_float("SOVA_BACKOFF_BASE", DEFAULT_BACKOFF_BASE)
+    ceiling = min(DEFAULT_BACKOFF_MAX, base * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
 
 class SovaClient:
     def __init__(self):
@@ -19,6 +226,8 @@ class SovaClient:
         self.password = os.environ["SOVA_PASSWORD"]
         self.auth = HTTPBasicAuth(self.username, self.password)
         self.order_base_path = os.getenv("SOVA_ORDER_BASE_PATH", DEFAULT_ORDER_BASE_PATH).strip().strip("/")
+        self.max_retries = _env_int("SOVA_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+        self.session = get_sova_session()
 
 
     @property
@@ -29,25 +238,187 @@ class SovaClient:
     def order_base_url(self) -> str:
         return f"{self.env_base}/{self.order_base_path}/"
 
+    def _timeout(self, endpoint: str):
+        read_timeout = _env_float(
+            f"SOVA_TIMEOUT_{endpoint.upper()}",
+            DEFAULT_TIMEOUTS.get(endpoint, 25),
+        )
+        return (DEFAULT_CONNECT_TIMEOUT, read_timeout)
+
+    def _request(self, method: str, url: str, *, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Send one request through the pooled session.
+
+        GET requests are retried on 429/5xx and connection errors.
+        POST requests (orders) are only retried when Sova rejected them
+        with 429 or the connection could not be opened, so an order is
+        never submitted twice.
+        """
+
+        is_idempotent = method.upper() == "GET"
+        attempt = 0
+
+        while True:
+            started = time.monotonic()
+
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    auth=self.auth,
+                    timeout=self._timeout(endpoint),
+                    **kwargs,
+                )
+            except requests.RequestException as e:
+                elapsed_ms = (time.monotonic() - started) * 1000
+                transport_stats.record(endpoint, elapsed_ms=elapsed_ms, error=True)
+
+                can_retry = (
+                    is_idempotent
+                    and isinstance(e, (requests.ConnectionError, requests.Timeout))
+                ) or isinstance(e, requests.ConnectTimeout)
+
+                if can_retry and attempt < self.max_retries:
+                    delay = _retry_delay(attempt)
+                    logger.warning(
+                        "SOVA %s %s failed (%s), retrying in %.2fs",
+                        method,
+                        endpoint,
+                        e.__class__.__name__,
+                        delay,
+                    )
+                    transport_stats.record_retry(endpoint)
+                    attempt += 1
+                    time.sleep(delay)
+                    continue
+
+                raise
+
+            elapsed_ms = (time.monotonic() - started) * 1000
+            status_code = response.status_code
+
+            transport_stats.record(
+                endpoint,
+                elapsed_ms=elapsed_ms,
+                status_code=status_code,
+                error=status_code >= 400,
+            )
+
+            can_retry = status_code in RETRY_STATUS_CODES and (
+                is_idempotent or status_code == 429
+            )
+
+            if can_retry and attempt < self.max_retries:
+                delay = _retry_delay(attempt, response)
+                logger.warning(
+                    "SOVA %s %s returned %s, retrying in %.2fs",
+                    method,
+                    endpoint,
+                    status_code,
+                    delay,
+                )
+                transport_stats.record_retry(endpoint)
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            logger.debug(
+                "SOVA %s %s -> %s in %.0fms",
+                method,
+                url,
+                status_code,
+                elapsed_ms,
+            )
+
+            if status_code >= 400:
+                logger.warning(
+                    "SOVA %s %s -> %s: %s",
+                    method,
+                    endpoint,
+                    status_code,
+                    (response.text or "")[:500],
+                )
+
+            response.raise_for_status()
+            return response
+
     def get_accounts(self) -> list[dict]:
-        r = requests.get(self.base_url + "accounts/", auth=self.auth, timeout=25)
-        r.raise_for_status()
+        r = self._request("GET", self.base_url + "accounts/", endpoint="accounts")
         return (r.json() or {}).get("accounts", []) or []
 
     def get_projects_for_account(self, account_code: str) -> list[dict]:
         url = self.base_url + f"accounts/{account_code}/projects/"
-        r = requests.get(url, auth=self.auth, timeout=25)
-        r.raise_for_status()
+        r = self._request("GET", url, endpoint="projects")
         return (r.json() or {}).get("projects", []) or []
 
-    def get_accounts_with_projects(self) -> list[dict]:
+    def get_accounts_with_projects(self, *, max_workers: int | None = None, deadline: float | None = None) -> list[dict]:
+        """
+        Fetch all accounts and their projects.
+
+        Projects are fetched concurrently with at most max_workers
+        requests in flight, so the total time is close to the slowest
+        single account. An account whose projects could not be fetched,
+        or did not arrive before the overall deadline (seconds), gets an
+        empty project list and a "projects_error" message instead of
+        failing the whole call.
+        """
+        if max_workers is None:
+            max_workers = _env_int("SOVA_FANOUT_WORKERS", DEFAULT_FANOUT_WORKERS)
+        if deadline is None:
+            deadline = _env_float("SOVA_FANOUT_DEADLINE", DEFAULT_FANOUT_DEADLINE)
+
+        started = time.monotonic()
         accounts = self.get_accounts()
+
+        pending = {}
         for a in accounts:
             code = (a.get("code") or "").strip()
+            a["projects"] = []
             if code:
-                a["projects"] = self.get_projects_for_account(code)
-            else:
-                a["projects"] = []
+                pending[code] = a
+
+        if not pending:
+            return accounts
+
+        remaining = max(0.0, deadline - (time.monotonic() - started))
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(pending))),
+            thread_name_prefix="sova-projects",
+        )
+
+        try:
+            futures = {
+                executor.submit(self.get_projects_for_account, code): code
+                for code in pending
+            }
+            done, not_done = wait(futures, timeout=remaining)
+
+            for future in done:
+                account = pending[futures[future]]
+                try:
+                    account["projects"] = future.result()
+                except Exception as e:
+                    logger.warning(
+                        "SOVA projects for account %s failed: %s",
+                        futures[future],
+                        e,
+                    )
+                    account["projects_error"] = str(e) or e.__class__.__name__
+
+            for future in not_done:
+                future.cancel()
+                pending[futures[future]]["projects_error"] = "deadline exceeded"
+
+            if not_done:
+                logger.warning(
+                    "SOVA projects fan-out hit the %.1fs deadline; %s of %s accounts missing",
+                    deadline,
+                    len(not_done),
+                    len(futures),
+                )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
         return accounts
     
     def order_assessment(self, project_code: str, payload: dict) -> dict:
@@ -56,29 +427,12 @@ class SovaClient:
         Uses the existing integration base_url (cleo-test/v4).
         """
         url = self.base_url + f"order-assessment/{project_code}/"
-
-        r = requests.post(url, json=payload, auth=self.auth, timeout=25)
-
-        print("\n=== SOVA ORDER-ASSESSMENT RAW ===")
-        print("URL:", url)
-        print("STATUS:", r.status_code)
-        print("TEXT:", r.text)
-        print("=== /SOVA ORDER-ASSESSMENT RAW ===\n")
-
-        r.raise_for_status()
+        r = self._request("POST", url, endpoint="order_assessment", json=payload)
         return r.json() or {}
     
     def get_project_candidates(self, project_id: int) -> dict:
         url = self.base_url + f"project-candidates/{project_id}/"
-        r = requests.get(url, auth=self.auth, timeout=25)
-
-        print("\n=== SOVA PROJECT-CANDIDATES RAW ===")
-        print("URL:", url)
-        print("STATUS:", r.status_code)
-        print("TEXT:", r.text[:1000])
-        print("=== /SOVA PROJECT-CANDIDATES RAW ===\n")
-
-        r.raise_for_status()
+        r = self._request("GET", url, endpoint="project_candidates")
         return r.json() or {}
     
     
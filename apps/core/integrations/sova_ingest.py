@@ -0,0 +1,250 @@
+import logging
+import threading
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.integrations.sova_results import find_project_candidate
+from apps.core.integrations.sova_transitions import apply_sova_transition
+from apps.processes.models import TestInvitation
+
+logger = logging.getLogger(__name__)
+
+
+def extract_request_id(payload):
+    if not isinstance(payload, dict):
+        return ""
+
+    return str(
+        payload.get("request_id")
+        or payload.get("requestId")
+        or ""
+    )
+
+
+def extract_external_ids(payload):
+    """
+    The identifiers a Sova payload can be correlated on, in lookup
+    priority order. Missing ids are left out.
+    """
+
+    meta = payload.get("meta_data") or payload.get("metaData") or {}
+
+    sova_inv_id = (
+        payload.get("invitation_id")
+        or payload.get("invitationId")
+        or payload.get("invitation")
+        or payload.get("invitation_code")
+    )
+
+    sova_candidate_id = (
+        payload.get("sova_candidate_id")
+        or payload.get("sovaCandidateId")
+    )
+
+    ids = []
+
+    request_id = extract_request_id(payload)
+    if request_id:
+        ids.append(("request_id", request_id))
+
+    if sova_inv_id:
+        ids.append(("sova_invitation_id", str(sova_inv_id)))
+
+    if sova_candidate_id:
+        ids.append(("sova_candidate_id", str(sova_candidate_id)))
+
+    talena_process_id = meta.get("talena_process_id")
+    talena_candidate_id = meta.get("talena_candidate_id")
+
+    if talena_process_id and talena_candidate_id:
+        ids.append(("process_candidate", (str(talena_process_id), str(talena_candidate_id))))
+
+    return ids
+
+
+def _matches(invitation, kind, value):
+    if kind == "process_candidate":
+        return (str(invitation.process_id), str(invitation.candidate_id)) == value
+
+    return getattr(invitation, kind) == value
+
+
+def _external_id_filter(kind, value):
+    if kind == "process_candidate":
+        process_id, candidate_id = value
+        if not (process_id.isdigit() and candidate_id.isdigit()):
+            return None
+        return Q(process_id=int(process_id), candidate_id=int(candidate_id))
+
+    return Q(**{kind: value})
+
+
+class InvitationLookupCache:
+    """
+    Small in-process LRU of external id -> TestInvitation pk.
+
+    Only successful resolutions are cached. A cached pk is verified
+    against the invitation before use, so a reassigned request_id
+    simply falls back to the database lookup.
+    """
+
+    def __init__(self, max_size=2048):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pk = self._items.get(key)
+            if pk is not None:
+                self._items.move_to_end(key)
+            return pk
+
+    def set(self, key, pk):
+        with self._lock:
+            self._items[key] = pk
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+invitation_lookup_cache = InvitationLookupCache()
+
+
+def find_invitation_for_payload(payload):
+    """
+    Resolve the TestInvitation a Sova payload refers to.
+
+    Lookup priority: request_id, Sova invitation id, Sova candidate id
+    and finally the Talena process/candidate ids sent in meta_data.
+    All candidates are fetched in one query over indexed columns;
+    recent resolutions are served from invitation_lookup_cache.
+    """
+
+    external_ids = extract_external_ids(payload)
+
+    if not external_ids:
+        return None
+
+    # Recently resolved ids: one primary-key lookup.
+    for key in external_ids:
+        pk = invitation_lookup_cache.get(key)
+        if pk is None:
+            continue
+
+        invitation = TestInvitation.objects.filter(pk=pk).first()
+
+        if invitation and _matches(invitation, *key):
+            return invitation
+
+        invitation_lookup_cache.discard(key)
+
+    query = Q()
+    for kind, value in external_ids:
+        condition = _external_id_filter(kind, value)
+        if condition is not None:
+            query |= condition
+
+    if not query:
+        return None
+
+    candidates = list(TestInvitation.objects.filter(query))
+
+    for key in external_ids:
+        invitation = next(
+            (inv for inv in candidates if _matches(inv, *key)),
+            None,
+        )
+
+        if invitation:
+            invitation_lookup_cache.set(key, invitation.pk)
+            return invitation
+
+    return None
+
+
+def backfill_overall_score(invitation):
+    """
+    Fill overall_score for a completed invitation from the project's
+    Sova results snapshot. Errors are logged and swallowed.
+    """
+
+    if invitation.overall_score is not None:
+        return invitation.overall_score
+
+    if not (invitation.sova_project_id and invitation.request_id):
+        return None
+
+    try:
+        match = find_project_candidate(
+            invitation.sova_project_id,
+            invitation.request_id,
+        )
+
+        if not match:
+            logger.info(
+                "SOVA ingest: no matching request_id in project-candidates: %s",
+                invitation.request_id,
+            )
+            return None
+
+        invitation.overall_score = match.get("overall_score")
+        invitation.save(update_fields=["overall_score"])
+        return invitation.overall_score
+
+    except Exception:
+        logger.exception(
+            "SOVA ingest: error fetching project candidates for invitation %s",
+            invitation.id,
+        )
+        return None
+
+
+def apply_sova_ingest_payload(payload, *, observed_at=None):
+    """
+    Apply one Sova ingest payload to its TestInvitation.
+
+    All database writes for the payload happen in one transaction
+    (see apply_sova_transition); an identical re-send writes nothing.
+    The overall_score backfill talks to Sova and therefore runs after
+    the transaction has been committed.
+
+    Returns a small result dict that is stored on the WebhookDelivery.
+    """
+
+    observed_at = observed_at or timezone.now()
+
+    invitation = find_invitation_for_payload(payload)
+
+    if not invitation:
+        return {
+            "status": "ignored",
+            "reason": "invitation not found",
+            "invitation": None,
+        }
+
+    transition = apply_sova_transition(
+        invitation,
+        payload,
+        observed_at=observed_at,
+    )
+
+    if transition["normalized"] == "completed":
+        backfill_overall_score(invitation)
+
+    return {
+        "status": "ok" if transition["applied"] else "unchanged",
+        "normalized": transition["normalized"],
+        "changed_fields": transition["changed_fields"],
+        "invitation": invitation,
+    }
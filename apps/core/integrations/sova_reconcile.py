@@ -0,0 +1,254 @@
+"""
+Bulk reconciliation of TestInvitation status against Sova, as a
+fallback for missed webhooks (see the reconcile_sova_status command).
+
+Sova is asked once per project (through the shared results snapshot),
+changes for every affected invitation are computed in memory and
+written with one bulk_update plus one bulk insert of activity events.
+"""
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.activity.models import ActivityEvent
+from apps.core.integrations.sova_results import (
+    get_project_snapshot,
+    refresh_project_snapshot,
+)
+from apps.core.integrations.sova_transitions import normalize_overall_status
+from apps.core.models import SovaProjectResultsSnapshot
+from apps.processes.models import TestInvitation
+from apps.processes.services.ai_pregeneration import schedule_pregeneration
+
+logger = logging.getLogger(__name__)
+
+
+OPEN_STATUSES = ("sent", "started")
+
+RECONCILED_FIELDS = [
+    "status",
+    "started_at",
+    "completed_at",
+    "sova_overall_status",
+    "overall_score",
+]
+
+STATUS_RANK = {
+    "created": 0,
+    "sent": 1,
+    "started": 2,
+    "completed": 3,
+}
+
+
+def _reconcilable_invitations(project_ids=None):
+    """
+    Invitations Sova can still move: open ones, and completed ones
+    that are missing an overall_score.
+    """
+
+    qs = (
+        TestInvitation.objects
+        .filter(
+            sova_project_id__isnull=False,
+            is_historical=False,
+        )
+        .exclude(request_id__isnull=True)
+        .exclude(request_id="")
+    )
+
+    open_or_unscored = (
+        qs.filter(status__in=OPEN_STATUSES)
+        | qs.filter(status="completed", overall_score__isnull=True)
+    )
+
+    if project_ids:
+        open_or_unscored = open_or_unscored.filter(sova_project_id__in=project_ids)
+
+    return open_or_unscored
+
+
+def active_project_ids(project_ids=None):
+    return sorted(
+        set(
+            _reconcilable_invitations(project_ids)
+            .values_list("sova_project_id", flat=True)
+        )
+    )
+
+
+def _entry_score(entry):
+    score = entry.get("overall_score")
+
+    if score is None and isinstance(entry.get("project_results"), dict):
+        score = entry["project_results"].get("overall_score")
+
+    return score
+
+
+def compute_invitation_changes(invitation, entry, *, observed_at):
+    """
+    Apply one project-candidates entry to an invitation in memory.
+
+    Status only moves forward (sent -> started -> completed). Returns
+    (changed_fields, new_status or "").
+    """
+
+    changed = []
+    normalized, _reason = normalize_overall_status(entry)
+
+    overall_raw = (entry.get("overall_status") or entry.get("overallStatus") or "").strip()
+    if overall_raw and invitation.sova_overall_status != overall_raw:
+        invitation.sova_overall_status = overall_raw
+        changed.append("sova_overall_status")
+
+    new_status = ""
+
+    if normalized and STATUS_RANK.get(normalized, 0) > STATUS_RANK.get(invitation.status, 0):
+        invitation.status = normalized
+        new_status = normalized
+        changed.append("status")
+
+    if normalized in {"started", "completed"} and invitation.started_at is None:
+        invitation.started_at = observed_at
+        changed.append("started_at")
+
+    if normalized == "completed" and invitation.completed_at is None:
+        invitation.completed_at = observed_at
+        changed.append("completed_at")
+
+    score = _entry_score(entry)
+    if score is not None and invitation.overall_score != score:
+        invitation.overall_score = score
+        changed.append("overall_score")
+
+    return changed, new_status
+
+
+def reconcile_sova_status(*, project_ids=None, force_refresh=False, dry_run=False, batch_size=500):
+    """
+    Reconcile all open invitations with Sova.
+
+    Returns a summary dict with counters and per-project errors.
+    """
+
+    observed_at = timezone.now()
+    summary = {
+        "projects": 0,
+        "project_errors": {},
+        "invitations": 0,
+        "updated": 0,
+        "status_changes": 0,
+        "scores": 0,
+        "not_in_sova": 0,
+    }
+
+    snapshots = {}
+
+    for project_id in active_project_ids(project_ids):
+        summary["projects"] += 1
+
+        try:
+            if force_refresh:
+                snapshot, _ = SovaProjectResultsSnapshot.objects.get_or_create(
+                    sova_project_id=project_id,
+                )
+                snapshot = refresh_project_snapshot(snapshot)
+            else:
+                snapshot = get_project_snapshot(project_id)
+        except Exception as e:
+            summary["project_errors"][project_id] = str(e)
+            continue
+
+        snapshots[project_id] = snapshot.candidates or {}
+
+    if not snapshots:
+        return summary
+
+    with transaction.atomic():
+        invitations = list(
+            _reconcilable_invitations(list(snapshots))
+            .select_related("process", "candidate")
+            .select_for_update(of=("self",))
+        )
+
+        summary["invitations"] = len(invitations)
+
+        changed_invitations = []
+        completed_invitations = []
+        events = []
+
+        for invitation in invitations:
+            entry = snapshots[invitation.sova_project_id].get(str(invitation.request_id))
+
+            if not entry:
+                summary["not_in_sova"] += 1
+                continue
+
+            old_status = invitation.status
+
+            changed, new_status = compute_invitation_changes(
+                invitation,
+                entry,
+                observed_at=observed_at,
+            )
+
+            if not changed:
+                continue
+
+            changed_invitations.append(invitation)
+
+            if "overall_score" in changed:
+                summary["scores"] += 1
+
+            if new_status:
+                summary["status_changes"] += 1
+
+                if new_status == "completed":
+                    completed_invitations.append(invitation)
+
+                if invitation.process.company_id:
+                    events.append(
+                        ActivityEvent(
+                            company_id=invitation.process.company_id,
+                            verb=ActivityEvent.Verb.STATUS_CHANGED,
+                            actor=None,
+                            actor_name="SOVA",
+                            process=invitation.process,
+                            candidate=invitation.candidate,
+                            invitation=invitation,
+                            meta={
+                                "old_status": old_status,
+                                "new_status": new_status,
+                                "reason": "reconcile",
+                            },
+                        )
+                    )
+
+        summary["updated"] = len(changed_invitations)
+
+        if dry_run:
+            transaction.set_rollback(True)
+            return summary
+
+        if changed_invitations:
+            TestInvitation.objects.bulk_update(
+                changed_invitations,
+                RECONCILED_FIELDS,
+                batch_size=batch_size,
+            )
+
+        if events:
+            ActivityEvent.objects.bulk_create(
+                events,
+                batch_size=batch_size,
+            )
+
+        for invitation in completed_invitations:
+            schedule_pregeneration(invitation)
+
+    logger.info("SOVA reconcile: %s", summary)
+
+    return summary
@@ -0,0 +1,199 @@
+"""
+Per-project snapshot of Sova's project-candidates results.
+
+Sova only exposes results per project, so looking up one candidate's
+overall_score means downloading the whole project. The snapshot keeps
+the last download in SovaProjectResultsSnapshot, indexed by request_id,
+and refreshes it at most once per SOVA_RESULTS_SNAPSHOT_TTL seconds.
+Concurrent handlers (threads or gunicorn workers) share the row: one of
+them refreshes, the others wait for that fetch.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.integrations.sova import SovaClient
+from apps.core.models import SovaProjectResultsSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SNAPSHOT_TTL = 60
+
+# A refresh lease older than this is assumed to belong to a worker that
+# died, and may be taken over.
+REFRESH_LEASE = timedelta(seconds=90)
+
+# How long a handler waits for another worker's refresh to land.
+WAIT_FOR_REFRESH = 15.0
+WAIT_POLL_INTERVAL = 0.25
+
+
+def _snapshot_ttl():
+    return timedelta(
+        seconds=getattr(settings, "SOVA_RESULTS_SNAPSHOT_TTL", DEFAULT_SNAPSHOT_TTL)
+    )
+
+
+def index_project_candidates(data):
+    """
+    Index a project-candidates response by request_id.
+    """
+
+    items = data.get("candidates") if isinstance(data, dict) else data
+
+    return {
+        str(item.get("request_id")): item
+        for item in (items or [])
+        if isinstance(item, dict) and item.get("request_id")
+    }
+
+
+def _is_fresh(snapshot, now):
+    return (
+        snapshot.fetched_at is not None
+        and snapshot.fetched_at >= now - _snapshot_ttl()
+    )
+
+
+def _claim_refresh(snapshot, now):
+    """
+    Take the refresh lease for a stale snapshot. Returns True for the
+    one caller that should fetch from Sova.
+    """
+
+    return bool(
+        SovaProjectResultsSnapshot.objects
+        .filter(pk=snapshot.pk)
+        .filter(
+            Q(fetched_at__isnull=True)
+            | Q(fetched_at__lt=now - _snapshot_ttl())
+        )
+        .filter(
+            Q(refresh_started_at__isnull=True)
+            | Q(refresh_started_at__lt=now - REFRESH_LEASE)
+        )
+        .update(refresh_started_at=now)
+    )
+
+
+def refresh_project_snapshot(snapshot, *, client=None):
+    """
+    Download the project's candidates from Sova and store them on the
+    snapshot. Releases the refresh lease also when the fetch fails.
+    """
+
+    try:
+        client = client or SovaClient()
+        data = client.get_project_candidates(snapshot.sova_project_id)
+    except Exception as e:
+        logger.exception(
+            "SOVA results snapshot: fetch failed for project %s",
+            snapshot.sova_project_id,
+        )
+        SovaProjectResultsSnapshot.objects.filter(pk=snapshot.pk).update(
+            refresh_started_at=None,
+            last_error=str(e),
+        )
+        raise
+
+    candidates = index_project_candidates(data)
+
+    snapshot.candidates = candidates
+    snapshot.candidate_count = len(candidates)
+    snapshot.fetched_at = timezone.now()
+    snapshot.refresh_started_at = None
+    snapshot.last_error = ""
+
+    snapshot.save(
+        update_fields=[
+            "candidates",
+            "candidate_count",
+            "fetched_at",
+            "refresh_started_at",
+            "last_error",
+        ]
+    )
+
+    return snapshot
+
+
+def _wait_for_refresh(snapshot, previous_fetched_at):
+    deadline = time.monotonic() + WAIT_FOR_REFRESH
+
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_POLL_INTERVAL)
+        snapshot.refresh_from_db()
+
+        if snapshot.fetched_at != previous_fetched_at:
+            break
+
+        if snapshot.refresh_started_at is None:
+            # The other worker gave up; use what is stored.
+            break
+
+    return snapshot
+
+
+def get_project_snapshot(sova_project_id, *, client=None):
+    """
+    Return an up-to-date SovaProjectResultsSnapshot for the project.
+
+    A snapshot younger than SOVA_RESULTS_SNAPSHOT_TTL is returned as is.
+    Otherwise one caller refreshes it and concurrent callers wait for
+    that refresh (up to WAIT_FOR_REFRESH seconds).
+    """
+
+    snapshot, _ = SovaProjectResultsSnapshot.objects.get_or_create(
+        sova_project_id=sova_project_id,
+    )
+
+    now = timezone.now()
+
+    if _is_fresh(snapshot, now):
+        return snapshot
+
+    if _claim_refresh(snapshot, now):
+        return refresh_project_snapshot(snapshot, client=client)
+
+    snapshot.refresh_from_db()
+
+    if _is_fresh(snapshot, now):
+        return snapshot
+
+    return _wait_for_refresh(snapshot, snapshot.fetched_at)
+
+
+def find_project_candidate(sova_project_id, request_id, *, client=None):
+    """
+    Look up one candidate's Sova results by request_id.
+
+    The stored snapshot is checked first; only when the candidate is
+    missing or has no overall_score yet is the snapshot refreshed, and
+    then at most once per TTL window for the whole project.
+    """
+
+    if not (sova_project_id and request_id):
+        return None
+
+    request_id = str(request_id)
+
+    snapshot = (
+        SovaProjectResultsSnapshot.objects
+        .filter(sova_project_id=sova_project_id)
+        .first()
+    )
+
+    if snapshot:
+        match = (snapshot.candidates or {}).get(request_id)
+        if match and match.get("overall_score") is not None:
+            return match
+
+    snapshot = get_project_snapshot(sova_project_id, client=client)
+
+    return (snapshot.candidates or {}).get(request_id)
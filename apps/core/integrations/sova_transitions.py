@@ -0,0 +1,365 @@
+"""
+State transitions for TestInvitation driven by Sova payloads.
+
+Both Sova endpoints (the legacy /webhooks/sova/ view and the ingest
+inbox) apply payloads through apply_sova_transition. It diffs the
+payload against the stored invitation and writes only the fields that
+changed, in one UPDATE inside one transaction. A payload identical to
+the last applied one is skipped without any writes.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.activity.models import ActivityEvent
+from apps.processes.models import TestInvitation
+from apps.processes.services.ai_pregeneration import schedule_pregeneration
+from apps.processes.services.assessment_usage import (
+    sync_assessment_usage_from_activities,
+)
+
+logger = logging.getLogger(__name__)
+
+
+OVERALL_COMPLETED = {"completed", "pass", "fail", "refer"}
+OVERALL_STARTED = {"in progress"}
+
+ACTIVITY_COMPLETED = {"completed", "complete", "finished", "done", "result available", "result_available"}
+ACTIVITY_STARTED = {"started", "in progress"}
+
+
+def _norm(s: str) -> str:
+    """Normaliserar SOVA-strängar"""
+    s = (s or "").strip().lower()
+    s = s.replace("-", " ")
+    s = " ".join(s.split())
+    return s
+
+
+def sova_payload_hash(payload) -> str:
+    """
+    Stable SHA-256 of a parsed payload. Key order and whitespace in the
+    original body do not affect the hash.
+    """
+
+    canonical = json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def normalize_overall_status(payload):
+    """
+    Map a Sova payload to Talena's lifecycle status.
+
+    Returns (normalized, reason) where normalized is "started",
+    "completed" or "".
+    """
+
+    overall = _norm(
+        payload.get("overall_status")
+        or payload.get("overallStatus")
+        or ""
+    )
+
+    current_phase_code = (
+        payload.get("current_phase_code")
+        or payload.get("currentPhaseCode")
+        or ""
+    ).strip()
+
+    current_phase_idx = payload.get("current_phase_idx")
+    if current_phase_idx is None:
+        current_phase_idx = payload.get("currentPhaseIdx")
+
+    has_phase_hint = bool(current_phase_code) or (current_phase_idx is not None)
+
+    if overall in OVERALL_COMPLETED:
+        return "completed", f"overall={overall}"
+
+    if overall in OVERALL_STARTED or has_phase_hint:
+        return "started", f"overall={overall} phase_hint={has_phase_hint}"
+
+    return "", f"no mapping hit (overall={overall})"
+
+
+def extract_activities(payload):
+    """
+    Activities from the top level, or collected from the phases.
+    """
+
+    activities = list(payload.get("activities") or [])
+
+    if not activities:
+        for phase in payload.get("phases") or []:
+            activities.extend(phase.get("activities") or [])
+
+    return activities
+
+
+def activity_statuses(activities):
+    return {
+        (item.get("activity") or "").strip(): _norm(item.get("status") or "")
+        for item in activities or []
+        if isinstance(item, dict)
+    }
+
+
+def _target_fields(invitation, payload, *, observed_at):
+    """
+    The TestInvitation field values the payload asks for.
+    """
+
+    current_phase_code = (
+        payload.get("current_phase_code")
+        or payload.get("currentPhaseCode")
+        or ""
+    ).strip()
+
+    current_phase_idx = payload.get("current_phase_idx")
+    if current_phase_idx is None:
+        current_phase_idx = payload.get("currentPhaseIdx")
+
+    target = {
+        "sova_payload": payload,
+        "sova_activities": extract_activities(payload),
+        "sova_phases": payload.get("phases") or [],
+        "sova_reports": payload.get("reports") or [],
+        "sova_current_phase_code": current_phase_code,
+        "sova_current_phase_idx": current_phase_idx,
+    }
+
+    overall_raw = payload.get("overall_status") or payload.get("overallStatus") or ""
+    if overall_raw:
+        target["sova_overall_status"] = overall_raw.strip()
+
+    project_results = payload.get("project_results")
+    if isinstance(project_results, dict):
+        target["project_results"] = project_results
+
+        if project_results.get("overall_score") is not None:
+            target["overall_score"] = project_results.get("overall_score")
+
+    normalized, reason = normalize_overall_status(payload)
+
+    if normalized == "started":
+        if invitation.status not in {"started", "completed"}:
+            target["status"] = "started"
+
+        if invitation.started_at is None:
+            target["started_at"] = observed_at
+
+    elif normalized == "completed":
+        target["status"] = "completed"
+
+        # A completed invitation must have been started,
+        # even if Talena did not receive an earlier webhook.
+        if invitation.started_at is None:
+            target["started_at"] = observed_at
+
+        # Preserve the first observed completion time.
+        if invitation.completed_at is None:
+            target["completed_at"] = observed_at
+
+    return target, normalized, reason
+
+
+def _status_event(invitation, *, meta):
+    return ActivityEvent(
+        company=invitation.process.company,
+        verb=ActivityEvent.Verb.STATUS_CHANGED,
+        actor=None,
+        actor_name="SOVA",
+        process=invitation.process,
+        candidate=invitation.candidate,
+        invitation=invitation,
+        meta=meta,
+    )
+
+
+def _activity_events(invitation, old_statuses, new_statuses):
+    events = []
+
+    for activity_name, new_activity_status in new_statuses.items():
+        old_activity_status = old_statuses.get(activity_name)
+
+        if old_activity_status == new_activity_status:
+            continue
+
+        if new_activity_status in ACTIVITY_STARTED:
+            new_status = "started"
+        elif new_activity_status in ACTIVITY_COMPLETED:
+            new_status = "completed"
+        else:
+            continue
+
+        events.append(
+            _status_event(
+                invitation,
+                meta={
+                    "old_status": old_activity_status,
+                    "new_status": new_status,
+                    "activity_name": activity_name,
+                    "level": "activity",
+                },
+            )
+        )
+
+    return events
+
+
+def apply_sova_transition(invitation, payload, *, observed_at=None, activity_events=False):
+    """
+    Apply one Sova payload to an invitation.
+
+    Only fields whose value differs from the stored one are written,
+    together with sova_payload_hash, in a single UPDATE. Status change
+    events (and per-activity events when activity_events is True) are
+    inserted in the same transaction. AssessmentUsage is only synced
+    when an activity status changed. Moving to "completed" queues AI
+    pre-generation when it is enabled.
+
+    Returns a dict with "applied" (False for an identical re-send),
+    "normalized", "reason", "status_changed" and "changed_fields".
+    """
+
+    observed_at = observed_at or timezone.now()
+    payload_hash = sova_payload_hash(payload)
+
+    if invitation.sova_payload_hash == payload_hash:
+        normalized, reason = normalize_overall_status(payload)
+        return {
+            "applied": False,
+            "normalized": normalized,
+            "reason": reason,
+            "status_changed": False,
+            "changed_fields": [],
+        }
+
+    with transaction.atomic():
+        locked = (
+            TestInvitation.objects
+            .select_for_update()
+            .select_related("process", "process__company", "candidate")
+            .get(pk=invitation.pk)
+        )
+
+        normalized, reason = normalize_overall_status(payload)
+
+        if locked.sova_payload_hash == payload_hash:
+            # Another worker applied the same payload meanwhile.
+            _copy_state(locked, invitation)
+            return {
+                "applied": False,
+                "normalized": normalized,
+                "reason": reason,
+                "status_changed": False,
+                "changed_fields": [],
+            }
+
+        target, normalized, reason = _target_fields(
+            locked,
+            payload,
+            observed_at=observed_at,
+        )
+
+        changes = {
+            field: value
+            for field, value in target.items()
+            if getattr(locked, field) != value
+        }
+
+        old_status = locked.status
+        old_activity_statuses = activity_statuses(locked.sova_activities)
+        new_activity_statuses = activity_statuses(target["sova_activities"])
+        activities_changed = old_activity_statuses != new_activity_statuses
+        status_changed = "status" in changes
+
+        changes["sova_payload_hash"] = payload_hash
+
+        TestInvitation.objects.filter(pk=locked.pk).update(**changes)
+
+        for field, value in changes.items():
+            setattr(locked, field, value)
+
+        events = []
+
+        if activity_events:
+            events.extend(
+                _activity_events(
+                    locked,
+                    old_activity_statuses,
+                    new_activity_statuses,
+                )
+            )
+
+        if status_changed:
+            events.append(
+                _status_event(
+                    locked,
+                    meta={
+                        "old_status": old_status,
+                        "new_status": normalized,
+                        "reason": reason,
+                    },
+                )
+            )
+
+        if events and locked.process.company_id:
+            ActivityEvent.objects.bulk_create(events)
+
+        if activities_changed:
+            sync_assessment_usage_from_activities(
+                invitation=locked,
+                activities=target["sova_activities"],
+                observed_at=observed_at,
+            )
+
+        if status_changed and normalized == "completed":
+            schedule_pregeneration(locked)
+
+    _copy_state(locked, invitation)
+
+    changed_fields = sorted(
+        field
+        for field in changes
+        if field != "sova_payload_hash"
+    )
+
+    logger.info(
+        "SOVA transition applied: invitation=%s normalized=%s reason=%s status_changed=%s fields=%s",
+        invitation.id,
+        normalized,
+        reason,
+        status_changed,
+        changed_fields,
+    )
+
+    return {
+        "applied": True,
+        "normalized": normalized,
+        "reason": reason,
+        "status_changed": status_changed,
+        "changed_fields": changed_fields,
+    }
+
+
+def _copy_state(source, target):
+    """
+    Refresh the caller's instance with the state written under lock.
+    """
+
+    if source is target:
+        return
+
+    for field in source._meta.concrete_fields:
+        setattr(target, field.attname, getattr(source, field.attname))
@@ -0,0 +1,220 @@
+"""
+Bounded on-disk capture of incoming webhook bodies for debugging and
+replay (see the replay_webhooks management command).
+
+Each sampled delivery is stored as one gzip-compressed JSON file in
+SOVA_WEBHOOK_CAPTURE_DIR. When the directory grows beyond
+SOVA_WEBHOOK_CAPTURE_MAX_BYTES the oldest captures are deleted, so the
+store behaves like a ring buffer.
+"""
+
+import gzip
+import json
+import logging
+import os
+import random
+import re
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_SAMPLE_RATE = 1.0
+
+CAPTURE_SUFFIX = ".json.gz"
+
+# Same allow-list as the webhook inbox. The webhook secret is never
+# written to disk.
+CAPTURED_HEADERS = (
+    "Content-Type",
+    "Content-Length",
+    "User-Agent",
+    "X-Request-Id",
+    "X-Event-Type",
+    "X-Forwarded-For",
+)
+
+_evict_lock = threading.Lock()
+
+
+def capture_dir() -> Path:
+    return Path(
+        getattr(settings, "SOVA_WEBHOOK_CAPTURE_DIR", "")
+        or os.path.join(settings.BASE_DIR, "debug_webhooks")
+    )
+
+
+def capture_enabled() -> bool:
+    return bool(getattr(settings, "SOVA_WEBHOOK_DEBUG_TO_FILE", False))
+
+
+def _safe_name(value) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(value or "no_request_id"))[:120]
+
+
+def _should_sample() -> bool:
+    rate = getattr(settings, "SOVA_WEBHOOK_CAPTURE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)
+
+    if rate >= 1:
+        return True
+
+    return random.random() < rate
+
+
+def evict_captures(directory=None, *, max_bytes=None):
+    """
+    Delete the oldest captures until the store fits in max_bytes.
+    Returns the number of files removed.
+    """
+
+    directory = Path(directory or capture_dir())
+    max_bytes = max_bytes if max_bytes is not None else getattr(
+        settings,
+        "SOVA_WEBHOOK_CAPTURE_MAX_BYTES",
+        DEFAULT_MAX_BYTES,
+    )
+
+    with _evict_lock:
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(directory)
+                if entry.is_file() and entry.name.endswith(CAPTURE_SUFFIX)
+            ]
+        except FileNotFoundError:
+            return 0
+
+        sizes = {entry.path: entry.stat().st_size for entry in entries}
+        total = sum(sizes.values())
+
+        if total <= max_bytes:
+            return 0
+
+        removed = 0
+
+        # File names start with the capture timestamp, so name order is
+        # capture order.
+        for entry in sorted(entries, key=lambda e: e.name):
+            if total <= max_bytes:
+                break
+
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+            total -= sizes[entry.path]
+            removed += 1
+
+        return removed
+
+
+def capture_webhook(*, raw_body: bytes, headers, payload=None, source="sova"):
+    """
+    Store one webhook delivery if capture is enabled and the delivery
+    is sampled. Never raises; capture must not break the webhook.
+
+    Returns the path of the written file, or None.
+    """
+
+    if not capture_enabled() or not _should_sample():
+        return None
+
+    try:
+        directory = capture_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+
+        request_id = ""
+        if isinstance(payload, dict):
+            request_id = payload.get("request_id") or payload.get("requestId") or ""
+
+        received_at = timezone.now()
+        filename = (
+            f"{source}_{received_at.strftime('%Y%m%d_%H%M%S_%f')}_"
+            f"{_safe_name(request_id)}{CAPTURE_SUFFIX}"
+        )
+        path = directory / filename
+
+        record = {
+            "source": source,
+            "received_at": received_at.isoformat(),
+            "headers": {
+                name: headers.get(name)
+                for name in CAPTURED_HEADERS
+                if headers.get(name)
+            },
+            "raw_body": (raw_body or b"").decode("utf-8", errors="replace"),
+        }
+
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+
+        evict_captures(directory)
+
+        return path
+
+    except Exception:
+        logger.exception("Could not capture webhook delivery")
+        return None
+
+
+def load_capture(path):
+    """
+    Read one captured delivery and return its raw body as bytes.
+
+    Understands the compressed captures written by capture_webhook as
+    well as the older debug_webhooks files (sova_*.json with the parsed
+    payload and sova_raw_*.txt with the raw body).
+    """
+
+    path = Path(path)
+
+    if path.name.endswith(CAPTURE_SUFFIX):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            record = json.load(f)
+        return record.get("raw_body", "").encode("utf-8")
+
+    data = path.read_bytes()
+
+    if path.suffix == ".json":
+        # Re-serialise so the body is what Sova would have sent.
+        return json.dumps(json.loads(data), ensure_ascii=False).encode("utf-8")
+
+    return data
+
+
+def iter_capture_paths(paths):
+    """
+    Expand files and directories into replayable capture files, in
+    capture order. Header dumps from the old debug format are skipped.
+    """
+
+    found = []
+
+    for raw_path in paths:
+        path = Path(raw_path)
+
+        if path.is_file():
+            found.append(path)
+            continue
+
+        if not path.is_dir():
+            continue
+
+        for candidate in path.iterdir():
+            name = candidate.name
+
+            if not candidate.is_file() or name.startswith("sova_headers_"):
+                continue
+
+            # The old debug format stored every delivery both as raw
+            # text and as parsed JSON; the JSON copy is replayed.
+            if name.endswith(CAPTURE_SUFFIX) or name.endswith(".json"):
+                found.append(candidate)
+
+    return sorted(found, key=lambda p: (p.name.split("_", 1)[-1], p.name))
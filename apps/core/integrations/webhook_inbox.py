@@ -0,0 +1,325 @@
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.integrations.sova_ingest import (
+    apply_sova_ingest_payload,
+    extract_request_id,
+)
+from apps.core.models import WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_STALE_AFTER = timedelta(minutes=10)
+
+# Wait before retrying a failed delivery: RETRY_BACKOFF after the first
+# failure, doubling per attempt up to MAX_RETRY_BACKOFF.
+RETRY_BACKOFF = timedelta(seconds=30)
+MAX_RETRY_BACKOFF = timedelta(minutes=30)
+
+# Only these headers are kept on the delivery row. The webhook secret
+# is never persisted.
+STORED_HEADERS = (
+    "Content-Type",
+    "Content-Length",
+    "User-Agent",
+    "X-Request-Id",
+    "X-Event-Type",
+    "X-Forwarded-For",
+)
+
+
+def hash_payload(raw_body: bytes) -> str:
+    return hashlib.sha256(raw_body or b"").hexdigest()
+
+
+def record_delivery(*, raw_body: bytes, headers, payload=None, provider=WebhookDelivery.Provider.SOVA):
+    """
+    Persist one incoming webhook body to the inbox and return the row.
+
+    This is the only database write done inside the webhook request.
+    """
+
+    return WebhookDelivery.objects.create(
+        provider=provider,
+        raw_body=(raw_body or b"").decode("utf-8", errors="replace"),
+        headers={
+            name: headers.get(name)
+            for name in STORED_HEADERS
+            if headers.get(name)
+        },
+        payload_hash=hash_payload(raw_body),
+        request_id=extract_request_id(payload)[:512],
+    )
+
+
+def retry_backoff(attempts):
+    return min(
+        RETRY_BACKOFF * 2 ** max(attempts - 1, 0),
+        MAX_RETRY_BACKOFF,
+    )
+
+
+def claim_deliveries(*, batch_size=DEFAULT_BATCH_SIZE, stale_after=DEFAULT_STALE_AFTER):
+    """
+    Claim the oldest pending deliveries for this worker.
+
+    Pending rows waiting out a retry backoff are skipped. Rows left in
+    "processing" by a worker that died are reclaimed once they are
+    older than stale_after. On PostgreSQL concurrent workers skip each
+    other's locked rows.
+    """
+
+    now = timezone.now()
+
+    with transaction.atomic():
+        claimed_ids = list(
+            WebhookDelivery.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(
+                    Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now),
+                    status=WebhookDelivery.Status.PENDING,
+                )
+                | Q(
+                    status=WebhookDelivery.Status.PROCESSING,
+                    locked_at__lt=now - stale_after,
+                )
+            )
+            .order_by("received_at", "id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+
+        if not claimed_ids:
+            return []
+
+        WebhookDelivery.objects.filter(
+            id__in=claimed_ids,
+        ).update(
+            status=WebhookDelivery.Status.PROCESSING,
+            locked_at=now,
+        )
+
+    return list(
+        WebhookDelivery.objects
+        .filter(id__in=claimed_ids)
+        .order_by("received_at", "id")
+    )
+
+
+def _has_earlier_unfinished(delivery, claimed_ids):
+    """
+    True when an older delivery for the same request_id is still
+    waiting outside this batch. Updates for one invitation must be
+    applied in the order they were received.
+    """
+
+    if not delivery.request_id:
+        return False
+
+    return (
+        WebhookDelivery.objects
+        .filter(
+            request_id=delivery.request_id,
+            status__in=[
+                WebhookDelivery.Status.PENDING,
+                WebhookDelivery.Status.PROCESSING,
+            ],
+        )
+        .filter(
+            Q(received_at__lt=delivery.received_at)
+            | Q(received_at=delivery.received_at, id__lt=delivery.id)
+        )
+        .exclude(id__in=claimed_ids)
+        .exists()
+    )
+
+
+def _is_duplicate(delivery):
+    """
+    A delivery is a duplicate when an identical body for the same
+    request_id has already been applied.
+    """
+
+    return (
+        WebhookDelivery.objects
+        .filter(
+            request_id=delivery.request_id,
+            payload_hash=delivery.payload_hash,
+            status=WebhookDelivery.Status.PROCESSED,
+        )
+        .exclude(id=delivery.id)
+        .exists()
+    )
+
+
+def _finish(delivery, *, status, result=None, error="", invitation=None):
+    delivery.status = status
+    delivery.result = result or {}
+    delivery.last_error = error
+    delivery.invitation = invitation
+    delivery.locked_at = None
+    delivery.next_attempt_at = None
+    delivery.processed_at = timezone.now()
+
+    delivery.save(
+        update_fields=[
+            "status",
+            "result",
+            "last_error",
+            "invitation",
+            "locked_at",
+            "next_attempt_at",
+            "processed_at",
+            "attempts",
+        ]
+    )
+
+
+def process_delivery(delivery, *, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Apply one claimed delivery and record the outcome on the row.
+
+    Returns the final WebhookDelivery status.
+    """
+
+    delivery.attempts += 1
+
+    if _is_duplicate(delivery):
+        _finish(
+            delivery,
+            status=WebhookDelivery.Status.DUPLICATE,
+        )
+        return delivery.status
+
+    try:
+        payload = json.loads(delivery.raw_body)
+    except ValueError as e:
+        _finish(
+            delivery,
+            status=WebhookDelivery.Status.FAILED,
+            error=f"invalid json: {e}",
+        )
+        return delivery.status
+
+    if not isinstance(payload, dict):
+        _finish(
+            delivery,
+            status=WebhookDelivery.Status.FAILED,
+            error="payload is not a JSON object",
+        )
+        return delivery.status
+
+    try:
+        result = apply_sova_ingest_payload(
+            payload,
+            observed_at=delivery.received_at,
+        )
+    except Exception as e:
+        logger.exception(
+            "Webhook delivery %s failed (attempt %s)",
+            delivery.id,
+            delivery.attempts,
+        )
+
+        if delivery.attempts >= max_attempts:
+            _finish(
+                delivery,
+                status=WebhookDelivery.Status.FAILED,
+                error=str(e),
+            )
+        else:
+            delivery.status = WebhookDelivery.Status.PENDING
+            delivery.last_error = str(e)
+            delivery.locked_at = None
+            delivery.next_attempt_at = timezone.now() + retry_backoff(delivery.attempts)
+            delivery.save(
+                update_fields=[
+                    "status",
+                    "last_error",
+                    "locked_at",
+                    "next_attempt_at",
+                    "attempts",
+                ]
+            )
+
+        return delivery.status
+
+    invitation = result.pop("invitation", None)
+
+    _finish(
+        delivery,
+        status={
+            "ignored": WebhookDelivery.Status.IGNORED,
+            "unchanged": WebhookDelivery.Status.DUPLICATE,
+        }.get(result.get("status"), WebhookDelivery.Status.PROCESSED),
+        result=result,
+        invitation=invitation,
+    )
+
+    return delivery.status
+
+
+def process_pending_deliveries(
+    *,
+    batch_size=DEFAULT_BATCH_SIZE,
+    max_attempts=DEFAULT_MAX_ATTEMPTS,
+    stale_after=DEFAULT_STALE_AFTER,
+):
+    """
+    Drain one batch from the inbox.
+
+    Returns a dict with one counter per final status, plus "deferred"
+    for rows handed back because an older delivery for the same
+    request_id is still being handled elsewhere.
+    """
+
+    deliveries = claim_deliveries(
+        batch_size=batch_size,
+        stale_after=stale_after,
+    )
+
+    claimed_ids = [delivery.id for delivery in deliveries]
+
+    counts = {"claimed": len(deliveries), "deferred": 0}
+
+    # request_ids with an older delivery that has not been applied yet.
+    blocked_request_ids = set()
+
+    for delivery in deliveries:
+        if (
+            delivery.request_id in blocked_request_ids
+            or _has_earlier_unfinished(delivery, claimed_ids)
+        ):
+            if delivery.request_id:
+                blocked_request_ids.add(delivery.request_id)
+
+            WebhookDelivery.objects.filter(id=delivery.id).update(
+                status=WebhookDelivery.Status.PENDING,
+                locked_at=None,
+            )
+            counts["deferred"] += 1
+            continue
+
+        status = process_delivery(
+            delivery,
+            max_attempts=max_attempts,
+        )
+
+        if (
+            status == WebhookDelivery.Status.PENDING
+            and delivery.request_id
+        ):
+            blocked_request_ids.add(delivery.request_id)
+
+        counts[status] = counts.get(status, 0) + 1
+
+    return counts
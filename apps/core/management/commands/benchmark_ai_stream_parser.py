@@ -0,0 +1,232 @@
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.ai.stream_events import JSONEventParser
+from apps.core.models import AIResultCache
+
+_DECODER = json.JSONDecoder()
+
+
+def _legacy_extract(buffer):
+    """
+    The buffer-based extraction used before JSONEventParser: raw_decode
+    from the start of the remaining buffer after every chunk.
+    """
+
+    events = []
+    remaining = buffer
+
+    while True:
+        remaining = remaining.lstrip()
+
+        if not remaining:
+            return events, ""
+
+        if remaining.startswith("```"):
+            newline_index = remaining.find("\n")
+
+            if newline_index == -1:
+                return events, remaining
+
+            remaining = remaining[newline_index + 1:]
+            continue
+
+        object_start = remaining.find("{")
+
+        if object_start == -1:
+            return events, remaining[-200:]
+
+        remaining = remaining[object_start:]
+
+        try:
+            payload, end_index = _DECODER.raw_decode(remaining)
+        except json.JSONDecodeError:
+            return events, remaining
+
+        remaining = remaining[end_index:]
+
+        if isinstance(payload, dict) and payload.get("type"):
+            events.append(payload)
+
+
+def _run_legacy(chunks):
+    events = []
+    buffer = ""
+
+    for chunk in chunks:
+        buffer += chunk
+        parsed, buffer = _legacy_extract(buffer)
+        events.extend(parsed)
+
+    return events
+
+
+def _run_parser(chunks):
+    parser = JSONEventParser()
+    events = []
+
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+
+    return events + parser.close()
+
+
+def _synthetic_answer(rng, events, text_length):
+    """
+    A decision-support style answer: pretty-printed objects with long
+    text fields and nested lists, inside a Markdown fence.
+    """
+
+    words = (
+        "candidate evidence interview indicates structured reasoning "
+        "\"quoted\" {braces} collaboration context uncertainty"
+    ).split()
+
+    def text():
+        return " ".join(
+            rng.choice(words)
+            for _ in range(text_length // 8)
+        )
+
+    objects = [
+        {
+            "type": "supported_indications",
+            "items": [
+                {
+                    "title": text()[:60],
+                    "text": text(),
+                    "sources": ["personality", "cognitive"],
+                }
+                for _ in range(3)
+            ],
+        }
+        for _ in range(events - 1)
+    ]
+
+    objects.append({"type": "done"})
+
+    return "```json\n" + "\n".join(
+        json.dumps(obj, ensure_ascii=False, indent=2)
+        for obj in objects
+    ) + "\n```"
+
+
+def _chunk(rng, text, size):
+    chunks = []
+    pos = 0
+
+    while pos < len(text):
+        step = rng.randint(1, size * 2)
+        chunks.append(text[pos:pos + step])
+        pos += step
+
+    return chunks
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the incremental JSONEventParser with the previous "
+        "buffer-based extraction on streamed model answers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from-cache",
+            type=int,
+            default=0,
+            help=(
+                "Replay the N most recent answers stored in "
+                "AIResultCache instead of synthetic answers."
+            ),
+        )
+
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=12,
+            help="Objects per synthetic answer.",
+        )
+
+        parser.add_argument(
+            "--text-length",
+            type=int,
+            default=1500,
+            help="Characters per synthetic text field.",
+        )
+
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=4,
+            help="Average characters per stream chunk (about one token).",
+        )
+
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+        )
+
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        if options["from_cache"]:
+            answers = list(
+                AIResultCache.objects
+                .order_by("-last_used_at")
+                .values_list("content", flat=True)
+                [:options["from_cache"]]
+            )
+        else:
+            answers = [
+                _synthetic_answer(rng, options["events"], options["text_length"])
+                for _ in range(5)
+            ]
+
+        if not answers:
+            self.stdout.write("No answers to replay.")
+            return
+
+        streams = [
+            _chunk(rng, answer, options["chunk_size"])
+            for answer in answers
+        ]
+
+        self.stdout.write(
+            f"{len(streams)} stream(s), "
+            f"{sum(len(answer) for answer in answers)} characters, "
+            f"{sum(len(chunks) for chunks in streams)} chunks"
+        )
+
+        results = {}
+
+        for name, run in (("legacy", _run_legacy), ("parser", _run_parser)):
+            timings = []
+
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                events = [run(chunks) for chunks in streams]
+                timings.append(time.perf_counter() - started)
+
+            results[name] = events
+
+            self.stdout.write(
+                f"{name:>7}: best {min(timings) * 1000:.1f} ms, "
+                f"{sum(len(items) for items in events)} events"
+            )
+
+        if results["legacy"] != results["parser"]:
+            self.stdout.write(
+                self.style.WARNING("The two parsers returned different events.")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Same events from both parsers."))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.ai.mock_openai import (
+    MockOpenAIServer,
+    add_mock_arguments,
+    mock_options,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run an offline OpenAI-compatible server that answers chat "
+        "completions and embeddings with recorded or synthetic answers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--host",
+            default="127.0.0.1",
+        )
+
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=8765,
+        )
+
+        add_mock_arguments(parser)
+
+    def handle(self, *args, **options):
+        server = MockOpenAIServer(
+            host=options["host"],
+            port=options["port"],
+            **mock_options(options),
+        )
+
+        self.stdout.write(
+            "Mock OpenAI server running. Start the app with:\n"
+            f"  OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=mock"
+        )
+
+        try:
+            server.serve_forever()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            server.httpd.server_close()
@@ -0,0 +1,112 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.core.integrations.webhook_inbox import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_ATTEMPTS,
+    process_pending_deliveries,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply pending webhook deliveries from the "
+        "WebhookDelivery inbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of deliveries claimed per batch.",
+        )
+
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=DEFAULT_MAX_ATTEMPTS,
+            help=(
+                "Mark a delivery as failed after this many "
+                "unsuccessful attempts."
+            ),
+        )
+
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help=(
+                "Seconds after which a delivery left in "
+                "'processing' by a dead worker is reclaimed."
+            ),
+        )
+
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help=(
+                "Keep running and poll the inbox instead of "
+                "exiting once it is empty."
+            ),
+        )
+
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when the inbox is empty.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        max_attempts = options["max_attempts"]
+        stale_after = timedelta(seconds=options["stale_after"])
+        loop = options["loop"]
+        sleep_seconds = options["sleep"]
+
+        totals = {}
+
+        while True:
+            counts = process_pending_deliveries(
+                batch_size=batch_size,
+                max_attempts=max_attempts,
+                stale_after=stale_after,
+            )
+
+            for key, value in counts.items():
+                totals[key] = totals.get(key, 0) + value
+
+            if counts["claimed"]:
+                self.stdout.write(
+                    "Batch: "
+                    + ", ".join(
+                        f"{key}={value}"
+                        for key, value in sorted(counts.items())
+                    )
+                )
+
+            # Only deferred rows left: give the other worker time
+            # to finish before claiming them again.
+            if counts["claimed"] > counts["deferred"]:
+                continue
+
+            if not loop:
+                break
+
+            time.sleep(sleep_seconds)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done: "
+                + (
+                    ", ".join(
+                        f"{key}={value}"
+                        for key, value in sorted(totals.items())
+                    )
+                    or "inbox empty"
+                )
+            )
+        )
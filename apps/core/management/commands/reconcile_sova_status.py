@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.integrations.sova_reconcile import reconcile_sova_status
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile open test invitations with Sova's "
+        "project-candidates results, as a fallback for missed webhooks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project-id",
+            type=int,
+            action="append",
+            dest="project_ids",
+            help=(
+                "Only reconcile this Sova project id. "
+                "Can be given several times."
+            ),
+        )
+
+        parser.add_argument(
+            "--force-refresh",
+            action="store_true",
+            help=(
+                "Always fetch from Sova, even when the stored "
+                "results snapshot is still fresh."
+            ),
+        )
+
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Compute and report changes without saving them.",
+        )
+
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and reconcile every --interval seconds.",
+        )
+
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=900,
+            help="Seconds between runs with --loop.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+
+            summary = reconcile_sova_status(
+                project_ids=options["project_ids"],
+                force_refresh=options["force_refresh"],
+                dry_run=options["dry_run"],
+            )
+
+            elapsed = time.perf_counter() - started
+
+            for project_id, error in summary["project_errors"].items():
+                self.stderr.write(f"Project {project_id}: {error}")
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{'Dry run: ' if options['dry_run'] else ''}"
+                    f"projects={summary['projects']} "
+                    f"invitations={summary['invitations']} "
+                    f"updated={summary['updated']} "
+                    f"status_changes={summary['status_changes']} "
+                    f"scores={summary['scores']} "
+                    f"not_in_sova={summary['not_in_sova']} "
+                    f"({elapsed:.1f} s)"
+                )
+            )
+
+            if not options["loop"]:
+                break
+
+            time.sleep(options["interval"])
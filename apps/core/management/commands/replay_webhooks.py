@@ -0,0 +1,214 @@
+import json
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.integrations.webhook_capture import (
+    capture_dir,
+    iter_capture_paths,
+    load_capture,
+)
+from apps.core.integrations.webhook_inbox import (
+    process_delivery,
+    record_delivery,
+)
+
+
+def _parse(raw_body):
+    try:
+        return json.loads(raw_body)
+    except ValueError:
+        return None
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p * (len(values) - 1))))
+    return values[index]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay captured webhook deliveries through the ingest "
+        "pipeline and report throughput, latency and SQL queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help=(
+                "Capture files or directories. Defaults to "
+                "SOVA_WEBHOOK_CAPTURE_DIR (debug_webhooks/)."
+            ),
+        )
+
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=0,
+            help=(
+                "Deliveries per second. 0 replays as fast "
+                "as possible."
+            ),
+        )
+
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Only replay the first N captures.",
+        )
+
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Replay the captures this many times.",
+        )
+
+        parser.add_argument(
+            "--rollback",
+            action="store_true",
+            help=(
+                "Roll back every delivery after it has been applied, "
+                "so the database is left unchanged."
+            ),
+        )
+
+        parser.add_argument(
+            "--verbose-deliveries",
+            action="store_true",
+            help="Print one line per delivery.",
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or [capture_dir()]
+        captures = iter_capture_paths(paths)
+
+        if options["limit"]:
+            captures = captures[:options["limit"]]
+
+        if not captures:
+            raise CommandError(
+                "No captures found in: "
+                + ", ".join(str(path) for path in paths)
+            )
+
+        rate = options["rate"]
+        interval = 1.0 / rate if rate > 0 else 0
+        rollback = options["rollback"]
+        verbose = options["verbose_deliveries"]
+
+        latencies_ms = []
+        query_counts = []
+        statuses = Counter()
+
+        self.stdout.write(
+            f"Replaying {len(captures)} capture(s) x {options['repeat']}"
+            f"{' at ' + str(rate) + '/s' if rate > 0 else ''}"
+            f"{' with rollback' if rollback else ''}"
+        )
+
+        # Sova headers are not part of the benchmark; the body is.
+        headers = {"Content-Type": "application/json"}
+
+        started = time.perf_counter()
+        next_at = started
+
+        for _ in range(options["repeat"]):
+            for path in captures:
+                if interval:
+                    delay = next_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_at += interval
+
+                try:
+                    raw_body = load_capture(path)
+                except Exception as e:
+                    statuses["unreadable"] += 1
+                    self.stderr.write(f"Skipping {path}: {e}")
+                    continue
+
+                t0 = time.perf_counter()
+
+                with CaptureQueriesContext(connection) as queries:
+                    try:
+                        with transaction.atomic():
+                            delivery = record_delivery(
+                                raw_body=raw_body,
+                                headers=headers,
+                                payload=_parse(raw_body),
+                            )
+                            status = process_delivery(delivery)
+
+                            if rollback:
+                                raise _Rollback
+                    except _Rollback:
+                        pass
+
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+
+                latencies_ms.append(elapsed_ms)
+                query_counts.append(len(queries.captured_queries))
+                statuses[status] += 1
+
+                if verbose:
+                    self.stdout.write(
+                        f"{path.name}: {status} "
+                        f"{elapsed_ms:.1f} ms "
+                        f"{len(queries.captured_queries)} queries"
+                    )
+
+        total_seconds = time.perf_counter() - started
+        count = len(latencies_ms)
+
+        self.stdout.write("")
+        self.stdout.write(f"Deliveries:   {count}")
+        self.stdout.write(f"Elapsed:      {total_seconds:.2f} s")
+        self.stdout.write(
+            f"Throughput:   {count / total_seconds:.1f} deliveries/s"
+            if total_seconds
+            else "Throughput:   -"
+        )
+
+        if count:
+            self.stdout.write(
+                "Latency ms:   "
+                f"p50={_percentile(latencies_ms, 0.50):.1f} "
+                f"p99={_percentile(latencies_ms, 0.99):.1f} "
+                f"max={max(latencies_ms):.1f}"
+            )
+            self.stdout.write(
+                "SQL queries:  "
+                f"avg={sum(query_counts) / count:.1f} "
+                f"p50={_percentile(query_counts, 0.50)} "
+                f"p99={_percentile(query_counts, 0.99)} "
+                f"max={max(query_counts)}"
+            )
+
+        self.stdout.write(
+            "Statuses:     "
+            + ", ".join(
+                f"{key}={value}"
+                for key, value in sorted(statuses.items())
+            )
+        )
+
+        if not rollback:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Deliveries were applied to the database. "
+                    "Use --rollback to benchmark without side effects."
+                )
+            )
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-17 20:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('processes', '0050_historicalprocesscandidate_ai_content_languages_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(choices=[('sova', 'Sova')], default='sova', max_length=30)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('ignored', 'Ignored'), ('duplicate', 'Duplicate'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('raw_body', models.TextField(blank=True, default='')),
+                ('headers', models.JSONField(blank=True, default=dict)),
+                ('payload_hash', models.CharField(db_index=True, help_text='SHA-256 of the raw request body.', max_length=64)),
+                ('request_id', models.CharField(blank=True, db_index=True, default='', max_length=512)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('invitation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='webhook_deliveries', to='processes.testinvitation')),
+            ],
+            options={
+                'ordering': ['received_at', 'id'],
+                'indexes': [models.Index(fields=['status', 'received_at'], name='core_webhoo_status_129414_idx'), models.Index(fields=['request_id', 'payload_hash'], name='core_webhoo_request_6ed868_idx')],
+            },
+        ),
+    ]
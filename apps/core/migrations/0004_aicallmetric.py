@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-17 21:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_airesultcache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AICallMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feature', models.CharField(db_index=True, max_length=100)),
+                ('kind', models.CharField(choices=[('chat', 'Chat completion'), ('embedding', 'Embedding')], default='chat', max_length=20)),
+                ('model', models.CharField(blank=True, default='', max_length=100)),
+                ('stream', models.BooleanField(default=False)),
+                ('cached', models.BooleanField(default=False, help_text='Answered from AIResultCache without calling the model.')),
+                ('is_repair', models.BooleanField(default=False, help_text='Second call made to repair a malformed answer.')),
+                ('success', models.BooleanField(default=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('prompt_tokens', models.PositiveIntegerField(default=0)),
+                ('completion_tokens', models.PositiveIntegerField(default=0)),
+                ('ttft_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('retries', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['feature', 'created_at'], name='core_aicall_feature_07817e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-17 21:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_aicallmetric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIRateLimitBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('requests', models.FloatField(default=0)),
+                ('tokens', models.FloatField(default=0)),
+                ('refilled_at', models.DateTimeField()),
+                ('backoff_until', models.DateTimeField(blank=True, null=True)),
+                ('interactive_waiting_until', models.DateTimeField(blank=True, null=True)),
+                ('version', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 21:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_airatelimitbucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aicallmetric',
+            name='output_repair',
+            field=models.CharField(blank=True, choices=[('valid', 'Valid as returned'), ('local', 'Repaired locally'), ('model', 'Repaired by a second call'), ('failed', 'Could not be repaired')], default='', max_length=20),
+        ),
+    ]
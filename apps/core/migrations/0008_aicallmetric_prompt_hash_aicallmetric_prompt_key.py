@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 22:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_webhookdelivery_next_attempt_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aicallmetric',
+            name='prompt_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='aicallmetric',
+            name='prompt_key',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
@@ -1,3 +1,424 @@
 from django.db import models
 
-# Create your models here.
+
+class WebhookDelivery(models.Model):
+    """
+    Durable inbox row for one incoming webhook delivery.
+
+    The HTTP endpoint only authenticates the request and stores the
+    raw body here. The process_webhook_deliveries worker applies the
+    payload later, outside the request/response cycle.
+    """
+
+    class Provider(models.TextChoices):
+        SOVA = "sova", "Sova"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        PROCESSED = "processed", "Processed"
+        IGNORED = "ignored", "Ignored"
+        DUPLICATE = "duplicate", "Duplicate"
+        FAILED = "failed", "Failed"
+
+    provider = models.CharField(
+        max_length=30,
+        choices=Provider.choices,
+        default=Provider.SOVA,
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+
+    # ------------------------------------------------------------
+    # Delivery content
+    # ------------------------------------------------------------
+
+    raw_body = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    headers = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+
+    payload_hash = models.CharField(
+        max_length=64,
+        db_index=True,
+        help_text="SHA-256 of the raw request body.",
+    )
+
+    request_id = models.CharField(
+        max_length=512,
+        blank=True,
+        default="",
+        db_index=True,
+    )
+
+    # ------------------------------------------------------------
+    # Processing
+    # ------------------------------------------------------------
+
+    attempts = models.PositiveIntegerField(
+        default=0,
+    )
+
+    last_error = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    # A delivery that failed and will be retried is not claimed again
+    # before this time (exponential backoff).
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    result = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+
+    invitation = models.ForeignKey(
+        "processes.TestInvitation",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="webhook_deliveries",
+    )
+
+    received_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = [
+            "received_at",
+            "id",
+        ]
+
+        indexes = [
+            models.Index(
+                fields=[
+                    "status",
+                    "received_at",
+                ],
+            ),
+            models.Index(
+                fields=[
+                    "request_id",
+                    "payload_hash",
+                ],
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.get_provider_display()} · "
+            f"{self.request_id or 'no request_id'} · "
+            f"{self.get_status_display()}"
+        )
+
+
+class SovaProjectResultsSnapshot(models.Model):
+    """
+    Stored copy of Sova's project-candidates list for one project,
+    indexed by request_id.
+
+    Score backfill for a wave of completions reads from this row
+    instead of downloading the whole project once per webhook.
+    """
+
+    sova_project_id = models.IntegerField(
+        unique=True,
+    )
+
+    # {request_id: candidate dict as returned by Sova}
+    candidates = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+
+    candidate_count = models.PositiveIntegerField(
+        default=0,
+    )
+
+    fetched_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    # Set while one worker is refreshing the snapshot, so concurrent
+    # handlers wait for that fetch instead of starting their own.
+    refresh_started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    last_error = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    class Meta:
+        ordering = [
+            "sova_project_id",
+        ]
+
+    def __str__(self):
+        return (
+            f"Sova project {self.sova_project_id} · "
+            f"{self.candidate_count} candidates"
+        )
+
+
+class AIResultCache(models.Model):
+    """
+    Stored answer to one chat completion request.
+
+    The key is a SHA-256 of the final messages, model, temperature and
+    the remaining request parameters (see apps.core.ai.result_cache),
+    so an identical prompt is answered from here instead of the model.
+    """
+
+    key = models.CharField(
+        max_length=64,
+        unique=True,
+    )
+
+    model = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+    )
+
+    temperature = models.FloatField(
+        null=True,
+        blank=True,
+    )
+
+    content = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    content_length = models.PositiveIntegerField(
+        default=0,
+    )
+
+    hit_count = models.PositiveIntegerField(
+        default=0,
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    last_used_at = models.DateTimeField(
+        db_index=True,
+    )
+
+    class Meta:
+        ordering = [
+            "-last_used_at",
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.model or 'model'} · "
+            f"{self.key[:12]} · "
+            f"{self.hit_count} hits"
+        )
+
+
+class AICallMetric(models.Model):
+    """
+    One model call made through apps.core.ai.openai_client: what it
+    was for, how long it took and how many tokens it used. Written by
+    apps.core.ai.telemetry and summarised on the admin AI usage page.
+    """
+
+    class Kind(models.TextChoices):
+        CHAT = "chat", "Chat completion"
+        EMBEDDING = "embedding", "Embedding"
+
+    class OutputRepair(models.TextChoices):
+        VALID = "valid", "Valid as returned"
+        LOCAL = "local", "Repaired locally"
+        MODEL = "model", "Repaired by a second call"
+        FAILED = "failed", "Could not be repaired"
+
+    feature = models.CharField(
+        max_length=100,
+        db_index=True,
+    )
+
+    kind = models.CharField(
+        max_length=20,
+        choices=Kind.choices,
+        default=Kind.CHAT,
+    )
+
+    model = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+    )
+
+    stream = models.BooleanField(
+        default=False,
+    )
+
+    cached = models.BooleanField(
+        default=False,
+        help_text="Answered from AIResultCache without calling the model.",
+    )
+
+    is_repair = models.BooleanField(
+        default=False,
+        help_text="Second call made to repair a malformed answer.",
+    )
+
+    # The AI prompt (AIPromptTemplate or default) the call was built
+    # from, see apps.core.ai.prompt_templates; blank for calls without
+    # one.
+    prompt_key = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+    )
+
+    prompt_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        db_index=True,
+    )
+
+    # How a structured answer was parsed (apps.core.ai.structured_output);
+    # blank for calls whose answer is not checked.
+    output_repair = models.CharField(
+        max_length=20,
+        choices=OutputRepair.choices,
+        blank=True,
+        default="",
+    )
+
+    success = models.BooleanField(
+        default=True,
+    )
+
+    error = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    prompt_tokens = models.PositiveIntegerField(
+        default=0,
+    )
+
+    completion_tokens = models.PositiveIntegerField(
+        default=0,
+    )
+
+    # Milliseconds from the request to the first streamed content.
+    ttft_ms = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+    )
+
+    duration_ms = models.PositiveIntegerField(
+        default=0,
+    )
+
+    retries = models.PositiveSmallIntegerField(
+        default=0,
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+    )
+
+    class Meta:
+        ordering = [
+            "-created_at",
+        ]
+
+        indexes = [
+            models.Index(
+                fields=[
+                    "feature",
+                    "created_at",
+                ],
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.feature} · "
+            f"{self.model or 'model'} · "
+            f"{self.duration_ms} ms"
+        )
+
+
+class AIRateLimitBucket(models.Model):
+    """
+    Shared token bucket for one OpenAI model, used by every worker
+    process (apps.core.ai.rate_limits). Holds the requests and tokens
+    still available in the current minute and any backoff after a 429.
+    """
+
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+    )
+
+    requests = models.FloatField(
+        default=0,
+    )
+
+    tokens = models.FloatField(
+        default=0,
+    )
+
+    refilled_at = models.DateTimeField()
+
+    backoff_until = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    # Set while an interactive call is waiting for budget; background
+    # calls do not take budget before then.
+    interactive_waiting_until = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    # Incremented by every update, for compare-and-set.
+    version = models.PositiveIntegerField(
+        default=0,
+    )
+
+    def __str__(self):
+        return (
+            f"{self.name} · {self.requests:.0f} requests · "
+            f"{self.tokens:.0f} tokens"
+        )
@@ -32,6 +32,11 @@ urlpatterns = [
         views.customer_activity,
         name="customer_activity",
     ),
+    path(
+        "admin-sova-stats/",
+        views.admin_sova_stats,
+        name="admin_sova_stats",
+    ),
     path(
         "admin-ai-prompts/",
         views.admin_ai_prompts,
@@ -42,4 +47,9 @@ urlpatterns = [
         views.admin_ai_prompt_edit,
         name="admin_ai_prompt_edit",
     ),
+    path(
+        "admin-ai-usage/",
+        views.admin_ai_usage,
+        name="admin_ai_usage",
+    ),
 ]
\ No newline at end of file
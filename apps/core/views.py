@@ -2,7 +2,8 @@ from django.http import JsonResponse, HttpResponseForbidden, Http404
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 
-from apps.core.integrations.sova import SovaClient
+from apps.core.integrations.sova import get_sova_transport_stats
+from apps.projects.services.sova_catalogue import get_sova_accounts_with_projects
 from apps.core.utils.auth import is_admin
 
 from apps.processes.models import AIPromptTemplate
@@ -12,8 +13,13 @@ from apps.core.ai.prompt_templates import (
     get_default_ai_prompt,
     list_ai_prompt_definitions,
 )
+from apps.core.ai.telemetry import (
+    metrics_enabled,
+    summarize_ai_call_metrics,
+)
 
 import inspect
+import os
 
 from django.contrib import messages
 
@@ -88,7 +94,7 @@ def post_login_redirect(request):
 
 def _get_sova_accounts():
     try:
-        return SovaClient().get_accounts_with_projects(), None
+        return get_sova_accounts_with_projects(), None
     except Exception as e:
         return [], str(e)
 
@@ -396,6 +402,25 @@ def admin_dashboard(request):
         "latest_user_invites": latest_user_invites,
     })
 
+@login_required
+@require_GET
+def admin_sova_stats(request):
+    """
+    Latency and error counters for Sova calls made by this worker
+    process since it started.
+    """
+
+    if not is_admin(request.user):
+        return HttpResponseForbidden("No access.")
+
+    return JsonResponse(
+        {
+            "pid": os.getpid(),
+            "endpoints": get_sova_transport_stats(),
+        }
+    )
+
+
 @login_required
 def admin_ai_prompts(request):
     if not is_admin(request.user):
@@ -767,6 +792,49 @@ def admin_ai_prompt_edit(
     )
 
 
+AI_USAGE_PERIODS = (7, 14, 30, 90)
+
+
+@login_required
+@require_GET
+def admin_ai_usage(request):
+    """
+    Latency percentiles and token volume of model calls per AI feature
+    and per day, from the AICallMetric rows.
+    """
+
+    if not is_admin(request.user):
+        return HttpResponseForbidden("No access.")
+
+    try:
+        days = int(request.GET.get("days", 14))
+    except (TypeError, ValueError):
+        days = 14
+
+    if days not in AI_USAGE_PERIODS:
+        days = 14
+
+    feature = (request.GET.get("feature") or "").strip()
+
+    usage = summarize_ai_call_metrics(
+        days=days,
+        feature=feature,
+    )
+
+    return render(
+        request,
+        "admin/core/ai_prompts/ai_usage.html",
+        {
+            "days": days,
+            "periods": AI_USAGE_PERIODS,
+            "feature": feature,
+            "feature_rows": usage["features"],
+            "day_rows": usage["days"],
+            "metrics_enabled": metrics_enabled(),
+        },
+    )
+
+
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 from django.contrib.auth.decorators import login_required
@@ -902,7 +970,7 @@ def global_search(request):
     for c in cand_qs:
         full_name = f"{c.first_name} {c.last_name}".strip() or c.email
 
-        inv_qs = TestInvitation.objects.filter(candidate=c).select_related("process").order_by("-created_at")
+        inv_qs = TestInvitation.objects.filter(candidate=c).select_related("process").without_ai_content().order_by("-created_at")
         if not admin:
             inv_qs = inv_qs.filter(process__created_by=request.user)
 
@@ -1,14 +1,13 @@
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
-from django.utils import timezone
 import json
-from apps.processes.models import TestInvitation
-from apps.core.integrations.sova import SovaClient
+from apps.core.integrations.sova_ingest import (
+    backfill_overall_score,
+    find_invitation_for_payload,
+)
+from apps.core.integrations.sova_transitions import apply_sova_transition
+from apps.core.integrations.webhook_capture import capture_webhook
 import logging
-from apps.activity.models import ActivityEvent
-from apps.activity.services import log_event
-import os
-from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
@@ -62,34 +61,13 @@ def sova_webhook(request):
         print("❌ WEBHOOK invalid JSON:", str(e))
         return JsonResponse({"error": "invalid json"}, status=400)
     
-    if settings.SOVA_WEBHOOK_DEBUG_TO_FILE:
-        debug_dir = os.path.join(settings.BASE_DIR, "debug_webhooks")
-        os.makedirs(debug_dir, exist_ok=True)
-
-        timestamp = timezone.now().strftime("%Y%m%d_%H%M%S_%f")
-        request_id_for_file = (
-            payload.get("request_id")
-            or payload.get("requestId")
-            or "no_request_id"
-        )
-        safe_request_id = str(request_id_for_file).replace("/", "_").replace("\\", "_").replace(":", "_")
-
-        raw_filepath = os.path.join(debug_dir, f"sova_raw_{timestamp}_{safe_request_id}.txt")
-        json_filepath = os.path.join(debug_dir, f"sova_{timestamp}_{safe_request_id}.json")
-        headers_filepath = os.path.join(debug_dir, f"sova_headers_{timestamp}_{safe_request_id}.json")
-
-        with open(raw_filepath, "w", encoding="utf-8") as f:
-            f.write(raw)
-
-        with open(json_filepath, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-
-        with open(headers_filepath, "w", encoding="utf-8") as f:
-            json.dump(dict(request.headers), f, ensure_ascii=False, indent=2)
-
-        print(f"✅ Saved raw webhook body to: {raw_filepath}")
-        print(f"✅ Saved parsed webhook JSON to: {json_filepath}")
-        print(f"✅ Saved webhook headers to: {headers_filepath}")
+    captured_path = capture_webhook(
+        raw_body=request.body,
+        headers=request.headers,
+        payload=payload,
+    )
+    if captured_path:
+        print(f"✅ Captured webhook to: {captured_path}")
 
     print("🔔 SOVA WEBHOOK RECEIVED (parsed):", payload)
 
@@ -113,8 +91,6 @@ def sova_webhook(request):
     if current_phase_idx is None:
         current_phase_idx = payload.get("currentPhaseIdx")
 
-    has_phase_hint = bool(current_phase_code) or (current_phase_idx is not None)
-
     status_raw = payload.get("status") or payload.get("current_phase_status") or payload.get("currentPhaseStatus") or ""
     status = _norm(status_raw)
 
@@ -134,194 +110,30 @@ def sova_webhook(request):
         "talena_candidate_id": talena_candidate_id,
     })
 
-    invitation = None
-    if request_id:
-        invitation = TestInvitation.objects.filter(request_id=request_id).first()
-    if not invitation and sova_inv_id:
-        invitation = TestInvitation.objects.filter(sova_invitation_id=str(sova_inv_id)).first()
-    if not invitation and talena_process_id and talena_candidate_id:
-        invitation = TestInvitation.objects.filter(
-            process_id=talena_process_id,
-            candidate_id=talena_candidate_id
-        ).first()
+    invitation = find_invitation_for_payload(payload)
 
     if not invitation:
         print("⚠️ No matching invitation found.")
         return JsonResponse({"status": "ignored", "reason": "invitation not found"})
-    
-    old_status = invitation.status
-    old_activities = invitation.sova_activities or []
-    new_activities = payload.get("activities", []) or []
-
-    old_status_by_name = {
-        (item.get("activity") or "").strip(): _norm(item.get("status") or "")
-        for item in old_activities
-    }
-
-    new_status_by_name = {
-        (item.get("activity") or "").strip(): _norm(item.get("status") or "")
-        for item in new_activities
-    }
-
-    completed_statuses = {"completed", "complete", "finished", "done", "result available", "result_available"}
-    started_statuses = {"started", "in progress"}
-
-    for activity_name, new_activity_status in new_status_by_name.items():
-        old_activity_status = old_status_by_name.get(activity_name)
-
-        if old_activity_status == new_activity_status:
-            continue
-
-        if new_activity_status in started_statuses:
-            log_event(
-                company=invitation.process.company,
-                verb=ActivityEvent.Verb.STATUS_CHANGED,
-                actor=None,
-                actor_name="SOVA",
-                process=invitation.process,
-                candidate=invitation.candidate,
-                invitation=invitation,
-                meta={
-                    "old_status": old_activity_status,
-                    "new_status": "started",
-                    "activity_name": activity_name,
-                    "level": "activity",
-                },
-            )
-
-        elif new_activity_status in completed_statuses:
-            log_event(
-                company=invitation.process.company,
-                verb=ActivityEvent.Verb.STATUS_CHANGED,
-                actor=None,
-                actor_name="SOVA",
-                process=invitation.process,
-                candidate=invitation.candidate,
-                invitation=invitation,
-                meta={
-                    "old_status": old_activity_status,
-                    "new_status": "completed",
-                    "activity_name": activity_name,
-                    "level": "activity",
-                },
-            )
-
-    invitation.sova_payload = payload
-
-    if overall_raw:
-        invitation.sova_overall_status = overall_raw.strip()
-        print(f"✅ Saving overall_status: '{overall_raw}' to invitation {invitation.id}")
 
-    invitation.sova_current_phase_code = current_phase_code
-    invitation.sova_current_phase_idx = current_phase_idx
-    invitation.sova_activities = new_activities
-    invitation.sova_phases = payload.get("phases", []) or []
-    invitation.sova_reports = payload.get("reports", []) or []
-
-    project_results = payload.get("project_results")
-    if isinstance(project_results, dict):
-        invitation.project_results = project_results
-        invitation.overall_score = project_results.get("overall_score")
-
-    invitation.save(update_fields=[
-        "sova_payload",
-        "sova_overall_status",
-        "sova_current_phase_code",
-        "sova_current_phase_idx",
-        "sova_activities",
-        "sova_phases",
-        "sova_reports",
-        "project_results",
-        "overall_score",
-    ])
-
-    print("✅ Saved SOVA fields:", {
-        "sova_overall_status": invitation.sova_overall_status,
-        "sova_current_phase_code": invitation.sova_current_phase_code,
-        "sova_current_phase_idx": invitation.sova_current_phase_idx,
-        "activities_count": len(invitation.sova_activities or []),
-        "phases_count": len(invitation.sova_phases or []),
-        "reports_count": len(invitation.sova_reports or []),
-    })
-
-    OVERALL_COMPLETED = {"completed", "pass", "fail", "refer"}
-    OVERALL_STARTED = {"in progress"}
-
-    normalized = ""
-    reason = ""
-
-    if overall in OVERALL_COMPLETED:
-        normalized = "completed"
-        reason = f"overall={overall}"
-    elif overall in OVERALL_STARTED or has_phase_hint:
-        normalized = "started"
-        reason = f"overall={overall} phase_hint={has_phase_hint}"
-    else:
-        reason = f"no mapping hit (overall={overall}, status={status})"
-
-    print("🧠 Normalized status:", normalized, "| reason:", reason)
-
-    old_status = invitation.status
-
-    if normalized == "started":
-        if invitation.status not in {"started", "completed"}:
-            invitation.status = "started"
-            if hasattr(invitation, "started_at") and not invitation.started_at:
-                invitation.started_at = timezone.now()
-                invitation.save(update_fields=["status", "started_at"])
-            else:
-                invitation.save(update_fields=["status"])
-
-            log_event(
-                company=invitation.process.company,
-                verb=ActivityEvent.Verb.STATUS_CHANGED,
-                actor=None,
-                actor_name="SOVA",
-                process=invitation.process,
-                candidate=invitation.candidate,
-                invitation=invitation,
-                meta={"old_status": old_status, "new_status": "started", "reason": reason},
-            )
-
-            print("✅ Updated invitation to STARTED:", invitation.id)
-
-    elif normalized == "completed":
-        if invitation.status != "completed":
-            invitation.status = "completed"
-            invitation.completed_at = timezone.now()
-            invitation.save(update_fields=["status", "completed_at"])
-
-            log_event(
-                company=invitation.process.company,
-                verb=ActivityEvent.Verb.STATUS_CHANGED,
-                actor=None,
-                actor_name="SOVA",
-                process=invitation.process,
-                candidate=invitation.candidate,
-                invitation=invitation,
-                meta={"old_status": old_status, "new_status": "completed", "reason": reason},
-            )
-
-            print("✅ Updated invitation to COMPLETED:", invitation.id)
+    transition = apply_sova_transition(
+        invitation,
+        payload,
+        activity_events=True,
+    )
+    normalized = transition["normalized"]
 
+    if not transition["applied"]:
+        print("ℹ️ Payload unchanged since last webhook, nothing to update:", invitation.id)
     else:
-        print("ℹ️ Nothing to update for status.")
-
-    if normalized == "completed" and not invitation.overall_score and invitation.process.sova_project_id and invitation.request_id:
-        try:
-            client = SovaClient()
-            data = client.get_project_candidates(invitation.process.sova_project_id)
-            items = data.get("candidates") if isinstance(data, dict) else data
-            items = items or []
+        print("✅ Saved SOVA fields:", transition["changed_fields"])
+        print("🧠 Normalized status:", normalized, "| reason:", transition["reason"])
 
-            match = next((c for c in items if c.get("request_id") == invitation.request_id), None)
-            if match:
-                invitation.overall_score = match.get("overall_score")
-                invitation.save(update_fields=["overall_score"])
-                print("✅ Saved overall_score from API:", invitation.overall_score)
-            else:
-                print("⚠️ No matching request_id in project-candidates:", invitation.request_id)
-        except Exception as e:
-            print("❌ Error fetching project candidates:", str(e))
+    if normalized == "completed" and not invitation.overall_score:
+        score = backfill_overall_score(invitation)
+        if score is not None:
+            print("✅ Saved overall_score from API:", score)
+        else:
+            print("⚠️ No overall_score in project-candidates:", invitation.request_id)
 
-    return JsonResponse({"status": "ok"})
\ No newline at end of file
+    return JsonResponse({"status": "ok"})
@@ -15,6 +15,11 @@ from .models import (
     HistoricalAssessmentResult,
     HistoricalAssessmentScore,
     AIPromptTemplate,
+    BulkSendJob,
+    AIGenerationJob,
+    AIUpdateRun,
+    AIContentVariant,
+    AIRegenerationRun,
 )
 
 @admin.register(TestProcess)
@@ -510,4 +515,186 @@ class AIPromptTemplateAdmin(admin.ModelAdmin):
             obj,
             form,
             change,
-        )
\ No newline at end of file
+        )
+
+
+@admin.register(BulkSendJob)
+class BulkSendJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "process",
+        "context",
+        "status",
+        "total",
+        "sent_count",
+        "skipped_count",
+        "failed_count",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+
+    list_filter = (
+        "status",
+        "context",
+    )
+
+    search_fields = (
+        "process__name",
+        "created_by__email",
+    )
+
+    readonly_fields = (
+        "invitation_ids",
+        "results",
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+    )
+
+
+@admin.register(AIGenerationJob)
+class AIGenerationJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "section",
+        "process",
+        "invitation",
+        "historical_candidate",
+        "language_code",
+        "status",
+        "output_length",
+        "created_at",
+        "finished_at",
+    )
+
+    list_filter = (
+        "status",
+        "section",
+    )
+
+    search_fields = (
+        "process__name",
+        "invitation__candidate__email",
+        "historical_candidate__candidate__email",
+    )
+
+    raw_id_fields = (
+        "invitation",
+        "historical_candidate",
+    )
+
+    readonly_fields = (
+        "output",
+        "output_length",
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+    )
+
+
+@admin.register(AIUpdateRun)
+class AIUpdateRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "process",
+        "invitation",
+        "status",
+        "language_code",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+
+    list_filter = (
+        "status",
+    )
+
+    search_fields = (
+        "process__name",
+        "invitation__candidate__email",
+        "created_by__email",
+    )
+
+    raw_id_fields = (
+        "invitation",
+    )
+
+    readonly_fields = (
+        "sections",
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+    )
+
+
+@admin.register(AIContentVariant)
+class AIContentVariantAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "content_key",
+        "language",
+        "invitation",
+        "historical_candidate",
+        "purpose",
+        "translated",
+        "updated_at",
+    )
+
+    list_filter = (
+        "content_key",
+        "language",
+        "translated",
+    )
+
+    search_fields = (
+        "invitation__candidate__email",
+        "historical_candidate__candidate__email",
+    )
+
+    raw_id_fields = (
+        "invitation",
+        "historical_candidate",
+    )
+
+    readonly_fields = (
+        "generated_at",
+        "updated_at",
+    )
+
+
+@admin.register(AIRegenerationRun)
+class AIRegenerationRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "process",
+        "status",
+        "total",
+        "completed_count",
+        "skipped_count",
+        "failed_count",
+        "rate_limited_count",
+        "created_at",
+        "finished_at",
+    )
+
+    list_filter = (
+        "status",
+    )
+
+    search_fields = (
+        "process__name",
+        "created_by__email",
+    )
+
+    readonly_fields = (
+        "invitation_ids",
+        "results",
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+    )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProcessesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.processes'
+
+    def ready(self):
+        import apps.processes.signals  # noqa
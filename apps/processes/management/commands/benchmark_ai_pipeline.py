@@ -0,0 +1,359 @@
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+
+from apps.core.ai import chat_stream
+from apps.core.ai.mock_openai import MockOpenAIServer, add_mock_arguments, mock_options
+from apps.core.ai.openai_client import reset_openai_clients
+from apps.processes.models import TestInvitation
+from apps.processes.services.ai_generation_jobs import (
+    reset_section_for_regeneration,
+    section_url,
+    status_field_for,
+)
+from apps.processes.services.ai_regeneration_runs import PLAN_SECTIONS
+
+SECTIONS = (
+    "summary",
+    *PLAN_SECTIONS,
+)
+
+CHAT_MESSAGE = "What may motivate this candidate at work?"
+
+# Pinecone is not part of the benchmark: stream_ai gets a fixed
+# retrieval context of this size.
+CHAT_CONTEXT_CHARS = 4000
+
+
+@contextmanager
+def use_mock_server(server):
+    """
+    Point get_openai_client() at the mock server for the block.
+    """
+
+    saved = {
+        name: os.environ.get(name)
+        for name in ("OPENAI_BASE_URL", "OPENAI_API_KEY")
+    }
+
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ["OPENAI_API_KEY"] = "mock"
+    reset_openai_clients()
+
+    try:
+        yield
+
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+        reset_openai_clients()
+
+
+def _median_ms(values):
+    values = [value for value in values if value is not None]
+
+    if not values:
+        return "–"
+
+    return f"{statistics.median(values) * 1000:.0f}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the candidate AI stream views and stream_ai against "
+        "an offline mock OpenAI server: time to first byte, total time, "
+        "server-side overhead, queries and peak memory per generation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--invitation-id",
+            type=int,
+            help="Candidate to generate for. Defaults to the latest completed invitation.",
+        )
+
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            help="User making the requests. Defaults to the process creator.",
+        )
+
+        parser.add_argument(
+            "--section",
+            action="append",
+            dest="sections",
+            choices=SECTIONS,
+            help="Only this section. Can be given more than once.",
+        )
+
+        parser.add_argument(
+            "--skip-chat",
+            action="store_true",
+            help="Do not benchmark stream_ai.",
+        )
+
+        parser.add_argument(
+            "--language",
+            default="en",
+        )
+
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Timed generations per section; one more runs under tracemalloc.",
+        )
+
+        add_mock_arguments(parser)
+
+    def handle(self, *args, **options):
+        invitations = TestInvitation.objects.filter(
+            is_historical=False,
+        )
+
+        if options["invitation_id"]:
+            invitation = invitations.filter(pk=options["invitation_id"]).first()
+        else:
+            invitation = invitations.filter(status="completed").order_by("-pk").first()
+
+        if invitation is None:
+            raise CommandError("No invitation to benchmark; give --invitation-id.")
+
+        if options["user_id"]:
+            user = get_user_model().objects.filter(pk=options["user_id"]).first()
+        else:
+            user = invitation.process.created_by
+
+        if user is None:
+            raise CommandError("No user to make the requests as; give --user-id.")
+
+        self.verbosity = options["verbosity"]
+        self.factory = RequestFactory()
+        self.invitation_id = invitation.pk
+        self.user = user
+        self.language = options["language"]
+
+        sections = options["sections"] or SECTIONS
+
+        self.stdout.write(
+            f"Invitation {invitation.pk}, {len(sections)} section(s), "
+            f"{options['repeat']} run(s) each. Results are rolled back."
+        )
+
+        rows = []
+
+        with (
+            MockOpenAIServer(**mock_options(options)) as server,
+            use_mock_server(server),
+            override_settings(AI_GENERATION_JOBS=False, AI_RESULT_CACHE=False),
+        ):
+            self.server = server
+
+            for section in sections:
+                rows.append(
+                    self._benchmark(section, lambda: self._generate_section(section), options["repeat"])
+                )
+
+            if not options["skip_chat"]:
+                rows.append(
+                    self._benchmark("stream_ai", self._generate_chat, options["repeat"])
+                )
+
+        self._report(rows)
+
+    # -----------------------------------------------------------------
+    # Generations
+    # -----------------------------------------------------------------
+
+    def _generate_section(self, section):
+        """
+        Reset the section, then stream its view. Returns the chunk
+        iterator and a function giving the outcome once it is read.
+        """
+
+        invitation = TestInvitation.objects.get(pk=self.invitation_id)
+
+        error = reset_section_for_regeneration(
+            invitation,
+            section,
+            user=self.user,
+            language_code=self.language,
+        )
+
+        if error:
+            return None, lambda chunks: f"reset failed: {error}"
+
+        request = self.factory.get(section_url(invitation, section))
+        request.user = self.user
+        request.LANGUAGE_CODE = self.language
+
+        def chunks():
+            match = resolve(request.path)
+            response = match.func(request, *match.args, **match.kwargs)
+
+            if response.streaming:
+                yield from response.streaming_content
+            else:
+                yield response.content
+
+        def outcome(output):
+            invitation.refresh_from_db(fields=[status_field_for(section)])
+            status = getattr(invitation, status_field_for(section))
+
+            if status == "completed":
+                return "ok"
+
+            for line in reversed(b"".join(output).decode("utf-8", errors="replace").splitlines()):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+
+                if isinstance(event, dict) and event.get("type") == "error":
+                    return f"{status}: {event.get('message')}"
+
+            return status or "no status"
+
+        return chunks(), outcome
+
+    def _generate_chat(self):
+        context = ("Retrieved knowledge base text. " * CHAT_CONTEXT_CHARS)[:CHAT_CONTEXT_CHARS]
+
+        def chunks():
+            with mock.patch.object(chat_stream, "retrieve_context", lambda *args, **kwargs: context):
+                for text in chat_stream.stream_ai(CHAT_MESSAGE):
+                    yield text.encode("utf-8")
+
+        return chunks(), lambda output: "ok" if output else "empty"
+
+    # -----------------------------------------------------------------
+    # Measurement
+    # -----------------------------------------------------------------
+
+    def _measure(self, generate, trace_memory=False):
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        log_start = len(self.server.request_log)
+
+        with transaction.atomic():
+            with connection.execute_wrapper(count_query):
+                chunks, outcome = generate()
+
+                if trace_memory:
+                    tracemalloc.start()
+
+                started = time.perf_counter()
+                first_byte = None
+                output = []
+
+                for chunk in chunks or ():
+                    if first_byte is None and chunk:
+                        first_byte = time.perf_counter() - started
+
+                    output.append(chunk)
+
+                total = time.perf_counter() - started
+
+                peak = None
+
+                if trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+
+                result = outcome(output)
+
+            transaction.set_rollback(True)
+
+        model = sum(
+            entry["duration"]
+            for entry in self.server.request_log[log_start:]
+        )
+
+        return {
+            "outcome": result,
+            "ttfb": first_byte,
+            "total": total,
+            "model": model,
+            "overhead": max(total - model, 0),
+            "queries": queries,
+            "peak": peak,
+        }
+
+    def _benchmark(self, name, generate, repeat):
+        runs = [
+            self._measure(generate)
+            for _ in range(max(repeat, 1))
+        ]
+        traced = self._measure(generate, trace_memory=True)
+
+        failures = [
+            run["outcome"]
+            for run in runs + [traced]
+            if run["outcome"] != "ok"
+        ]
+
+        if failures and self.verbosity > 0:
+            self.stderr.write(f"{name}: {failures[0]}")
+
+        return {
+            "name": name,
+            "ok": f"{len(runs) + 1 - len(failures)}/{len(runs) + 1}",
+            "ttfb": _median_ms([run["ttfb"] for run in runs]),
+            "total": _median_ms([run["total"] for run in runs]),
+            "model": _median_ms([run["model"] for run in runs]),
+            "overhead": _median_ms([run["overhead"] for run in runs]),
+            "queries": statistics.median(run["queries"] for run in runs),
+            "peak_kb": f"{traced['peak'] / 1024:.0f}",
+        }
+
+    def _report(self, rows):
+        columns = (
+            ("name", "generation", 32),
+            ("ok", "ok", 6),
+            ("ttfb", "ttfb ms", 9),
+            ("total", "total ms", 9),
+            ("model", "model ms", 9),
+            ("overhead", "overhead ms", 12),
+            ("queries", "queries", 8),
+            ("peak_kb", "peak KB", 8),
+        )
+
+        self.stdout.write(
+            "".join(
+                label.ljust(width) if index == 0 else label.rjust(width)
+                for index, (_key, label, width) in enumerate(columns)
+            )
+        )
+
+        for row in rows:
+            self.stdout.write(
+                "".join(
+                    str(row[key]).ljust(width) if index == 0 else str(row[key]).rjust(width)
+                    for index, (key, _label, width) in enumerate(columns)
+                )
+            )
+
+        self.stdout.write(
+            "model ms is the time the mock server spent answering (its "
+            "--ttft and --chunk-delay included); overhead ms is the rest: "
+            "prompt building, parsing, database writes and HTTP."
+        )
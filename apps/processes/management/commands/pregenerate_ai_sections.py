@@ -0,0 +1,130 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.processes.models import TestInvitation
+from apps.processes.services.ai_pregeneration import (
+    PREGENERATED_SECTIONS,
+    pregenerate_section,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the AI sections of completed candidates ahead of "
+        "time, e.g. for candidates completed before pre-generation "
+        "was enabled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--invitation-id",
+            type=int,
+            action="append",
+            dest="invitation_ids",
+            help="Only this invitation. Can be given more than once.",
+        )
+
+        parser.add_argument(
+            "--process-id",
+            type=int,
+            help="All completed invitations in this process.",
+        )
+
+        parser.add_argument(
+            "--section",
+            action="append",
+            dest="sections",
+            choices=PREGENERATED_SECTIONS,
+            help=(
+                "Only this section. Can be given more than once. "
+                "Defaults to every pre-generated section."
+            ),
+        )
+
+        parser.add_argument(
+            "--language",
+            help=(
+                "AI language code. Defaults to "
+                "AI_PREGENERATION_LANGUAGE / LANGUAGE_CODE."
+            ),
+        )
+
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=getattr(settings, "AI_PREGENERATION_CONCURRENCY", 3),
+            help="Sections generated at once.",
+        )
+
+    def handle(self, *args, **options):
+        invitation_ids = options["invitation_ids"]
+        process_id = options["process_id"]
+
+        if not invitation_ids and not process_id:
+            raise CommandError("Give --invitation-id or --process-id.")
+
+        invitations = TestInvitation.objects.filter(
+            status="completed",
+            is_historical=False,
+        )
+
+        if invitation_ids:
+            invitations = invitations.filter(pk__in=invitation_ids)
+
+        if process_id:
+            invitations = invitations.filter(process_id=process_id)
+
+        ids = list(invitations.values_list("pk", flat=True))
+        sections = options["sections"] or PREGENERATED_SECTIONS
+
+        self.stdout.write(
+            f"Pre-generating {len(sections)} section(s) for "
+            f"{len(ids)} invitation(s)"
+        )
+
+        outcomes = Counter()
+
+        def run(invitation_id, section):
+            try:
+                return pregenerate_section(
+                    invitation_id,
+                    section,
+                    language_code=options["language"],
+                )
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=max(options["concurrency"], 1)) as pool:
+            futures = {
+                pool.submit(run, invitation_id, section): (invitation_id, section)
+                for invitation_id in ids
+                for section in sections
+            }
+
+            for future in as_completed(futures):
+                invitation_id, section = futures[future]
+
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = "error"
+                    self.stderr.write(f"{invitation_id} {section}: {e}")
+
+                outcomes[outcome] += 1
+
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{invitation_id} {section}: {outcome}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done: "
+                + ", ".join(
+                    f"{key}={value}"
+                    for key, value in sorted(outcomes.items())
+                )
+            )
+        )
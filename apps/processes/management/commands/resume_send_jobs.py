@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand
+
+from apps.processes.models import BulkSendJob
+from apps.processes.services.send_tests import (
+    claim_send_job,
+    is_job_stale,
+    run_send_job,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Resume bulk sends of assessments that were queued or "
+        "interrupted, e.g. by a worker restart."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--job-id",
+            type=int,
+            help=(
+                "Only resume one BulkSendJob, also when it "
+                "finished with errors. A job that is still "
+                "running is left alone."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        job_id = options.get("job_id")
+
+        jobs = (
+            BulkSendJob.objects
+            .select_related("process", "created_by")
+            .order_by("created_at")
+        )
+
+        if job_id:
+            jobs = jobs.filter(pk=job_id)
+        else:
+            jobs = jobs.filter(
+                status__in=[
+                    BulkSendJob.Status.QUEUED,
+                    BulkSendJob.Status.RUNNING,
+                ]
+            )
+            jobs = [job for job in jobs if is_job_stale(job)]
+
+        resumed = 0
+
+        for job in jobs:
+            if not claim_send_job(job):
+                self.stdout.write(
+                    f"Job {job.id} ({job.process}): already running or finished, skipped"
+                )
+                continue
+
+            pending = len(job.pending_invitation_ids())
+
+            self.stdout.write(
+                f"Job {job.id} ({job.process}): {pending} pending invitation(s)"
+            )
+
+            job = run_send_job(job)
+            resumed += 1
+
+            self.stdout.write(
+                f"  -> {job.get_status_display()}: "
+                f"sent={job.sent_count} skipped={job.skipped_count} "
+                f"failed={job.failed_count}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Resumed {resumed} job(s).")
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 20:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0051_bulksendjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testinvitation',
+            name='sova_payload_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-17 21:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0052_testinvitation_sova_payload_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testinvitation',
+            index=models.Index(fields=['request_id'], name='invitation_request_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testinvitation',
+            index=models.Index(fields=['sova_invitation_id'], name='invitation_sova_inv_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testinvitation',
+            index=models.Index(fields=['sova_candidate_id'], name='invitation_sova_cand_id_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-17 21:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0055_aiupdaterun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIContentVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_key', models.CharField(max_length=60)),
+                ('language', models.CharField(max_length=10)),
+                ('content', models.JSONField(blank=True, default=dict)),
+                ('purpose', models.CharField(blank=True, default='', max_length=100)),
+                ('generated_at', models.DateTimeField(blank=True, null=True)),
+                ('translated', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('historical_candidate', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ai_content_variants', to='processes.historicalprocesscandidate')),
+                ('invitation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ai_content_variants', to='processes.testinvitation')),
+            ],
+            options={
+                'ordering': ['content_key', 'language'],
+                'constraints': [models.UniqueConstraint(fields=('invitation', 'content_key', 'language'), name='ai_variant_invitation_unique'), models.UniqueConstraint(fields=('historical_candidate', 'content_key', 'language'), name='ai_variant_historical_unique')],
+            },
+        ),
+    ]
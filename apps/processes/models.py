@@ -149,6 +149,44 @@ class Candidate(models.Model):
         return f"{self.first_name} {self.last_name}".strip() or self.email
 
 
+class CandidateAIContentQuerySet(models.QuerySet):
+    """
+    Queryset for TestInvitation and HistoricalProcessCandidate.
+
+    Their rows carry one large JSON/text column per AI section, plus the
+    raw assessment data. Lists and status endpoints leave these out of
+    the SELECT, and a section view loads only its own section. A
+    deferred field is still loaded on first access, one query per field.
+    """
+
+    def without_ai_content(self, *, keep=()):
+        """
+        Defer the AI content and assessment data fields, except keep.
+        """
+
+        model = self.model
+
+        return self.defer(*(
+            name
+            for name in (*model.AI_CONTENT_FIELDS, *model.ASSESSMENT_DATA_FIELDS)
+            if name not in keep
+        ))
+
+    def for_ai_section(self, section):
+        """
+        Defer the AI content of every section except section. The
+        assessment data the generation is built on stays loaded.
+        """
+
+        field = f"ai_{section}"
+
+        return self.defer(*(
+            name
+            for name in self.model.AI_CONTENT_FIELDS
+            if name != field
+        ))
+
+
 class TestInvitation(models.Model):
     STATUS_CHOICES = [
         ("created", "Created"),
@@ -174,7 +212,34 @@ class TestInvitation(models.Model):
             "expired": "Utgånget",
             "failed": "Fel",
         }.get(self.status, self.status)
-    
+
+    # Large columns deferred by CandidateAIContentQuerySet.
+    AI_CONTENT_FIELDS = (
+        "ai_summary",
+        "ai_purpose_fit",
+        "ai_cognitive_interpretation",
+        "ai_cognitive_questions",
+        "ai_motivation_interpretation",
+        "ai_motivation_questions",
+        "ai_personality_interpretation",
+        "ai_response_style_guidance",
+        "ai_personality_questions",
+        "ai_pre_interview_decision_support",
+        "ai_post_interview_decision_support",
+    )
+
+    ASSESSMENT_DATA_FIELDS = (
+        "project_results",
+        "result_payload",
+        "sova_payload",
+        "sova_activities",
+        "sova_phases",
+        "sova_reports",
+        "interview_notes",
+    )
+
+    objects = CandidateAIContentQuerySet.as_manager()
+
     assessment_url = models.URLField(blank=True, null=True)
     sova_request_id = models.CharField(max_length=512, blank=True, null=True)
 
@@ -201,10 +266,18 @@ class TestInvitation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Last time someone opened the candidate sheet. Candidates viewed
+    # recently are regenerated first by AIRegenerationRun.
+    last_viewed_at = models.DateTimeField(null=True, blank=True)
+
     sova_activities = models.JSONField(null=True, blank=True)
     sova_phases = models.JSONField(null=True, blank=True)
     sova_reports = models.JSONField(null=True, blank=True)
 
+    # SHA-256 of the last Sova payload applied to this invitation.
+    # Identical re-sends are skipped without touching the row.
+    sova_payload_hash = models.CharField(max_length=64, blank=True, default="")
+
     ai_summary = models.TextField(blank=True, default="")
     ai_summary_generated_at = models.DateTimeField(null=True, blank=True)
     ai_summary_status = models.CharField(max_length=30, blank=True, default="not_started")
@@ -560,6 +633,14 @@ class TestInvitation(models.Model):
             models.UniqueConstraint(fields=["process", "candidate"], name="uniq_invitation_per_process")
         ]
 
+        # External ids used to correlate Sova webhooks with invitations
+        # (apps.core.integrations.sova_ingest.find_invitation_for_payload).
+        indexes = [
+            models.Index(fields=["request_id"], name="invitation_request_id_idx"),
+            models.Index(fields=["sova_invitation_id"], name="invitation_sova_inv_id_idx"),
+            models.Index(fields=["sova_candidate_id"], name="invitation_sova_cand_id_idx"),
+        ]
+
     def mark_sent(self, sova_id: str | None = None, payload: dict | None = None):
         self.status = "sent"
         self.invited_at = timezone.now()
@@ -1084,6 +1165,24 @@ class HistoricalProcessCandidate(models.Model):
         ("created", "Created / unknown"),
     )
 
+    # Large columns deferred by CandidateAIContentQuerySet.
+    AI_CONTENT_FIELDS = (
+        "ai_summary",
+        "ai_purpose_fit",
+        "ai_cognitive_interpretation",
+        "ai_motivation_interpretation",
+        "ai_motivation_questions",
+        "ai_personality_interpretation",
+        "ai_response_style_guidance",
+        "ai_personality_questions",
+    )
+
+    ASSESSMENT_DATA_FIELDS = (
+        "notes",
+    )
+
+    objects = CandidateAIContentQuerySet.as_manager()
+
     process = models.ForeignKey(
         "processes.TestProcess",
         on_delete=models.CASCADE,
@@ -1657,4 +1756,625 @@ class AIPromptTemplate(models.Model):
         verbose_name_plural = "AI prompts"
 
     def __str__(self):
-        return f"{self.name} ({self.language.upper()})"
\ No newline at end of file
+        return f"{self.name} ({self.language.upper()})"
+
+class BulkSendJob(models.Model):
+    """
+    One "send assessments" action for a set of invitations.
+
+    The job records a result per invitation, so the UI can show
+    progress while it runs and a partially failed job can be resumed
+    for only the invitations that did not go out.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        COMPLETED_WITH_ERRORS = "completed_with_errors", "Completed with errors"
+        FAILED = "failed", "Failed"
+
+    process = models.ForeignKey(
+        TestProcess,
+        on_delete=models.CASCADE,
+        related_name="bulk_send_jobs",
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="bulk_send_jobs",
+    )
+
+    context = models.CharField(
+        max_length=20,
+        default="customer",
+        help_text='"customer" or "admin"; stored in the Sova meta_data.',
+    )
+
+    status = models.CharField(
+        max_length=30,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        db_index=True,
+    )
+
+    invitation_ids = models.JSONField(
+        default=list,
+        blank=True,
+    )
+
+    # {"<invitation_id>": {"status": "sent|skipped|failed", "error": "..."}}
+    results = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+
+    total = models.PositiveIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+
+    error = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = [
+            "-created_at",
+        ]
+
+        indexes = [
+            models.Index(
+                fields=[
+                    "process",
+                    "created_at",
+                ],
+            ),
+        ]
+
+    @property
+    def processed_count(self):
+        return (
+            self.sent_count
+            + self.skipped_count
+            + self.failed_count
+        )
+
+    @property
+    def is_finished(self):
+        return self.status in {
+            self.Status.COMPLETED,
+            self.Status.COMPLETED_WITH_ERRORS,
+            self.Status.FAILED,
+        }
+
+    def pending_invitation_ids(self):
+        """
+        Invitations that have not been sent or skipped yet,
+        including those that failed in an earlier run.
+        """
+
+        return [
+            invitation_id
+            for invitation_id in self.invitation_ids
+            if (self.results.get(str(invitation_id)) or {}).get("status")
+            not in {"sent", "skipped"}
+        ]
+
+    def errors(self):
+        return [
+            {
+                "invitation_id": int(invitation_id),
+                "email": result.get("email", ""),
+                "error": result.get("error", ""),
+            }
+            for invitation_id, result in self.results.items()
+            if result.get("status") == "failed"
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.process} · {self.processed_count}/{self.total} · "
+            f"{self.get_status_display()}"
+        )
+
+
+class AIGenerationJob(models.Model):
+    """
+    One AI section generation (summary, interpretation, questions,
+    decision support, ...) running outside the HTTP request.
+
+    The worker appends every streamed chunk to output, so the browser
+    can follow the generation by polling from an offset instead of
+    holding a web worker for the whole OpenAI stream.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    process = models.ForeignKey(
+        TestProcess,
+        on_delete=models.CASCADE,
+        related_name="ai_generation_jobs",
+    )
+
+    invitation = models.ForeignKey(
+        TestInvitation,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="ai_generation_jobs",
+    )
+
+    historical_candidate = models.ForeignKey(
+        HistoricalProcessCandidate,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="ai_generation_jobs",
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ai_generation_jobs",
+    )
+
+    # The AI content key, e.g. "summary" or "cognitive_interpretation".
+    section = models.CharField(
+        max_length=60,
+    )
+
+    language_code = models.CharField(
+        max_length=10,
+        blank=True,
+        default="",
+    )
+
+    content_type = models.CharField(
+        max_length=100,
+        default="application/x-ndjson; charset=utf-8",
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        db_index=True,
+    )
+
+    # Everything the generation has streamed so far, exactly as the
+    # stream view would have written it to the response.
+    output = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    output_length = models.PositiveIntegerField(
+        default=0,
+    )
+
+    error = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = [
+            "-created_at",
+        ]
+
+        indexes = [
+            models.Index(
+                fields=[
+                    "invitation",
+                    "section",
+                    "created_at",
+                ],
+                name="ai_job_invitation_idx",
+            ),
+            models.Index(
+                fields=[
+                    "historical_candidate",
+                    "section",
+                    "created_at",
+                ],
+                name="ai_job_historical_idx",
+            ),
+        ]
+
+    @property
+    def owner(self):
+        return self.invitation or self.historical_candidate
+
+    @property
+    def is_finished(self):
+        return self.status in {
+            self.Status.COMPLETED,
+            self.Status.FAILED,
+        }
+
+    def __str__(self):
+        return (
+            f"{self.section} · {self.owner} · "
+            f"{self.get_status_display()}"
+        )
+
+
+class AIUpdateRun(models.Model):
+    """
+    One "update all outdated AI insights" action for a candidate.
+
+    The sections are regenerated on the server in dependency order:
+    independent sections in parallel, decision support once the
+    interpretations it reads are fresh. The candidate sheet polls the
+    run for per-section progress.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        COMPLETED_WITH_ERRORS = "completed_with_errors", "Completed with errors"
+        FAILED = "failed", "Failed"
+
+    process = models.ForeignKey(
+        TestProcess,
+        on_delete=models.CASCADE,
+        related_name="ai_update_runs",
+    )
+
+    invitation = models.ForeignKey(
+        TestInvitation,
+        on_delete=models.CASCADE,
+        related_name="ai_update_runs",
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ai_update_runs",
+    )
+
+    language_code = models.CharField(
+        max_length=10,
+        blank=True,
+        default="",
+    )
+
+    status = models.CharField(
+        max_length=30,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        db_index=True,
+    )
+
+    # [{"key", "label", "section", "depends_on", "status", "job_id",
+    #   "error", "started_at", "finished_at"}, ...] in plan order.
+    sections = models.JSONField(
+        default=list,
+        blank=True,
+    )
+
+    error = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = [
+            "-created_at",
+        ]
+
+        indexes = [
+            models.Index(
+                fields=[
+                    "invitation",
+                    "created_at",
+                ],
+            ),
+        ]
+
+    @property
+    def is_finished(self):
+        return self.status in {
+            self.Status.COMPLETED,
+            self.Status.COMPLETED_WITH_ERRORS,
+            self.Status.FAILED,
+        }
+
+    def __str__(self):
+        return (
+            f"{self.invitation} · {len(self.sections)} section(s) · "
+            f"{self.get_status_display()}"
+        )
+
+
+class AIContentVariant(models.Model):
+    """
+    A candidate's AI section in one more language.
+
+    The ai_* fields on the owner hold the section in the language
+    recorded in ai_content_languages. When the user switches language,
+    that content is kept here and a variant in the new language, if
+    one exists, is moved back into the ai_* fields instead of
+    generating the section again (see services.ai_content_variants).
+    """
+
+    invitation = models.ForeignKey(
+        TestInvitation,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="ai_content_variants",
+    )
+
+    historical_candidate = models.ForeignKey(
+        HistoricalProcessCandidate,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="ai_content_variants",
+    )
+
+    # The AI content key, e.g. "cognitive_interpretation".
+    content_key = models.CharField(
+        max_length=60,
+    )
+
+    language = models.CharField(
+        max_length=10,
+    )
+
+    content = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+
+    # ai_<section>_purpose of the content, so a variant from before a
+    # purpose change is never restored.
+    purpose = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+    )
+
+    generated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    # True when the content was translated from another language
+    # rather than generated from the assessment evidence.
+    translated = models.BooleanField(
+        default=False,
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        ordering = [
+            "content_key",
+            "language",
+        ]
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "invitation",
+                    "content_key",
+                    "language",
+                ],
+                name="ai_variant_invitation_unique",
+            ),
+            models.UniqueConstraint(
+                fields=[
+                    "historical_candidate",
+                    "content_key",
+                    "language",
+                ],
+                name="ai_variant_historical_unique",
+            ),
+        ]
+
+    @property
+    def owner(self):
+        return self.invitation or self.historical_candidate
+
+    def __str__(self):
+        return (
+            f"{self.content_key} · {self.language} · {self.owner}"
+        )
+
+
+class AIRegenerationRun(models.Model):
+    """
+    Regeneration of the outdated AI sections of every candidate in a
+    process, after its purpose or context changed.
+
+    Candidates are updated one AIUpdateRun at a time each, a few
+    candidates at once, recently viewed candidates first. The process
+    page polls the run for progress.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        COMPLETED_WITH_ERRORS = "completed_with_errors", "Completed with errors"
+        FAILED = "failed", "Failed"
+        CANCELLED = "cancelled", "Cancelled"
+
+    process = models.ForeignKey(
+        TestProcess,
+        on_delete=models.CASCADE,
+        related_name="ai_regeneration_runs",
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="ai_regeneration_runs",
+    )
+
+    language_code = models.CharField(
+        max_length=10,
+        blank=True,
+        default="",
+    )
+
+    status = models.CharField(
+        max_length=30,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        db_index=True,
+    )
+
+    invitation_ids = models.JSONField(
+        default=list,
+        blank=True,
+    )
+
+    # {"<invitation_id>": {"status": "running|completed|skipped|failed",
+    #   "error": "...", "attempts": 1, "update_run_id": 12}}
+    results = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+
+    total = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+
+    # 429 responses seen while the run was active.
+    rate_limited_count = models.PositiveIntegerField(default=0)
+
+    error = models.TextField(
+        blank=True,
+        default="",
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = [
+            "-created_at",
+        ]
+
+        indexes = [
+            models.Index(
+                fields=[
+                    "process",
+                    "created_at",
+                ],
+            ),
+        ]
+
+    @property
+    def processed_count(self):
+        return self.completed_count + self.skipped_count + self.failed_count
+
+    @property
+    def is_finished(self):
+        return self.status in {
+            self.Status.COMPLETED,
+            self.Status.COMPLETED_WITH_ERRORS,
+            self.Status.FAILED,
+            self.Status.CANCELLED,
+        }
+
+    def __str__(self):
+        return (
+            f"{self.process} · {self.processed_count}/{self.total} · "
+            f"{self.get_status_display()}"
+        )
@@ -0,0 +1,329 @@
+"""
+Stored language variants of a candidate's AI sections.
+
+The ai_* fields on TestInvitation and HistoricalProcessCandidate hold
+each section in one language. When a user opens a section in another
+language, mark_ai_content_outdated_if_language_changed used to mark it
+outdated, and switching back and forth meant generating it again every
+time.
+
+switch_ai_content_language now keeps the current content as an
+AIContentVariant before it is replaced. If the section is already
+stored in the requested language, that variant goes back into the ai_*
+fields and the section stays completed.
+
+With AI_TRANSLATE_LANGUAGE_VARIANTS, a missing language is translated
+from the current content instead of generated again. A translation is
+a model call, so it only runs for the section the user opened (its
+stream view passes allow_translation). The candidate sheet restores
+stored variants only; a section it cannot restore is marked outdated,
+and its stream view then translates it (translate_switched_ai_content).
+
+A variant is only restored when its purpose is the section's current
+purpose. Changes to what a section is based on (process context,
+interview notes) delete the variants, so only content from the current
+input can come back.
+"""
+
+import logging
+
+from django.conf import settings
+
+from apps.core.ai.language import (
+    get_ai_language_update_fields,
+    get_saved_ai_content_language,
+    normalize_ai_language,
+    set_ai_content_language,
+)
+from apps.processes.models import (
+    AIContentVariant,
+    HistoricalProcessCandidate,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def translation_enabled():
+    return getattr(settings, "AI_TRANSLATE_LANGUAGE_VARIANTS", False)
+
+
+def _owner_filter(owner):
+    if isinstance(owner, HistoricalProcessCandidate):
+        return {"historical_candidate": owner}
+
+    return {"invitation": owner}
+
+
+def stash_ai_content_variant(owner, *, content_key, result_field):
+    """
+    Keep the owner's current content for a section as the variant in
+    its saved language. Returns the variant, or None without content.
+    """
+
+    content = getattr(owner, result_field, None)
+
+    if not content:
+        return None
+
+    variant, _ = AIContentVariant.objects.update_or_create(
+        **_owner_filter(owner),
+        content_key=content_key,
+        language=get_saved_ai_content_language(owner, content_key),
+        defaults={
+            "content": content,
+            "purpose": getattr(owner, f"{result_field}_purpose", "") or "",
+            "generated_at": getattr(owner, f"{result_field}_generated_at", None),
+            "translated": False,
+        },
+    )
+
+    return variant
+
+
+def _restore(owner, variant, *, content_key, result_field, status_field):
+    setattr(owner, result_field, variant.content)
+    setattr(owner, status_field, "completed")
+
+    update_fields = [result_field, status_field]
+
+    for suffix, value in (
+        ("generated_at", variant.generated_at),
+        ("purpose", variant.purpose),
+    ):
+        field = f"{result_field}_{suffix}"
+
+        if hasattr(owner, field):
+            setattr(owner, field, value)
+            update_fields.append(field)
+
+    set_ai_content_language(owner, content_key, variant.language)
+
+    owner.save(
+        update_fields=update_fields + get_ai_language_update_fields(owner)
+    )
+
+
+def switch_ai_content_language(
+    owner,
+    *,
+    content_key,
+    result_field,
+    status_field,
+    language_code,
+    allow_translation=False,
+):
+    """
+    Replace the owner's completed content for a section with its
+    variant in language_code, translating it with allow_translation.
+    Returns True when the section now holds content in that language,
+    False when it must be generated.
+    """
+
+    language = normalize_ai_language(language_code)
+    current = stash_ai_content_variant(
+        owner,
+        content_key=content_key,
+        result_field=result_field,
+    )
+
+    if current is None:
+        return False
+
+    variant = (
+        AIContentVariant.objects
+        .filter(
+            **_owner_filter(owner),
+            content_key=content_key,
+            language=language,
+        )
+        .first()
+    )
+
+    if variant is not None and variant.purpose != current.purpose:
+        variant.delete()
+        variant = None
+
+    if (
+        variant is None
+        and allow_translation
+        and translation_enabled()
+    ):
+        from apps.core.ai.translation import translate_ai_content
+
+        translated = translate_ai_content(
+            current.content,
+            source_language=current.language,
+            target_language=language,
+        )
+
+        if translated is not None:
+            variant, _ = AIContentVariant.objects.update_or_create(
+                **_owner_filter(owner),
+                content_key=content_key,
+                language=language,
+                defaults={
+                    "content": translated,
+                    "purpose": current.purpose,
+                    "generated_at": current.generated_at,
+                    "translated": True,
+                },
+            )
+
+    if variant is None:
+        return False
+
+    _restore(
+        owner,
+        variant,
+        content_key=content_key,
+        result_field=result_field,
+        status_field=status_field,
+    )
+
+    logger.info(
+        "Restored %s in %s for %s%s",
+        content_key,
+        language,
+        owner,
+        " (translated)" if variant.translated else "",
+    )
+
+    return True
+
+
+def restore_switched_ai_content(
+    owner,
+    *,
+    content_key,
+    result_field,
+    status_field,
+    language_code,
+):
+    """
+    Mark an outdated section completed again when it was only outdated
+    because the user looked at it in another language, i.e. the saved
+    content is in language_code and is the very content kept as that
+    language's variant. Returns True when the status was restored.
+    """
+
+    if getattr(owner, status_field, None) != "outdated":
+        return False
+
+    if not getattr(owner, result_field, None):
+        return False
+
+    language = normalize_ai_language(language_code)
+
+    if get_saved_ai_content_language(owner, content_key) != language:
+        return False
+
+    variant = (
+        AIContentVariant.objects
+        .filter(
+            **_owner_filter(owner),
+            content_key=content_key,
+            language=language,
+        )
+        .first()
+    )
+
+    if (
+        variant is None
+        or variant.content != getattr(owner, result_field)
+        or variant.purpose != (
+            getattr(owner, f"{result_field}_purpose", "") or ""
+        )
+    ):
+        return False
+
+    setattr(owner, status_field, "completed")
+    owner.save(update_fields=[status_field])
+
+    return True
+
+
+def translate_switched_ai_content(
+    owner,
+    *,
+    content_key,
+    result_field,
+    status_field,
+    language_code,
+):
+    """
+    Translate an outdated section that was only outdated because it
+    was opened in a language with no stored variant, i.e. the saved
+    content is still the variant of its own language. Returns True
+    when the section now holds content in language_code.
+    """
+
+    if not translation_enabled():
+        return False
+
+    if getattr(owner, status_field, None) != "outdated":
+        return False
+
+    content = getattr(owner, result_field, None)
+
+    if not content:
+        return False
+
+    saved_language = get_saved_ai_content_language(owner, content_key)
+
+    if saved_language == normalize_ai_language(language_code):
+        return False
+
+    variant = (
+        AIContentVariant.objects
+        .filter(
+            **_owner_filter(owner),
+            content_key=content_key,
+            language=saved_language,
+        )
+        .first()
+    )
+
+    if (
+        variant is None
+        or variant.content != content
+        or variant.purpose != (
+            getattr(owner, f"{result_field}_purpose", "") or ""
+        )
+    ):
+        return False
+
+    return switch_ai_content_language(
+        owner,
+        content_key=content_key,
+        result_field=result_field,
+        status_field=status_field,
+        language_code=language_code,
+        allow_translation=True,
+    )
+
+
+def discard_ai_content_variants(
+    *,
+    owner=None,
+    process=None,
+    content_keys=None,
+):
+    """
+    Delete stored variants whose input has changed, for one owner or
+    for every candidate in a process.
+    """
+
+    variants = AIContentVariant.objects.all()
+
+    if owner is not None:
+        variants = variants.filter(**_owner_filter(owner))
+
+    if process is not None:
+        variants = variants.filter(invitation__process=process)
+
+    if content_keys is not None:
+        variants = variants.filter(content_key__in=list(content_keys))
+
+    deleted, _ = variants.delete()
+
+    return deleted
@@ -0,0 +1,807 @@
+"""
+Background execution of the AI stream views.
+
+A stream view still does all of its own preparation (access, language,
+saved results, the "generating" status) and builds the generator that
+yields the streamed chunks. Instead of writing that generator to the
+HTTP response it hands it to generation_response, which records an
+AIGenerationJob and runs the generator in a process-wide worker pool.
+
+Every chunk is appended to the job row, and the browser polls the job
+from an offset (static/js/ai-jobs.js). A web worker is then only busy
+for the few milliseconds of each poll instead of for the whole OpenAI
+stream.
+
+Each flush also renews the job's heartbeat, and while a job waits for a
+free worker the pool renews it, as does a generation waiting for OpenAI
+rate limit budget. A job without a heartbeat for
+AI_GENERATION_LEASE_SECONDS is considered abandoned: the next
+request for the section marks it failed, releases the owner's
+"generating" status and starts over, instead of answering 409 forever.
+A request for a section that is still generating attaches to the
+running job and replays its output from offset 0.
+
+The *_regenerate views hand out a stream URL with ?regenerate=1 (see
+regenerate_stream_url). That generation bypasses the AI result cache,
+so the recruiter gets a new answer rather than the stored one.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Concat, Substr
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from apps.core.ai.rate_limits import ai_priority, current_ai_priority, while_waiting
+from apps.core.ai.result_cache import bypass_result_cache
+from apps.processes.models import (
+    AIGenerationJob,
+    HistoricalProcessCandidate,
+    TestInvitation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+JOB_REQUEST_HEADER = "X-AI-Job"
+
+# Query parameter of a stream request made by a regenerate button.
+REGENERATE_PARAM = "regenerate"
+
+# Chunks are written to the job row at most this often, or as soon
+# as this many characters are buffered.
+FLUSH_INTERVAL = 0.25
+FLUSH_CHARS = 2000
+
+# How often follow_generation_job looks for new output.
+FOLLOW_POLL_INTERVAL = 0.2
+
+DEFAULT_LEASE_SECONDS = 120
+
+UNFINISHED_STATUSES = (
+    AIGenerationJob.Status.QUEUED,
+    AIGenerationJob.Status.RUNNING,
+)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+# Jobs submitted to this process's pool that have not started yet.
+_queued_job_ids = set()
+
+
+def get_generation_executor():
+    """
+    The worker pool of this process. Recreated after a fork, since
+    gunicorn workers must not share the master's threads.
+    """
+
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "AI_GENERATION_WORKERS", 8),
+                thread_name_prefix="ai-generation",
+            )
+            _executor_pid = pid
+            _queued_job_ids.clear()
+
+            threading.Thread(
+                target=_keep_queued_jobs_alive,
+                args=(pid,),
+                name="ai-generation-queue",
+                daemon=True,
+            ).start()
+
+    return _executor
+
+
+def _keep_queued_jobs_alive(pid):
+    """
+    Renew the heartbeat of the jobs waiting in this process's pool, so
+    the lease of a job counts from when it starts. Jobs queued in a
+    process that died are no longer renewed and expire as usual.
+    """
+
+    interval = lease_duration().total_seconds() / 4
+
+    while _executor_pid == pid:
+        time.sleep(interval)
+
+        with _executor_lock:
+            job_ids = list(_queued_job_ids)
+
+        if not job_ids:
+            continue
+
+        try:
+            AIGenerationJob.objects.filter(
+                pk__in=job_ids,
+                status=AIGenerationJob.Status.QUEUED,
+            ).update(
+                heartbeat_at=timezone.now(),
+            )
+        except Exception:
+            logger.exception("Could not renew queued AI generation jobs")
+        finally:
+            connections.close_all()
+
+
+def submit_generation_job(job_id, body, priority=None):
+    executor = get_generation_executor()
+
+    with _executor_lock:
+        _queued_job_ids.add(job_id)
+
+    return executor.submit(
+        run_generation_job,
+        job_id,
+        body,
+        priority,
+    )
+
+
+# ---------------------------------------------------------------------
+# Leases
+# ---------------------------------------------------------------------
+
+def lease_duration():
+    return timedelta(
+        seconds=getattr(
+            settings,
+            "AI_GENERATION_LEASE_SECONDS",
+            DEFAULT_LEASE_SECONDS,
+        )
+    )
+
+
+def status_field_for(section):
+    """
+    The owner's status field for a section, e.g. ai_summary_status.
+    The same name is used on TestInvitation and
+    HistoricalProcessCandidate.
+    """
+
+    return f"ai_{section}_status"
+
+
+def _owner_filter(owner):
+    if isinstance(owner, HistoricalProcessCandidate):
+        return {"historical_candidate": owner}
+
+    return {"invitation": owner}
+
+
+def is_generation_stale(job, now=None):
+    if job.status not in UNFINISHED_STATUSES:
+        return False
+
+    now = now or timezone.now()
+
+    return (job.heartbeat_at or job.created_at) < now - lease_duration()
+
+
+def release_owner(*, invitation_id=None, historical_candidate_id=None, section):
+    """
+    Set the owner's section status from "generating" to "failed", if
+    it is still "generating". Returns True if this call released it.
+    """
+
+    status_field = status_field_for(section)
+
+    if invitation_id:
+        model, pk = TestInvitation, invitation_id
+    else:
+        model, pk = HistoricalProcessCandidate, historical_candidate_id
+
+    return bool(
+        model.objects
+        .filter(pk=pk, **{status_field: "generating"})
+        .update(**{status_field: "failed"})
+    )
+
+
+def expire_generation_job(job, *, error="The generation stopped sending heartbeats."):
+    """
+    Mark an abandoned job as failed and release its owner. Only the
+    first caller wins; returns True for that caller.
+    """
+
+    expired = (
+        AIGenerationJob.objects
+        .filter(
+            pk=job.pk,
+            status__in=UNFINISHED_STATUSES,
+            heartbeat_at=job.heartbeat_at,
+        )
+        .update(
+            status=AIGenerationJob.Status.FAILED,
+            error=error,
+            finished_at=timezone.now(),
+        )
+    )
+
+    if not expired:
+        return False
+
+    release_owner(
+        invitation_id=job.invitation_id,
+        historical_candidate_id=job.historical_candidate_id,
+        section=job.section,
+    )
+
+    logger.warning(
+        "AI generation job %s (%s) expired: %s",
+        job.pk,
+        job.section,
+        error,
+    )
+
+    return True
+
+
+def get_live_generation_job(owner, section):
+    """
+    The unfinished job for owner and section whose lease is still
+    valid, or None.
+    """
+
+    job = (
+        AIGenerationJob.objects
+        .defer("output")
+        .filter(
+            section=section,
+            status__in=UNFINISHED_STATUSES,
+            **_owner_filter(owner),
+        )
+        .order_by("-created_at")
+        .first()
+    )
+
+    if job is None or is_generation_stale(job):
+        return None
+
+    return job
+
+
+def resume_or_reclaim_generation(request, *, owner, section):
+    """
+    Called by a stream view when the owner's section is already
+    "generating".
+
+    Returns a response attached to the running job, a 409 if another
+    request is taking over the same generation, or None when the
+    abandoned generation was reclaimed and the view should start a
+    new one.
+    """
+
+    live_job = get_live_generation_job(owner, section)
+
+    if live_job is not None:
+        return attach_generation_response(request, live_job)
+
+    reclaimed = False
+
+    for job in (
+        AIGenerationJob.objects
+        .defer("output")
+        .filter(
+            section=section,
+            status__in=UNFINISHED_STATUSES,
+            **_owner_filter(owner),
+        )
+    ):
+        if is_generation_stale(job):
+            reclaimed = expire_generation_job(job) or reclaimed
+
+    # No job at all, e.g. a section left "generating" by a worker that
+    # died before jobs were recorded.
+    is_historical = isinstance(owner, HistoricalProcessCandidate)
+
+    reclaimed = release_owner(
+        invitation_id=None if is_historical else owner.pk,
+        historical_candidate_id=owner.pk if is_historical else None,
+        section=section,
+    ) or reclaimed
+
+    if reclaimed:
+        return None
+
+    return JsonResponse(
+        {
+            "error": "This AI content is already being generated.",
+        },
+        status=409,
+    )
+
+
+# ---------------------------------------------------------------------
+# Running a job
+# ---------------------------------------------------------------------
+
+class LeaseLost(Exception):
+    """
+    The job was expired by another request while this worker was
+    still running it.
+    """
+
+
+class _JobOutputWriter:
+    """
+    Buffers streamed chunks and appends them to the job row with one
+    UPDATE per flush. output_length only ever grows, so a reader can
+    use it as the offset of the next poll. Every flush renews the
+    job's heartbeat.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.buffer = []
+        self.buffered_chars = 0
+        self.last_flush = time.monotonic()
+
+    def write(self, chunk):
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", errors="replace")
+
+        if not chunk:
+            return
+
+        self.buffer.append(chunk)
+        self.buffered_chars += len(chunk)
+
+        if (
+            self.buffered_chars >= FLUSH_CHARS
+            or time.monotonic() - self.last_flush >= FLUSH_INTERVAL
+        ):
+            self.flush()
+
+    def flush(self, **extra_fields):
+        text = "".join(self.buffer)
+        self.buffer = []
+        self.buffered_chars = 0
+        self.last_flush = time.monotonic()
+
+        fields = {
+            "heartbeat_at": timezone.now(),
+            **extra_fields,
+        }
+
+        if text:
+            fields["output"] = Concat(
+                F("output"),
+                Value(text),
+                output_field=TextField(),
+            )
+            fields["output_length"] = F("output_length") + len(text)
+
+        updated = (
+            AIGenerationJob.objects
+            .filter(
+                pk=self.job_id,
+                status=AIGenerationJob.Status.RUNNING,
+            )
+            .update(**fields)
+        )
+
+        if not updated:
+            raise LeaseLost(self.job_id)
+
+
+def _renew_heartbeat(job_id):
+    """
+    Keep a running job's lease while its generation waits for rate
+    limit budget. Losing the lease is noticed by the next flush.
+    """
+
+    AIGenerationJob.objects.filter(
+        pk=job_id,
+        status=AIGenerationJob.Status.RUNNING,
+    ).update(heartbeat_at=timezone.now())
+
+
+def _generate(job_id, body):
+    """
+    Run body, persisting every chunk, and yield the chunks on. Used
+    both by the worker pool and for in-request streaming.
+    """
+
+    now = timezone.now()
+
+    AIGenerationJob.objects.filter(pk=job_id).update(
+        status=AIGenerationJob.Status.RUNNING,
+        started_at=now,
+        heartbeat_at=now,
+    )
+
+    writer = _JobOutputWriter(job_id)
+    generation = body()
+
+    try:
+        with while_waiting(lambda: _renew_heartbeat(job_id)):
+            for chunk in generation:
+                writer.write(chunk)
+                yield chunk
+
+        writer.flush(
+            status=AIGenerationJob.Status.COMPLETED,
+            finished_at=timezone.now(),
+        )
+
+    except LeaseLost:
+        # Stop generating; the request that expired the job owns the
+        # section now.
+        generation.close()
+        logger.warning("AI generation job %s lost its lease", job_id)
+
+    except GeneratorExit:
+        # The client went away during an in-request stream.
+        generation.close()
+        _fail_job(job_id, writer, "The client disconnected.")
+        raise
+
+    except Exception as e:
+        logger.exception("AI generation job %s failed", job_id)
+        _fail_job(job_id, writer, str(e))
+
+
+def _fail_job(job_id, writer, error):
+    try:
+        writer.flush(
+            status=AIGenerationJob.Status.FAILED,
+            error=error[:2000],
+            finished_at=timezone.now(),
+        )
+    except LeaseLost:
+        return
+
+    job = AIGenerationJob.objects.defer("output").get(pk=job_id)
+
+    release_owner(
+        invitation_id=job.invitation_id,
+        historical_candidate_id=job.historical_candidate_id,
+        section=job.section,
+    )
+
+
+def run_generation_job(job_id, body, priority=None):
+    """
+    Run one generation in the worker pool. body is the stream view's
+    generator function; it handles its own errors and owner status,
+    so a failed job here means the worker itself failed. priority is
+    the rate limit priority of the request that started the job.
+    """
+
+    close_old_connections()
+
+    with _executor_lock:
+        _queued_job_ids.discard(job_id)
+
+    try:
+        with ai_priority(priority):
+            for _chunk in _generate(job_id, body):
+                pass
+
+    finally:
+        connections.close_all()
+
+
+def start_generation_job(*, owner, section, language_code, body, content_type, user=None, run=True):
+    """
+    Create the job row and, unless run is False, submit body to the
+    worker pool once the row is committed.
+    """
+
+    is_historical = isinstance(owner, HistoricalProcessCandidate)
+
+    job = AIGenerationJob.objects.create(
+        process=owner.process,
+        invitation=None if is_historical else owner,
+        historical_candidate=owner if is_historical else None,
+        created_by=user if user and user.is_authenticated else None,
+        section=section,
+        language_code=language_code or "",
+        content_type=content_type,
+        heartbeat_at=timezone.now(),
+    )
+
+    if run:
+        priority = current_ai_priority()
+
+        transaction.on_commit(
+            lambda: submit_generation_job(
+                job.id,
+                body,
+                priority,
+            )
+        )
+
+    return job
+
+
+# ---------------------------------------------------------------------
+# Reading a job
+# ---------------------------------------------------------------------
+
+def read_generation_job(job_id, offset=0):
+    """
+    The job with only the output after offset loaded, as
+    (job, chunk). The output before offset never leaves the database.
+    An abandoned job is expired on the way, so readers always reach
+    a finished state.
+    """
+
+    offset = max(int(offset or 0), 0)
+
+    def read():
+        return (
+            AIGenerationJob.objects
+            .defer("output")
+            .annotate(
+                chunk=Substr("output", offset + 1),
+            )
+            .get(pk=job_id)
+        )
+
+    job = read()
+
+    if is_generation_stale(job) and expire_generation_job(job):
+        job = read()
+
+    return job, (job.chunk or "")
+
+
+def serialize_generation_job(job, *, offset=0, chunk=""):
+    return {
+        "id": job.id,
+        "section": job.section,
+        "status": job.status,
+        "finished": job.is_finished,
+        "offset": offset,
+        "next_offset": offset + len(chunk),
+        "chunk": chunk,
+        "content_type": job.content_type,
+        "error": job.error,
+        "poll_url": reverse(
+            "processes:process_ai_generation_job",
+            args=[job.process_id, job.id],
+        ),
+    }
+
+
+def follow_generation_job(job_id, offset=0):
+    """
+    Yield a job's output as it is written, for clients that read the
+    stream view's response body directly.
+    """
+
+    while True:
+        job, chunk = read_generation_job(job_id, offset)
+
+        if chunk:
+            offset += len(chunk)
+            yield chunk
+
+        if job.is_finished:
+            return
+
+        time.sleep(FOLLOW_POLL_INTERVAL)
+
+
+def _stream_response(iterator, content_type):
+    response = StreamingHttpResponse(
+        iterator,
+        content_type=content_type,
+    )
+
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+
+    return response
+
+
+def attach_generation_response(request, job, offset=0):
+    """
+    A response following an existing job, from offset.
+    """
+
+    if request.headers.get(JOB_REQUEST_HEADER):
+        return JsonResponse(
+            serialize_generation_job(job, offset=offset),
+            status=202,
+        )
+
+    return _stream_response(
+        follow_generation_job(job.id, offset),
+        job.content_type,
+    )
+
+
+def regenerate_stream_url(url):
+    """
+    The stream URL a *_regenerate view returns: its generation asks
+    the model again instead of using the result cache.
+    """
+
+    return f"{url}?{REGENERATE_PARAM}=1"
+
+
+def _without_result_cache(body):
+    def regenerate():
+        with bypass_result_cache():
+            yield from body()
+
+    return regenerate
+
+
+def generation_response(request, *, owner, section, language_code, body, content_type):
+    """
+    The response of a stream view that starts a new generation.
+
+    Clients sending the X-AI-Job header get the job (202) and poll it.
+    Other clients get the output streamed as before. With
+    AI_GENERATION_JOBS disabled the generator runs inside the request,
+    still persisting its output to the job.
+    """
+
+    run_in_background = getattr(settings, "AI_GENERATION_JOBS", True)
+
+    if request.GET.get(REGENERATE_PARAM):
+        body = _without_result_cache(body)
+
+    job = start_generation_job(
+        owner=owner,
+        section=section,
+        language_code=language_code,
+        body=body,
+        content_type=content_type,
+        user=request.user,
+        run=run_in_background,
+    )
+
+    if not run_in_background:
+        return _stream_response(
+            _generate(job.id, body),
+            content_type,
+        )
+
+    return attach_generation_response(request, job)
+
+
+# ---------------------------------------------------------------------
+# Generations started by the server
+# ---------------------------------------------------------------------
+
+def section_url(owner, section, action="stream"):
+    return reverse(
+        f"processes:process_candidate_{section}_{action}",
+        kwargs={
+            "process_id": owner.process_id,
+            "candidate_id": owner.candidate_id,
+        },
+    )
+
+
+def _call_view(path, *, method, user, language_code):
+    """
+    Call a processes view in-process with an internal request that
+    asks for job responses. CSRF middleware is not involved.
+    """
+
+    request = HttpRequest()
+    request.method = method
+    request.path = request.path_info = path
+    request.META = {
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        f"HTTP_{JOB_REQUEST_HEADER.upper().replace('-', '_')}": "1",
+    }
+    request.user = user
+    request.LANGUAGE_CODE = language_code
+
+    match = resolve(path)
+
+    return match.func(request, *match.args, **match.kwargs)
+
+
+def reset_section_for_regeneration(owner, section, *, user, language_code):
+    """
+    Run the section's *_regenerate view, which clears the saved
+    result's status so the next stream generates it again. Returns
+    an error message, or "" on success.
+    """
+
+    response = _call_view(
+        section_url(owner, section, "regenerate"),
+        method="POST",
+        user=user,
+        language_code=language_code,
+    )
+
+    if response.status_code == 200:
+        return ""
+
+    try:
+        return json.loads(response.content).get("error") or f"HTTP {response.status_code}"
+    except ValueError:
+        return f"HTTP {response.status_code}"
+
+
+def dispatch_section_generation(owner, section, *, user, language_code):
+    """
+    Start a section's generation without an HTTP request.
+
+    The section's own stream view is called with an internal request,
+    so access, language, saved-result and status handling are exactly
+    those of a recruiter opening the candidate.
+
+    Returns (outcome, job_id). outcome is "started" (a job is running,
+    new or already in progress), "saved" (an up-to-date result exists),
+    "conflict", "skipped" (the section does not apply to this
+    candidate), "forbidden" or "error".
+    """
+
+    response = _call_view(
+        section_url(owner, section),
+        method="GET",
+        user=user,
+        language_code=language_code,
+    )
+
+    if response.status_code == 202:
+        return "started", json.loads(response.content)["id"]
+
+    if response.streaming:
+        response.close()
+
+    if response.status_code == 200:
+        return "saved", None
+
+    outcome = {
+        400: "skipped",
+        403: "forbidden",
+        409: "conflict",
+    }.get(response.status_code, "error")
+
+    return outcome, None
+
+
+def wait_for_generation_job(job_id, *, timeout=None, interval=1.0):
+    """
+    Block until a job is finished (or expired) and return it. Returns
+    the unfinished job if timeout seconds pass first.
+    """
+
+    deadline = time.monotonic() + timeout if timeout else None
+
+    while True:
+        job = AIGenerationJob.objects.defer("output").get(pk=job_id)
+
+        if is_generation_stale(job):
+            expire_generation_job(job)
+            job = AIGenerationJob.objects.defer("output").get(pk=job_id)
+
+        if job.is_finished:
+            return job
+
+        if deadline and time.monotonic() >= deadline:
+            return job
+
+        time.sleep(interval)
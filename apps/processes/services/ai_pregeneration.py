@@ -0,0 +1,214 @@
+"""
+Generate a candidate's AI sections as soon as the candidate completes
+the assessments, so the candidate sheet usually opens with everything
+in place instead of generating one section at a time.
+
+Enabled with AI_PREGENERATE_ON_COMPLETION. When a Sova payload (or the
+reconcile poller) moves an invitation to "completed", every section in
+PREGENERATED_SECTIONS is queued. At most AI_PREGENERATION_CONCURRENCY
+sections run at once per process, across all candidates, so a burst of
+completions cannot take every AI worker from recruiters.
+
+Sections are started through their stream views (see
+dispatch_section_generation), so a section a recruiter already opened,
+or one that does not apply to the candidate, is simply skipped.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+from apps.accounts.models import CompanyMember
+from apps.core.ai.language import normalize_ai_language
+from apps.core.ai.rate_limits import BACKGROUND, ai_priority
+from apps.processes.models import TestInvitation
+from apps.processes.services.ai_generation_jobs import (
+    dispatch_section_generation,
+    status_field_for,
+    wait_for_generation_job,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Sections that only need the assessment results. Decision support
+# builds on the interpretations and is generated on demand.
+PREGENERATED_SECTIONS = (
+    "summary",
+    "purpose_fit",
+    "cognitive_interpretation",
+    "cognitive_questions",
+    "motivation_interpretation",
+    "motivation_questions",
+    "personality_interpretation",
+    "personality_questions",
+)
+
+# A section slot is given up after this long, even if the job is
+# still running (it keeps running, it just no longer holds a slot).
+SECTION_TIMEOUT = 600
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def pregeneration_enabled():
+    return bool(getattr(settings, "AI_PREGENERATE_ON_COMPLETION", False))
+
+
+def _get_pool():
+    global _pool, _pool_pid
+
+    pid = os.getpid()
+
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, "AI_PREGENERATION_CONCURRENCY", 3),
+                thread_name_prefix="ai-pregeneration",
+            )
+            _pool_pid = pid
+
+    return _pool
+
+
+def pregeneration_language():
+    return normalize_ai_language(
+        getattr(settings, "AI_PREGENERATION_LANGUAGE", "")
+        or settings.LANGUAGE_CODE
+    )
+
+
+def generation_user_for(process):
+    """
+    The user the generation runs as: the process creator, or else an
+    admin of the process's company.
+    """
+
+    if process.created_by_id:
+        return process.created_by
+
+    membership = (
+        CompanyMember.objects
+        .select_related("user")
+        .filter(
+            company_id=process.company_id,
+            role=CompanyMember.ROLE_ADMIN,
+            user__is_active=True,
+        )
+        .order_by("created_at")
+        .first()
+    )
+
+    return membership.user if membership else None
+
+
+def pregenerate_section(invitation_id, section, *, language_code=None, wait=True):
+    """
+    Start one section for one invitation and, with wait, hold the
+    caller until the generation is finished. Returns the outcome from
+    dispatch_section_generation, or the section's status after a
+    generation that was waited for.
+    """
+
+    invitation = (
+        TestInvitation.objects
+        .select_related("process", "process__created_by", "candidate")
+        .get(pk=invitation_id)
+    )
+
+    user = generation_user_for(invitation.process)
+
+    if user is None:
+        logger.warning(
+            "AI pre-generation skipped for invitation %s: no user for process %s",
+            invitation_id,
+            invitation.process_id,
+        )
+        return "forbidden"
+
+    outcome, job_id = dispatch_section_generation(
+        invitation,
+        section,
+        user=user,
+        language_code=language_code or pregeneration_language(),
+    )
+
+    if outcome == "started" and wait:
+        wait_for_generation_job(job_id, timeout=SECTION_TIMEOUT)
+
+        # The job only tells whether the worker ran; the section's own
+        # status tells whether the generation succeeded.
+        status_field = status_field_for(section)
+        invitation.refresh_from_db(fields=[status_field])
+        outcome = getattr(invitation, status_field) or "failed"
+
+    logger.info(
+        "AI pre-generation invitation=%s section=%s outcome=%s",
+        invitation_id,
+        section,
+        outcome,
+    )
+
+    return outcome
+
+
+def _pregenerate_in_thread(invitation_id, section, language_code):
+    close_old_connections()
+
+    try:
+        with ai_priority(BACKGROUND):
+            return pregenerate_section(
+                invitation_id,
+                section,
+                language_code=language_code,
+            )
+
+    except Exception:
+        logger.exception(
+            "AI pre-generation failed for invitation %s section %s",
+            invitation_id,
+            section,
+        )
+
+    finally:
+        connections.close_all()
+
+
+def schedule_pregeneration(invitation, *, sections=PREGENERATED_SECTIONS, language_code=None, force=False):
+    """
+    Queue the sections of a completed invitation once the current
+    transaction commits. Does nothing unless pre-generation is enabled
+    (or force is given).
+    """
+
+    if not (force or pregeneration_enabled()):
+        return False
+
+    if invitation.is_historical:
+        return False
+
+    language_code = language_code or pregeneration_language()
+
+    def submit():
+        pool = _get_pool()
+
+        for section in sections:
+            pool.submit(
+                _pregenerate_in_thread,
+                invitation.pk,
+                section,
+                language_code,
+            )
+
+    transaction.on_commit(submit)
+
+    return True
@@ -0,0 +1,670 @@
+"""
+Process-wide regeneration of outdated AI sections.
+
+After a purpose or context change, mark_candidate_ai_content_outdated
+marks every candidate's AI content outdated. Without this, each
+candidate is regenerated only when a recruiter opens them and waits.
+An AIRegenerationRun updates every candidate in the background, one
+AIUpdateRun per candidate (see ai_update_runs), so each candidate goes
+through the same dependency graph as a manual "update all".
+
+Order:
+- Candidates viewed most recently come first (TestInvitation.
+  last_viewed_at). A candidate opened while the run is going moves to
+  the front of the queue.
+- Runs of active processes come before runs of archived processes or
+  processes nobody has looked at for ACTIVE_WITHIN.
+
+Rate limits: the model calls are background calls (rate_limits), so
+they queue behind recruiters' calls for the shared budget. At most
+AI_REGENERATION_CONCURRENCY candidates run at once. A 429 halves that
+limit and the scheduler starts nothing new until the backoff from
+rate_limits has passed. The limit then grows back by one per candidate
+finished without a 429. A candidate that failed while rate limited is
+retried up to MAX_ATTEMPTS times.
+
+One scheduler thread per worker process runs every run it has claimed.
+A run whose heartbeat stops (the worker died) is taken over by the
+next scheduler that looks.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.ai.rate_limits import (
+    BACKGROUND,
+    ai_priority,
+    backoff_remaining,
+    rate_limited_count,
+)
+from apps.processes.models import (
+    AIRegenerationRun,
+    AIUpdateRun,
+    TestInvitation,
+)
+from apps.processes.services.ai_pregeneration import generation_user_for
+from apps.processes.services.ai_update_plan import build_global_ai_update_plan
+from apps.processes.services.ai_update_runs import (
+    create_update_run,
+    get_active_update_run,
+    run_update_run,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Sections in the global update plan, by AI content key.
+PLAN_SECTIONS = (
+    "purpose_fit",
+    "response_style_guidance",
+    "personality_interpretation",
+    "personality_questions",
+    "motivation_interpretation",
+    "motivation_questions",
+    "cognitive_interpretation",
+    "cognitive_questions",
+    "pre_interview_decision_support",
+    "post_interview_decision_support",
+)
+
+DEFAULT_CONCURRENCY = 3
+
+MAX_ATTEMPTS = 3
+
+# A process counts as active when one of its candidates was viewed
+# this recently.
+ACTIVE_WITHIN = timedelta(days=14)
+
+# A running run without a heartbeat for this long is taken over.
+STALE_RUN_AFTER = timedelta(minutes=3)
+
+# How often the scheduler looks for new runs and refreshes heartbeats.
+POLL_INTERVAL = 1.0
+
+FINISHED_RESULT_STATUSES = {"completed", "skipped", "failed"}
+
+
+def regeneration_concurrency():
+    return max(
+        getattr(settings, "AI_REGENERATION_CONCURRENCY", DEFAULT_CONCURRENCY),
+        1,
+    )
+
+
+def outdated_invitations(process):
+    """
+    Invitations of a process with at least one outdated AI section.
+    """
+
+    outdated = Q()
+
+    for section in PLAN_SECTIONS:
+        outdated |= Q(**{f"ai_{section}_status": "outdated"})
+
+    return TestInvitation.objects.filter(outdated, process=process)
+
+
+def prioritised_invitation_ids(invitations):
+    return list(
+        invitations
+        .order_by(
+            F("last_viewed_at").desc(nulls_last=True),
+            F("completed_at").desc(nulls_last=True),
+            "id",
+        )
+        .values_list("id", flat=True)
+    )
+
+
+def process_is_active(process, now=None):
+    if process.is_archived:
+        return False
+
+    now = now or timezone.now()
+
+    return process.invitations.filter(
+        last_viewed_at__gte=now - ACTIVE_WITHIN,
+    ).exists()
+
+
+def create_regeneration_run(*, process, user, language_code):
+    """
+    A run over every candidate with outdated AI sections, or None when
+    there are none. An unfinished earlier run of the process is
+    cancelled; its remaining candidates are still outdated and are part
+    of the new run.
+    """
+
+    invitation_ids = prioritised_invitation_ids(
+        outdated_invitations(process)
+    )
+
+    if not invitation_ids:
+        return None
+
+    AIRegenerationRun.objects.filter(
+        process=process,
+        status__in=[
+            AIRegenerationRun.Status.QUEUED,
+            AIRegenerationRun.Status.RUNNING,
+        ],
+    ).update(
+        status=AIRegenerationRun.Status.CANCELLED,
+        finished_at=timezone.now(),
+    )
+
+    return AIRegenerationRun.objects.create(
+        process=process,
+        created_by=user if user and user.is_authenticated else None,
+        language_code=language_code or "",
+        invitation_ids=invitation_ids,
+        total=len(invitation_ids),
+    )
+
+
+def _update_candidate(run_id, invitation_id, user_id, language_code):
+    """
+    Regenerate one candidate's outdated sections through an
+    AIUpdateRun. Returns (status, error, update_run_id, rate_limited).
+    """
+
+    rate_limited_before = rate_limited_count()
+
+    invitation = (
+        TestInvitation.objects
+        .select_related("process", "process__created_by", "candidate")
+        .get(pk=invitation_id)
+    )
+
+    if get_active_update_run(invitation):
+        return "skipped", "An update for this candidate is already running.", None, 0
+
+    user = None
+
+    if user_id:
+        user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+
+    user = user or generation_user_for(invitation.process)
+
+    if user is None:
+        return "failed", "No user to generate as.", None, 0
+
+    plan = build_global_ai_update_plan(
+        process=invitation.process,
+        invitation=invitation,
+    )
+
+    if not plan["sections"]:
+        return "skipped", "", None, 0
+
+    update_run = create_update_run(
+        invitation=invitation,
+        user=user,
+        language_code=language_code,
+        plan_sections=plan["sections"],
+    )
+
+    run_update_run(update_run)
+
+    rate_limited = rate_limited_count() - rate_limited_before
+
+    if update_run.status == AIUpdateRun.Status.COMPLETED:
+        return "completed", "", update_run.id, rate_limited
+
+    errors = [
+        f"{item['label']}: {item['error']}"
+        for item in update_run.sections
+        if item["status"] == "failed"
+    ]
+
+    return "failed", "; ".join(errors)[:500], update_run.id, rate_limited
+
+
+def _update_candidate_in_thread(*args):
+    close_old_connections()
+
+    try:
+        with ai_priority(BACKGROUND):
+            return _update_candidate(*args)
+
+    except Exception as e:
+        logger.exception(
+            "AI regeneration run %s: invitation %s failed",
+            args[0],
+            args[1],
+        )
+        return "failed", str(e)[:500], None, 0
+
+    finally:
+        connections.close_all()
+
+
+def _save_run(run, **fields):
+    for name, value in fields.items():
+        setattr(run, name, value)
+
+    counts = {"completed": 0, "skipped": 0, "failed": 0}
+
+    for result in run.results.values():
+        if result["status"] in counts:
+            counts[result["status"]] += 1
+
+    run.completed_count = counts["completed"]
+    run.skipped_count = counts["skipped"]
+    run.failed_count = counts["failed"]
+    run.heartbeat_at = timezone.now()
+
+    AIRegenerationRun.objects.filter(pk=run.pk).update(
+        results=run.results,
+        completed_count=run.completed_count,
+        skipped_count=run.skipped_count,
+        failed_count=run.failed_count,
+        rate_limited_count=run.rate_limited_count,
+        heartbeat_at=run.heartbeat_at,
+        **fields,
+    )
+
+
+def _claim_runs(owned):
+    """
+    Take over queued runs and runs abandoned by another worker.
+    """
+
+    now = timezone.now()
+
+    candidates = (
+        AIRegenerationRun.objects
+        .filter(
+            Q(status=AIRegenerationRun.Status.QUEUED)
+            | Q(
+                status=AIRegenerationRun.Status.RUNNING,
+                heartbeat_at__lt=now - STALE_RUN_AFTER,
+            )
+        )
+        .exclude(pk__in=list(owned))
+        .values_list("id", "heartbeat_at")
+    )
+
+    for run_id, heartbeat_at in candidates:
+        claimed = AIRegenerationRun.objects.filter(
+            pk=run_id,
+            heartbeat_at=heartbeat_at,
+            status__in=[
+                AIRegenerationRun.Status.QUEUED,
+                AIRegenerationRun.Status.RUNNING,
+            ],
+        ).update(
+            status=AIRegenerationRun.Status.RUNNING,
+            heartbeat_at=now,
+        )
+
+        if not claimed:
+            continue
+
+        run = AIRegenerationRun.objects.select_related("process").get(pk=run_id)
+
+        if not run.started_at:
+            _save_run(run, started_at=now)
+
+        # Candidates that were running in a dead worker start over.
+        for result in run.results.values():
+            if result["status"] == "running":
+                result["status"] = "waiting"
+
+        run.active = process_is_active(run.process, now)
+        owned[run.id] = run
+
+
+class _Scheduler:
+    def __init__(self):
+        self.limit = regeneration_concurrency()
+        self.owned = {}
+        self.running = {}
+        self.retry_at = {}
+        self.last_poll = 0.0
+        self.rate_limited_seen = rate_limited_count()
+
+    def pending(self):
+        """
+        (run, invitation_id) pairs ready to start, in priority order.
+        """
+
+        now = time.monotonic()
+        pairs = []
+
+        for run in sorted(
+            self.owned.values(),
+            key=lambda run: (not run.active, run.created_at),
+        ):
+            # Candidates opened since the run started come first.
+            viewed = set(
+                TestInvitation.objects
+                .filter(
+                    pk__in=run.invitation_ids,
+                    last_viewed_at__gte=run.created_at,
+                )
+                .values_list("id", flat=True)
+            )
+
+            ready = [
+                invitation_id
+                for invitation_id in run.invitation_ids
+                if run.results.get(str(invitation_id), {}).get("status", "waiting") == "waiting"
+                and self.retry_at.get((run.id, invitation_id), 0) <= now
+            ]
+
+            ready.sort(key=lambda invitation_id: invitation_id not in viewed)
+
+            pairs.extend((run, invitation_id) for invitation_id in ready)
+
+        return pairs
+
+    def refresh(self):
+        self.last_poll = time.monotonic()
+
+        cancelled = set(
+            AIRegenerationRun.objects
+            .filter(
+                pk__in=list(self.owned),
+                status=AIRegenerationRun.Status.CANCELLED,
+            )
+            .values_list("id", flat=True)
+        )
+
+        for run_id in cancelled:
+            self.owned.pop(run_id, None)
+
+        AIRegenerationRun.objects.filter(
+            pk__in=list(self.owned),
+        ).update(heartbeat_at=timezone.now())
+
+        _claim_runs(self.owned)
+
+    def start(self, pool, run, invitation_id):
+        result = run.results.setdefault(
+            str(invitation_id),
+            {"status": "waiting", "error": "", "attempts": 0, "update_run_id": None},
+        )
+        result["status"] = "running"
+        result["attempts"] += 1
+        _save_run(run)
+
+        future = pool.submit(
+            _update_candidate_in_thread,
+            run.id,
+            invitation_id,
+            run.created_by_id,
+            run.language_code,
+        )
+        self.running[future] = (run, invitation_id)
+
+    def finish(self, future):
+        run, invitation_id = self.running.pop(future)
+        status, error, update_run_id, rate_limited = future.result()
+
+        result = run.results[str(invitation_id)]
+        result["update_run_id"] = update_run_id or result["update_run_id"]
+
+        # 429s are counted once, by the first candidate to finish after
+        # them, even when several candidates were running at the time.
+        new_rate_limited = rate_limited_count() - self.rate_limited_seen
+        self.rate_limited_seen += new_rate_limited
+
+        if new_rate_limited:
+            run.rate_limited_count += new_rate_limited
+            self.limit = max(self.limit // 2, 1)
+
+        elif not rate_limited and self.limit < regeneration_concurrency():
+            self.limit += 1
+
+        if rate_limited:
+            if status == "failed" and result["attempts"] < MAX_ATTEMPTS:
+                result["status"] = "waiting"
+                result["error"] = error
+                self.retry_at[(run.id, invitation_id)] = (
+                    time.monotonic() + backoff_remaining()
+                )
+                _save_run(run)
+                return
+
+        result["status"] = status
+        result["error"] = error
+        _save_run(run)
+
+    def close_finished_runs(self):
+        busy = {run.id for run, _ in self.running.values()}
+
+        for run in list(self.owned.values()):
+            if run.id in busy:
+                continue
+
+            if any(
+                run.results.get(str(invitation_id), {}).get("status") not in FINISHED_RESULT_STATUSES
+                for invitation_id in run.invitation_ids
+            ):
+                continue
+
+            _save_run(
+                run,
+                status=(
+                    AIRegenerationRun.Status.COMPLETED_WITH_ERRORS
+                    if any(result["status"] == "failed" for result in run.results.values())
+                    else AIRegenerationRun.Status.COMPLETED
+                ),
+                finished_at=timezone.now(),
+            )
+
+            logger.info(
+                "AI regeneration run %s finished: %s completed, %s skipped, %s failed, %s rate limited",
+                run.id,
+                run.completed_count,
+                run.skipped_count,
+                run.failed_count,
+                run.rate_limited_count,
+            )
+
+            self.owned.pop(run.id)
+
+    def run(self):
+        with ThreadPoolExecutor(
+            max_workers=regeneration_concurrency(),
+            thread_name_prefix="ai-regeneration",
+        ) as pool:
+            self.refresh()
+
+            while self.owned or self.running:
+                if time.monotonic() - self.last_poll >= POLL_INTERVAL:
+                    self.refresh()
+
+                if len(self.running) < self.limit and not backoff_remaining():
+                    for run, invitation_id in self.pending()[:self.limit - len(self.running)]:
+                        self.start(pool, run, invitation_id)
+
+                self.close_finished_runs()
+
+                if self.running:
+                    done, _pending = wait(
+                        self.running,
+                        timeout=POLL_INTERVAL,
+                        return_when=FIRST_COMPLETED,
+                    )
+
+                    for future in done:
+                        self.finish(future)
+
+                elif self.owned:
+                    time.sleep(POLL_INTERVAL)
+
+                if not self.owned and not self.running:
+                    # Runs queued while the last one finished.
+                    self.refresh()
+
+
+_scheduler_lock = threading.Lock()
+_scheduler_thread = None
+_scheduler_pid = None
+
+
+def _run_scheduler():
+    global _scheduler_thread
+
+    close_old_connections()
+
+    try:
+        _Scheduler().run()
+
+    except Exception:
+        logger.exception("AI regeneration scheduler failed")
+
+    finally:
+        with _scheduler_lock:
+            if _scheduler_thread is threading.current_thread():
+                _scheduler_thread = None
+
+        # A run queued after the last look would otherwise wait for
+        # the next start.
+        if AIRegenerationRun.objects.filter(
+            status=AIRegenerationRun.Status.QUEUED,
+        ).exists():
+            ensure_scheduler()
+
+        connections.close_all()
+
+
+def ensure_scheduler():
+    """
+    Start this process's scheduler unless it is already running.
+    """
+
+    global _scheduler_thread, _scheduler_pid
+
+    pid = os.getpid()
+
+    with _scheduler_lock:
+        if (
+            _scheduler_thread is not None
+            and _scheduler_pid == pid
+            and _scheduler_thread.is_alive()
+        ):
+            return
+
+        _scheduler_thread = threading.Thread(
+            target=_run_scheduler,
+            name="ai-regeneration-scheduler",
+            daemon=True,
+        )
+        _scheduler_pid = pid
+        _scheduler_thread.start()
+
+
+def resume_regeneration_run(run, now=None):
+    """
+    Make sure a queued or abandoned run has a scheduler, e.g. after a
+    restart. Called when the process page shows the run.
+    """
+
+    now = now or timezone.now()
+
+    if run.is_finished:
+        return
+
+    if (
+        run.status == AIRegenerationRun.Status.QUEUED
+        or not run.heartbeat_at
+        or run.heartbeat_at < now - STALE_RUN_AFTER
+    ):
+        ensure_scheduler()
+
+
+def start_regeneration_run(run):
+    """
+    Hand the run to the scheduler once the run row is committed; the
+    process page polls serialize_regeneration_run for progress.
+    """
+
+    transaction.on_commit(ensure_scheduler)
+
+    return run
+
+
+def regenerate_on_process_change_enabled():
+    return bool(getattr(settings, "AI_REGENERATE_ON_PROCESS_CHANGE", False))
+
+
+def schedule_process_regeneration(process, *, user, language_code):
+    """
+    Queue a run for the process after mark_candidate_ai_content_outdated
+    when AI_REGENERATE_ON_PROCESS_CHANGE is enabled. Returns the run.
+    """
+
+    if not regenerate_on_process_change_enabled() or process.is_historical:
+        return None
+
+    run = create_regeneration_run(
+        process=process,
+        user=user,
+        language_code=language_code,
+    )
+
+    if run is not None:
+        start_regeneration_run(run)
+
+    return run
+
+
+def serialize_regeneration_run(run):
+    return {
+        "id": run.id,
+        "status": run.status,
+        "status_label": run.get_status_display(),
+        "total": run.total,
+        "processed": run.processed_count,
+        "completed": run.completed_count,
+        "skipped": run.skipped_count,
+        "failed": run.failed_count,
+        "running": sum(
+            1
+            for result in run.results.values()
+            if result["status"] == "running"
+        ),
+        "rate_limited": run.rate_limited_count,
+        "is_finished": run.is_finished,
+        "error": run.error,
+    }
+
+
+def get_visible_regeneration_run(process, now=None):
+    """
+    The run shown on the process page: the latest run while it is
+    going or finished in the last ten minutes.
+    """
+
+    now = now or timezone.now()
+
+    run = (
+        process.ai_regeneration_runs
+        .exclude(status=AIRegenerationRun.Status.CANCELLED)
+        .order_by("-created_at")
+        .first()
+    )
+
+    if not run:
+        return None
+
+    if not run.is_finished:
+        return run
+
+    if run.finished_at and run.finished_at >= now - timedelta(minutes=10):
+        return run
+
+    return None
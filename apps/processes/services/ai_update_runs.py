@@ -0,0 +1,467 @@
+"""
+Server-side execution of a candidate's global AI update plan.
+
+build_candidate_ai_update_state lists the outdated sections. Instead of
+the browser regenerating them one by one, an AIUpdateRun regenerates
+them on the server as a small dependency graph: sections without
+pending dependencies run in parallel (AI_UPDATE_RUN_CONCURRENCY), and
+decision support starts only once the sections it reads are fresh. The
+wall-clock time is the critical path instead of the sum of sections.
+
+Each section goes through its own *_regenerate and *_stream views (see
+ai_generation_jobs), so the result is the same as a manual update.
+
+A run renews its heartbeat while it waits for sections. A queued or
+running run without one for RUN_LEASE was left behind by a worker that
+stopped (e.g. on a deploy); get_active_update_run marks it failed, so
+the candidate can be updated again.
+"""
+
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.ai.rate_limits import ai_priority, current_ai_priority
+from apps.processes.models import AIUpdateRun, TestInvitation
+from apps.processes.services.ai_generation_jobs import (
+    dispatch_section_generation,
+    reset_section_for_regeneration,
+    status_field_for,
+    wait_for_generation_job,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Plan keys that differ from the AI content key of the section.
+PLAN_KEY_SECTIONS = {
+    "overview": "purpose_fit",
+}
+
+# Sections read by build_pre_interview_evidence, which both decision
+# support generations are built on.
+PRE_INTERVIEW_INPUTS = (
+    "purpose_fit",
+    "response_style_guidance",
+    "personality_interpretation",
+    "motivation_interpretation",
+    "cognitive_interpretation",
+    "personality_questions",
+    "cognitive_questions",
+)
+
+SECTION_DEPENDENCIES = {
+    "pre_interview_decision_support": PRE_INTERVIEW_INPUTS,
+    "post_interview_decision_support": (
+        *PRE_INTERVIEW_INPUTS,
+        "pre_interview_decision_support",
+    ),
+}
+
+SECTION_TIMEOUT = 600
+
+RUN_HEARTBEAT_INTERVAL = 30
+RUN_LEASE = timedelta(minutes=5)
+
+ACTIVE_RUN_STATUSES = (
+    AIUpdateRun.Status.QUEUED,
+    AIUpdateRun.Status.RUNNING,
+)
+
+FINISHED_SECTION_STATUSES = {"completed", "failed", "skipped"}
+
+
+def plan_section(plan_key):
+    return PLAN_KEY_SECTIONS.get(plan_key, plan_key)
+
+
+def build_run_sections(plan_sections):
+    """
+    Run sections for the plan's sections. A dependency only counts when
+    it is part of the plan; sections outside it are already fresh.
+    """
+
+    planned = {
+        plan_section(item["key"])
+        for item in plan_sections
+    }
+
+    sections = [
+        {
+            "key": item["key"],
+            "label": item.get("label") or item["key"],
+            "section": plan_section(item["key"]),
+            "depends_on": [
+                dependency
+                for dependency in SECTION_DEPENDENCIES.get(plan_section(item["key"]), ())
+                if dependency in planned
+            ],
+            "status": "waiting",
+            "job_id": None,
+            "error": "",
+            "started_at": None,
+            "finished_at": None,
+        }
+        for item in plan_sections
+    ]
+
+    # Dependencies before the sections that read them, so one pass
+    # over the list can settle a whole level of the graph.
+    depth = {}
+
+    def section_depth(section):
+        if section not in depth:
+            depth[section] = 1 + max(
+                (section_depth(dep) for dep in SECTION_DEPENDENCIES.get(section, ()) if dep in planned),
+                default=-1,
+            )
+        return depth[section]
+
+    return sorted(
+        sections,
+        key=lambda item: section_depth(item["section"]),
+    )
+
+
+def is_update_run_stale(run, now=None):
+    if run.status not in ACTIVE_RUN_STATUSES:
+        return False
+
+    now = now or timezone.now()
+
+    return (run.heartbeat_at or run.created_at) < now - RUN_LEASE
+
+
+def expire_update_run(run, *, error="The update stopped before it finished."):
+    """
+    Mark a run left behind by a stopped worker as failed. Only the
+    first caller wins; returns True for that caller.
+    """
+
+    expired = AIUpdateRun.objects.filter(
+        pk=run.pk,
+        status__in=ACTIVE_RUN_STATUSES,
+        heartbeat_at=run.heartbeat_at,
+    ).update(
+        status=AIUpdateRun.Status.FAILED,
+        error=error,
+        finished_at=timezone.now(),
+    )
+
+    if expired:
+        logger.warning("AI update run %s expired: %s", run.pk, error)
+        run.refresh_from_db()
+
+    return bool(expired)
+
+
+def get_active_update_run(invitation):
+    """
+    The candidate's queued or running update run, or None. Runs left
+    behind by a stopped worker are expired on the way.
+    """
+
+    for run in (
+        AIUpdateRun.objects
+        .filter(
+            invitation=invitation,
+            status__in=ACTIVE_RUN_STATUSES,
+        )
+        .order_by("-created_at")
+    ):
+        if is_update_run_stale(run):
+            expire_update_run(run)
+            continue
+
+        return run
+
+    return None
+
+
+def create_update_run(*, invitation, user, language_code, plan_sections):
+    return AIUpdateRun.objects.create(
+        process=invitation.process,
+        invitation=invitation,
+        created_by=user if user and user.is_authenticated else None,
+        language_code=language_code or "",
+        sections=build_run_sections(plan_sections),
+    )
+
+
+def _regenerate_section(run, item):
+    """
+    Regenerate one section and wait for it. Returns (status, error).
+    """
+
+    # Each section thread works on its own instance.
+    invitation = (
+        TestInvitation.objects
+        .select_related("process")
+        .get(pk=run.invitation_id)
+    )
+    user = run.created_by
+
+    error = reset_section_for_regeneration(
+        invitation,
+        item["section"],
+        user=user,
+        language_code=run.language_code,
+    )
+
+    if error:
+        return "failed", error
+
+    outcome, job_id = dispatch_section_generation(
+        invitation,
+        item["section"],
+        user=user,
+        language_code=run.language_code,
+    )
+
+    if outcome == "saved":
+        return "completed", ""
+
+    if outcome == "skipped":
+        return "skipped", ""
+
+    if outcome != "started":
+        return "failed", outcome
+
+    item["job_id"] = job_id
+    _save_sections(run)
+
+    wait_for_generation_job(job_id, timeout=SECTION_TIMEOUT)
+
+    status_field = status_field_for(item["section"])
+    invitation.refresh_from_db(fields=[status_field])
+    status = getattr(invitation, status_field)
+
+    if status == "completed":
+        return "completed", ""
+
+    return "failed", f"Section ended as {status or 'unknown'}."
+
+
+def _regenerate_in_thread(run, item, priority):
+    close_old_connections()
+
+    try:
+        with ai_priority(priority):
+            return _regenerate_section(run, item)
+
+    except Exception as e:
+        logger.exception(
+            "AI update run %s: section %s failed",
+            run.id,
+            item["key"],
+        )
+        return "failed", str(e)
+
+    finally:
+        connections.close_all()
+
+
+_sections_lock = threading.Lock()
+
+
+def _save_sections(run, **fields):
+    with _sections_lock:
+        for name, value in fields.items():
+            setattr(run, name, value)
+
+        run.heartbeat_at = timezone.now()
+
+        AIUpdateRun.objects.filter(pk=run.pk).update(
+            sections=run.sections,
+            heartbeat_at=run.heartbeat_at,
+            **fields,
+        )
+
+
+def run_update_run(run):
+    """
+    Execute the run's dependency graph. Returns the run.
+    """
+
+    now = timezone.now()
+
+    _save_sections(
+        run,
+        status=AIUpdateRun.Status.RUNNING,
+        started_at=now,
+    )
+
+    items = {
+        item["section"]: item
+        for item in run.sections
+    }
+
+    running = {}
+
+    concurrency = getattr(settings, "AI_UPDATE_RUN_CONCURRENCY", 4)
+
+    # Interactive when a recruiter started the run, background inside
+    # a process-wide regeneration.
+    priority = current_ai_priority()
+
+    with ThreadPoolExecutor(
+        max_workers=max(concurrency, 1),
+        thread_name_prefix=f"ai-update-{run.id}",
+    ) as pool:
+        while True:
+            for item in run.sections:
+                if item["status"] != "waiting":
+                    continue
+
+                dependencies = [
+                    items[dependency]
+                    for dependency in item["depends_on"]
+                ]
+
+                if any(dep["status"] == "failed" for dep in dependencies):
+                    item["status"] = "failed"
+                    item["error"] = "A section it builds on could not be updated."
+                    item["finished_at"] = timezone.now().isoformat()
+                    continue
+
+                if not all(dep["status"] in FINISHED_SECTION_STATUSES for dep in dependencies):
+                    continue
+
+                if len(running) >= concurrency:
+                    break
+
+                item["status"] = "running"
+                item["started_at"] = timezone.now().isoformat()
+
+                running[pool.submit(_regenerate_in_thread, run, item, priority)] = item
+
+            _save_sections(run)
+
+            if not running:
+                break
+
+            # Wake up regularly so _save_sections renews the heartbeat
+            # while long sections run.
+            done, _pending = wait(
+                running,
+                timeout=RUN_HEARTBEAT_INTERVAL,
+                return_when=FIRST_COMPLETED,
+            )
+
+            for future in done:
+                item = running.pop(future)
+                item["status"], item["error"] = future.result()
+                item["finished_at"] = timezone.now().isoformat()
+
+    failed = [
+        item
+        for item in run.sections
+        if item["status"] == "failed"
+    ]
+
+    _save_sections(
+        run,
+        status=(
+            AIUpdateRun.Status.COMPLETED_WITH_ERRORS
+            if failed
+            else AIUpdateRun.Status.COMPLETED
+        ),
+        finished_at=timezone.now(),
+    )
+
+    logger.info(
+        "AI update run %s finished: %s section(s), %s failed",
+        run.id,
+        len(run.sections),
+        len(failed),
+    )
+
+    return run
+
+
+def _run_in_thread(run_id):
+    close_old_connections()
+
+    try:
+        run = (
+            AIUpdateRun.objects
+            .select_related("invitation", "invitation__process", "created_by")
+            .get(pk=run_id)
+        )
+        run_update_run(run)
+
+    except Exception as e:
+        logger.exception("AI update run %s failed", run_id)
+
+        AIUpdateRun.objects.filter(pk=run_id).update(
+            status=AIUpdateRun.Status.FAILED,
+            error=str(e)[:2000],
+            finished_at=timezone.now(),
+        )
+
+    finally:
+        connections.close_all()
+
+
+def start_update_run(run):
+    """
+    Run in a background thread once the run row is committed; the
+    candidate sheet polls serialize_update_run for progress.
+    """
+
+    thread = threading.Thread(
+        target=_run_in_thread,
+        args=(run.id,),
+        name=f"ai-update-run-{run.id}",
+        daemon=True,
+    )
+
+    transaction.on_commit(thread.start)
+
+    return run
+
+
+def serialize_update_run(run):
+    sections = run.sections or []
+
+    return {
+        "id": run.id,
+        "status": run.status,
+        "finished": run.is_finished,
+        "total": len(sections),
+        "processed": sum(
+            1
+            for item in sections
+            if item["status"] in FINISHED_SECTION_STATUSES
+        ),
+        "failed": sum(
+            1
+            for item in sections
+            if item["status"] == "failed"
+        ),
+        "error": run.error,
+        "sections": [
+            {
+                "key": item["key"],
+                "label": item["label"],
+                "status": item["status"],
+                "error": item["error"],
+                "depends_on": item["depends_on"],
+            }
+            for item in sections
+        ],
+        "status_url": reverse(
+            "processes:process_candidate_global_ai_update_run",
+            kwargs={
+                "process_id": run.process_id,
+                "candidate_id": run.invitation.candidate_id,
+                "run_id": run.id,
+            },
+        ),
+    }
@@ -189,6 +189,72 @@ def _build_usage_defaults(
     }
 
 
+def _selected_assessment_types(process):
+    assessment_types = []
+
+    for raw_assessment_type in process.selected_tests or []:
+        assessment_type = _normalise_assessment_type(
+            raw_assessment_type
+        )
+
+        if not assessment_type:
+            continue
+
+        if assessment_type not in assessment_types:
+            assessment_types.append(
+                assessment_type
+            )
+
+    return assessment_types
+
+
+def _mark_existing_usage_sent(
+    usage,
+    *,
+    sent_by,
+    sent_at,
+    sova_request_id="",
+):
+    """
+    Apply a new "sent" observation to an existing usage row.
+
+    Returns the changed field names; the caller saves them.
+    """
+
+    update_fields = []
+
+    if usage.sent_at is None:
+        usage.sent_at = sent_at
+        update_fields.append("sent_at")
+
+    if usage.sent_by_id is None and sent_by:
+        usage.sent_by = sent_by
+        update_fields.append("sent_by")
+
+    if (
+        not usage.sova_request_id
+        and sova_request_id
+    ):
+        usage.sova_request_id = (
+            sova_request_id
+        )
+        update_fields.append(
+            "sova_request_id"
+        )
+
+    # Never move a started or completed test backwards.
+    if usage.status not in {
+        AssessmentUsage.Status.STARTED,
+        AssessmentUsage.Status.COMPLETED,
+    }:
+        usage.status = (
+            AssessmentUsage.Status.SENT
+        )
+        update_fields.append("status")
+
+    return list(dict.fromkeys(update_fields))
+
+
 def register_sent_assessments(
     *,
     invitation,
@@ -208,24 +274,9 @@ def register_sent_assessments(
     if not process.company_id:
         return []
 
-    assessment_types = []
-
-    for raw_assessment_type in process.selected_tests or []:
-        assessment_type = _normalise_assessment_type(
-            raw_assessment_type
-        )
-
-        if not assessment_type:
-            continue
-
-        if assessment_type not in assessment_types:
-            assessment_types.append(
-                assessment_type
-            )
-
     usages = []
 
-    for assessment_type in assessment_types:
+    for assessment_type in _selected_assessment_types(process):
         usage, created = (
             AssessmentUsage.objects.get_or_create(
                 invitation=invitation,
@@ -241,47 +292,109 @@ def register_sent_assessments(
         )
 
         if not created:
-            update_fields = []
+            update_fields = _mark_existing_usage_sent(
+                usage,
+                sent_by=sent_by,
+                sent_at=sent_at,
+                sova_request_id=sova_request_id,
+            )
 
-            if usage.sent_at is None:
-                usage.sent_at = sent_at
-                update_fields.append("sent_at")
+            if update_fields:
+                usage.save(
+                    update_fields=update_fields
+                )
 
-            if usage.sent_by_id is None and sent_by:
-                usage.sent_by = sent_by
-                update_fields.append("sent_by")
+        usages.append(usage)
 
-            if (
-                not usage.sova_request_id
-                and sova_request_id
-            ):
-                usage.sova_request_id = (
-                    sova_request_id
-                )
-                update_fields.append(
-                    "sova_request_id"
-                )
+    return usages
 
-            # Never move a started or completed test backwards.
-            if usage.status not in {
-                AssessmentUsage.Status.STARTED,
-                AssessmentUsage.Status.COMPLETED,
-            }:
-                usage.status = (
-                    AssessmentUsage.Status.SENT
-                )
-                update_fields.append("status")
 
-            if update_fields:
-                usage.save(
-                    update_fields=list(
-                        dict.fromkeys(update_fields)
+def register_sent_assessments_bulk(
+    *,
+    invitations,
+    sent_by,
+    sent_at,
+):
+    """
+    Bulk variant of register_sent_assessments().
+
+    Uses the request_id already set on each invitation. Existing rows
+    are loaded in one query, new rows are written with one
+    bulk_create and changed rows with one bulk_update.
+    """
+
+    invitations = [
+        invitation
+        for invitation in invitations
+        if invitation.process.company_id
+    ]
+
+    if not invitations:
+        return []
+
+    existing = {
+        (usage.invitation_id, usage.assessment_type): usage
+        for usage in AssessmentUsage.objects.filter(
+            invitation__in=invitations,
+        )
+    }
+
+    to_create = []
+    to_update = []
+    changed_fields = set()
+
+    for invitation in invitations:
+        for assessment_type in _selected_assessment_types(invitation.process):
+            usage = existing.get(
+                (invitation.id, assessment_type)
+            )
+
+            if usage is None:
+                to_create.append(
+                    AssessmentUsage(
+                        invitation=invitation,
+                        assessment_type=assessment_type,
+                        **_build_usage_defaults(
+                            invitation=invitation,
+                            assessment_type=assessment_type,
+                            sent_by=sent_by,
+                            sent_at=sent_at,
+                            sova_request_id=(
+                                invitation.request_id
+                                or ""
+                            ),
+                        ),
                     )
                 )
+                continue
+
+            update_fields = _mark_existing_usage_sent(
+                usage,
+                sent_by=sent_by,
+                sent_at=sent_at,
+                sova_request_id=(
+                    invitation.request_id
+                    or ""
+                ),
+            )
 
-        usages.append(usage)
+            if update_fields:
+                to_update.append(usage)
+                changed_fields.update(update_fields)
 
-    return usages
+    if to_create:
+        AssessmentUsage.objects.bulk_create(
+            to_create,
+            ignore_conflicts=True,
+        )
+
+    if to_update:
+        AssessmentUsage.objects.bulk_update(
+            to_update,
+            sorted(changed_fields),
+        )
+
+    return to_create + to_update
 
 
 def sync_assessment_usage_from_activities(
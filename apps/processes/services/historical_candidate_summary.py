@@ -1,7 +1,7 @@
 import json
 import os
 
-from openai import OpenAI
+from apps.core.ai.openai_client import get_openai_client
 
 from apps.processes.services.candidate_profile import (
     build_historical_candidate_profile,
@@ -108,9 +108,7 @@ Write a professional candidate assessment summary of approximately
 Use paragraphs rather than bullet points.
 """.strip()
 
-    client = OpenAI(
-        api_key=os.environ.get("OPENAI_API_KEY")
-    )
+    client = get_openai_client()
 
     stream = client.responses.create(
         model=os.environ.get(
@@ -1,215 +1,811 @@
 # apps/processes/services/send_tests.py
+import logging
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import timedelta
+
 from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connections, transaction
 from django.utils import timezone
-from django.core.mail import EmailMultiAlternatives
 
 from apps.emails.models import EmailTemplate, EmailLog
 from apps.emails.utils import render_placeholders  # justera import om din ligger annorlunda
 from apps.activity.models import ActivityEvent
-from apps.activity.services import log_event
 
+from apps.processes.models import BulkSendJob, TestInvitation
 from apps.processes.services.assessment_usage import (
-    register_sent_assessments,
+    register_sent_assessments_bulk,
 )
 
-def send_assessments_and_emails(*, process, invitations, actor_user, context="customer"):
-    """
-    Skickar tester i SOVA + mailar kandidaten med samma mall som kundflödet.
-    Används av både kund och admin.
+logger = logging.getLogger(__name__)
 
-    context: "customer" eller "admin" (sparas i meta_data).
-    """
-    from apps.core.integrations.sova import SovaClient  # justera import
-    client = SovaClient()
 
-    sent_count = 0
-    skipped_count = 0
+# Sova orders in flight at the same time, and how many finished orders
+# are written to the database (and reported as progress) per round.
+DEFAULT_ORDER_CONCURRENCY = 6
+DEFAULT_WRITE_CHUNK_SIZE = 25
+
+# A running job renews its heartbeat every JOB_HEARTBEAT_INTERVAL
+# seconds, whether or not a chunk has finished. Without a heartbeat for
+# STALE_JOB_AFTER it is considered dead and may be resumed.
+JOB_HEARTBEAT_INTERVAL = 30
+STALE_JOB_AFTER = timedelta(minutes=3)
+
+ALREADY_SENT_STATUSES = ("sent", "started", "completed")
+
+DEFAULT_SUBJECT = "Ditt test"
+DEFAULT_BODY = (
+    "Hej {first_name}!\n\n"
+    "Klicka på länken för att starta testet:\n"
+    "{assessment_url}\n\n"
+    "Vänliga hälsningar,\n"
+    "Talena"
+)
+
+
+def _order_concurrency():
+    return getattr(settings, "SOVA_ORDER_CONCURRENCY", DEFAULT_ORDER_CONCURRENCY)
+
+
+def _find_sova_project_id(process):
+    # project_id lookup en gång per utskick, från den lagrade katalogen
+    from apps.projects.services.sova_catalogue import get_sova_accounts_with_projects
 
-    # (Valfritt) project_id lookup en gång (om du använder inv.sova_project_id)
-    sova_project_id = None
     try:
-        accounts = client.get_accounts_with_projects()
-        for a in accounts:
-            if (a.get("code") or "").strip() == (process.account_code or "").strip():
-                for p in (a.get("projects") or []):
-                    if (p.get("code") or "").strip() == (process.project_code or "").strip():
-                        sova_project_id = p.get("id")
-                        break
-                break
+        accounts = get_sova_accounts_with_projects()
     except Exception:
-        sova_project_id = None
+        return None
 
-    for inv in invitations:
-        candidate = inv.candidate
+    for a in accounts:
+        if (a.get("code") or "").strip() == (process.account_code or "").strip():
+            for p in (a.get("projects") or []):
+                if (p.get("code") or "").strip() == (process.project_code or "").strip():
+                    return p.get("id")
+            break
+
+    return None
 
-        if inv.status in ("sent", "started", "completed"):
-            skipped_count += 1
-            continue
-
-        request_id = f"talena-{process.id}-{candidate.id}-{uuid.uuid4().hex}"
-
-        payload = {
-            "request_id": request_id,
-            "candidate_id": str(candidate.id),
-            "first_name": candidate.first_name,
-            "last_name": candidate.last_name,
-            "email": candidate.email,
-            "language": "sv",
-            "job_title": process.job_title or "Assessment",
-            "job_number": f"talena-{process.id}",
-            "meta_data": {
-                "talena_process_id": str(process.id),
-                "talena_candidate_id": str(candidate.id),
-                "talena_user_id": str(actor_user.id),
-                "talena_request_id": request_id,
-                "talena_context": context,
+
+def _resolve_invitation_templates(process, languages):
+    """
+    Load the active invitation templates for a process once per send,
+    keyed by language.
+    """
+
+    return {
+        template.language: template
+        for template in EmailTemplate.objects.filter(
+            process=process,
+            template_type="invitation",
+            language__in=list(languages),
+            is_active=True,
+        )
+    }
+
+
+def _build_order_payload(*, process, candidate, actor_user, request_id, context, lang):
+    return {
+        "request_id": request_id,
+        "candidate_id": str(candidate.id),
+        "first_name": candidate.first_name,
+        "last_name": candidate.last_name,
+        "email": candidate.email,
+        "language": lang,
+        "job_title": process.job_title or "Assessment",
+        "job_number": f"talena-{process.id}",
+        "meta_data": {
+            "talena_process_id": str(process.id),
+            "talena_candidate_id": str(candidate.id),
+            "talena_user_id": str(actor_user.id),
+            "talena_request_id": request_id,
+            "talena_context": context,
+        },
+    }
+
+
+def _order_one(client, project_code, payload):
+    """
+    Runs in a worker thread. Only talks to Sova; no database access.
+    """
+
+    resp = client.order_assessment(project_code, payload)
+    test_url = (resp or {}).get("url")
+
+    if not test_url:
+        raise ValueError("SOVA returnerade ingen url")
+
+    return resp, test_url
+
+
+class _SendRun:
+    """
+    State for one run of the bulk-send engine over one process.
+    """
+
+    def __init__(
+        self,
+        *,
+        process,
+        actor_user,
+        context,
+        lang="sv",
+        on_progress=None,
+        previous_results=None,
+    ):
+        self.process = process
+        self.actor_user = actor_user
+        self.context = context
+        self.lang = lang
+        self.on_progress = on_progress
+
+        # Results of an earlier run of the same job, when resuming.
+        self.previous_results = previous_results or {}
+
+        self.results = {}
+        self.templates = _resolve_invitation_templates(process, [lang])
+        self.sova_project_id = _find_sova_project_id(process)
+
+        self.sender_full_name = (
+            actor_user.get_full_name().strip()
+            or actor_user.first_name
+            or actor_user.email
+        )
+
+    def _fail(self, inv, error):
+        previous = self.results.get(str(inv.id)) or {}
+
+        self.results[str(inv.id)] = {
+            "status": "failed",
+            "email": inv.candidate.email,
+            "error": str(error),
+            # A failure after the Sova order keeps the order, so a resume
+            # does not order again.
+            **{
+                key: previous[key]
+                for key in ("ordered", "email_log_id")
+                if key in previous
             },
         }
 
-        try:
-            resp = client.order_assessment(process.project_code, payload)
-            test_url = (resp or {}).get("url")
-
-            if not test_url:
-                # du kan välja att fortsätta utan mail här, men det är bättre att faila tydligt
-                raise ValueError("SOVA returnerade ingen url")
-
-            # --- Email template (samma som kund) ---
-            lang = "sv"
-            template = (
-                EmailTemplate.objects
-                .filter(
-                    process=process,
-                    template_type="invitation",
-                    language=lang,
-                    is_active=True,
-                )
-                .first()
+    def _render_email(self, inv, test_url):
+        candidate = inv.candidate
+        template = self.templates.get(self.lang)
+
+        subject_tpl = template.subject if template else DEFAULT_SUBJECT
+        body_tpl = template.body if template else DEFAULT_BODY
+
+        ctx = {
+            "first_name": candidate.first_name or "",
+            "last_name": candidate.last_name or "",
+            "email": candidate.email or "",
+            "process_name": self.process.name or "",
+            "job_title": self.process.job_title or "",
+            "job_location": self.process.job_location or "",
+            "assessment_url": test_url or "",
+            "sender_first_name": self.actor_user.first_name or "",
+            "sender_last_name": self.actor_user.last_name or "",
+            "sender_full_name": self.sender_full_name,
+        }
+
+        return (
+            render_placeholders(subject_tpl, ctx),
+            render_placeholders(body_tpl, ctx),
+        )
+
+    def _record_orders(self, ordered):
+        """
+        Save the Sova orders of a chunk before any email goes out.
+
+        Returns (to_mail, mailed): (item, EmailLog) pairs to send now,
+        and pairs an earlier run of the job already sent, or may have
+        sent before it stopped. Those are not mailed again.
+        """
+
+        previous_log_ids = {
+            (self.results.get(str(inv.id)) or {}).get("email_log_id")
+            for inv, *_ in ordered
+        }
+        previous_logs = EmailLog.objects.in_bulk(
+            [log_id for log_id in previous_log_ids if log_id]
+        )
+
+        to_mail = []
+        mailed = []
+
+        for item in ordered:
+            inv, request_id, resp, test_url = item
+
+            inv.sova_payload = resp
+            inv.request_id = request_id
+            inv.assessment_url = test_url
+
+            if self.sova_project_id is not None:
+                inv.sova_project_id = self.sova_project_id
+
+            email_log = previous_logs.get(
+                (self.results.get(str(inv.id)) or {}).get("email_log_id")
             )
 
-            subject_tpl = template.subject if template else "Ditt test"
-            body_tpl = template.body if template else (
-                "Hej {first_name}!\n\n"
-                "Klicka på länken för att starta testet:\n"
-                "{assessment_url}\n\n"
-                "Vänliga hälsningar,\n"
-                "Talena"
+            if email_log is not None and email_log.status in ("queued", "sent"):
+                mailed.append((item, email_log))
+                continue
+
+            subject, body = self._render_email(inv, test_url)
+            to_mail.append(
+                (
+                    item,
+                    EmailLog(
+                        invitation=inv,
+                        template_type="invitation",
+                        to_email=inv.candidate.email,
+                        subject=subject,
+                        body_snapshot=body,
+                        status="queued",
+                    ),
+                )
             )
 
-            sender_full_name = actor_user.get_full_name().strip() or actor_user.first_name or actor_user.email
-
-            ctx = {
-                "first_name": candidate.first_name or "",
-                "last_name": candidate.last_name or "",
-                "email": candidate.email or "",
-                "process_name": process.name or "",
-                "job_title": process.job_title or "",
-                "job_location": process.job_location or "",
-                "assessment_url": test_url or "",
-                "sender_first_name": actor_user.first_name or "",
-                "sender_last_name": actor_user.last_name or "",
-                "sender_full_name": sender_full_name,
-            }
+        order_fields = [
+            "sova_payload",
+            "request_id",
+            "assessment_url",
+        ]
+
+        if self.sova_project_id is not None:
+            order_fields.append("sova_project_id")
 
-            subject = render_placeholders(subject_tpl, ctx)
-            body = render_placeholders(body_tpl, ctx)
-
- 
-            email_log = EmailLog.objects.create(
-                invitation=inv,
-                template_type="invitation",
-                to_email=candidate.email,
-                subject=subject,
-                body_snapshot=body,
-                status="queued",
+        with transaction.atomic():
+            EmailLog.objects.bulk_create(
+                [email_log for _item, email_log in to_mail]
             )
 
-            customer_user = actor_user
-            customer_display_name = (
-                customer_user.get_full_name().strip()
-                or customer_user.first_name
-                or customer_user.email
+            TestInvitation.objects.bulk_update(
+                [item[0] for item in ordered],
+                order_fields,
             )
 
-            from_email = f"{customer_display_name} via Talena <no-reply@talena.se>"
+            for (inv, *_), email_log in to_mail + mailed:
+                self.results[str(inv.id)] = {
+                    "status": "ordered",
+                    "email": inv.candidate.email,
+                    "ordered": True,
+                    "email_log_id": email_log.id,
+                }
+
+            # The job row records the orders in the same transaction.
+            self.report_progress()
 
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=body,
-                from_email=from_email,
-                to=[candidate.email],
-                reply_to=[customer_user.email],
+        return to_mail, mailed
+
+    def write_chunk(self, ordered):
+        """
+        Mail and persist a chunk of successfully ordered invitations.
+
+        ordered: list of (inv, request_id, resp, test_url).
+        """
+
+        if not ordered:
+            return
+
+        process = self.process
+        actor_user = self.actor_user
+
+        to_mail, mailed = self._record_orders(ordered)
+        email_logs = [email_log for _item, email_log in to_mail]
+
+        if mailed:
+            logger.info(
+                "Bulk send for process %s: %s invitation(s) were mailed by an earlier run",
+                process.id,
+                len(mailed),
             )
 
+        from_email = f"{self.sender_full_name} via Talena <no-reply@talena.se>"
+
+        delivered = list(mailed)
+
+        if to_mail:
+            # En SMTP-anslutning för hela chunken
+            mail_connection = get_connection()
+
             try:
-                msg.send()
-                email_log.mark_sent()
+                mail_connection.open()
             except Exception as e:
-                email_log.mark_failed(str(e))
-                raise
-            
-            # --- Update invitation ---
-
-            sent_at = timezone.now()
+                logger.exception("Could not open mail connection")
+                for (inv, *_), email_log in to_mail:
+                    email_log.status = "failed"
+                    email_log.error = str(e)
+                    self._fail(inv, e)
+                to_mail = []
 
+            try:
+                for item, email_log in to_mail:
+                    inv = item[0]
+                    msg = EmailMultiAlternatives(
+                        subject=email_log.subject,
+                        body=email_log.body_snapshot,
+                        from_email=from_email,
+                        to=[inv.candidate.email],
+                        reply_to=[actor_user.email],
+                        connection=mail_connection,
+                    )
+
+                    try:
+                        msg.send()
+                        email_log.status = "sent"
+                        email_log.sent_at = timezone.now()
+                        delivered.append((item, email_log))
+                    except Exception as e:
+                        email_log.status = "failed"
+                        email_log.error = str(e)
+                        self._fail(inv, e)
+            finally:
+                mail_connection.close()
+
+        sent_at = timezone.now()
+        invitations = []
+        events = []
+
+        for (inv, request_id, resp, test_url), email_log in delivered:
             inv.status = "sent"
             inv.invited_at = sent_at
             inv.invited_by = actor_user
-            inv.sova_payload = resp
-            inv.request_id = request_id
-            inv.assessment_url = test_url
 
-            update_fields = [
-                "status",
-                "invited_at",
-                "invited_by",
-                "sova_payload",
-                "request_id",
-                "assessment_url",
-            ]
-
-            log_event(
-                company=process.company,
-                verb=ActivityEvent.Verb.INVITE_SENT,
-                actor=actor_user,
-                process=process,
-                candidate=inv.candidate,
-                invitation=inv,
-                meta={
-                    "context": context,
-                    "email_log_id": email_log.id,
-                }
+            invitations.append(inv)
+
+            events.append(
+                ActivityEvent(
+                    company=process.company,
+                    verb=ActivityEvent.Verb.INVITE_SENT,
+                    actor=actor_user,
+                    actor_name="",
+                    process=process,
+                    candidate=inv.candidate,
+                    invitation=inv,
+                    meta={
+                        "context": self.context,
+                        "email_log_id": email_log.id,
+                    },
+                )
             )
 
-            # om du har fältet på modellen
-            if hasattr(inv, "sova_project_id") and sova_project_id is not None:
-                inv.sova_project_id = sova_project_id
-                update_fields.append("sova_project_id")
+        with transaction.atomic():
+            EmailLog.objects.bulk_update(
+                email_logs,
+                ["status", "sent_at", "error"],
+            )
 
-            inv.save(update_fields=update_fields)
+            if invitations:
+                TestInvitation.objects.bulk_update(
+                    invitations,
+                    [
+                        "status",
+                        "invited_at",
+                        "invited_by",
+                    ],
+                )
 
-            register_sent_assessments(
-                invitation=inv,
-                sent_by=actor_user,
-                sent_at=sent_at,
-                sova_request_id=request_id,
-            )
+                if process.company_id:
+                    ActivityEvent.objects.bulk_create(events)
+
+                register_sent_assessments_bulk(
+                    invitations=invitations,
+                    sent_by=actor_user,
+                    sent_at=sent_at,
+                )
+
+        for inv in invitations:
+            self.results[str(inv.id)] = {
+                "status": "sent",
+                "email": inv.candidate.email,
+            }
+
+    def run(self, invitations):
+        from apps.core.integrations.sova import SovaClient  # justera import
+
+        to_order = []
+        already_ordered = []
+
+        for inv in invitations:
+            if inv.status in ALREADY_SENT_STATUSES:
+                self.results[str(inv.id)] = {
+                    "status": "skipped",
+                    "email": inv.candidate.email,
+                }
+                continue
+
+            previous = self.previous_results.get(str(inv.id)) or {}
+
+            if previous.get("ordered") and inv.request_id and inv.assessment_url:
+                # Ordered by an earlier run that stopped before the
+                # invitation was recorded as sent: reuse the order.
+                self.results[str(inv.id)] = dict(previous)
+                already_ordered.append(
+                    (inv, inv.request_id, inv.sova_payload, inv.assessment_url)
+                )
+                continue
+
+            to_order.append(inv)
+
+        self.report_progress()
+
+        self._write_buffer(already_ordered)
+
+        if not to_order:
+            return self.results
 
-            sent_count += 1
+        client = SovaClient()
+        max_workers = max(1, min(_order_concurrency(), len(to_order)))
+        chunk_size = getattr(settings, "BULK_SEND_WRITE_CHUNK_SIZE", DEFAULT_WRITE_CHUNK_SIZE)
 
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sova-order") as executor:
+            futures = {}
+
+            for inv in to_order:
+                request_id = f"talena-{self.process.id}-{inv.candidate.id}-{uuid.uuid4().hex}"
+                payload = _build_order_payload(
+                    process=self.process,
+                    candidate=inv.candidate,
+                    actor_user=self.actor_user,
+                    request_id=request_id,
+                    context=self.context,
+                    lang=self.lang,
+                )
+                future = executor.submit(
+                    _order_one,
+                    client,
+                    self.process.project_code,
+                    payload,
+                )
+                futures[future] = (inv, request_id)
+
+            buffer = []
+
+            for future in as_completed(futures):
+                inv, request_id = futures[future]
+
+                try:
+                    resp, test_url = future.result()
+                except Exception as e:
+                    self._fail(inv, e)
+                    self.report_progress()
+                    continue
+
+                buffer.append((inv, request_id, resp, test_url))
+
+                if len(buffer) >= chunk_size:
+                    self._write_buffer(buffer)
+                    buffer = []
+
+            self._write_buffer(buffer)
+
+        return self.results
+
+    def _write_buffer(self, buffer):
+        if not buffer:
+            return
+
+        try:
+            self.write_chunk(buffer)
         except Exception as e:
-            # Låt viewn hantera messages per kandidat om du vill,
-            # men här returnerar vi fel-lista istället (enklare att återanvända).
-            # Vi lägger felet på invitation-objektet temporärt:
-            inv._send_error = str(e)
+            # Sova har tagit emot ordern men vi kunde inte spara den
+            logger.exception("Bulk send chunk failed for process %s", self.process.id)
+            for inv, *_ in buffer:
+                if (self.results.get(str(inv.id)) or {}).get("status") != "sent":
+                    self._fail(inv, e)
+
+        self.report_progress()
+
+    def report_progress(self):
+        if self.on_progress:
+            self.on_progress(self.results)
+
+
+def _summarise(results):
+    counts = {"sent": 0, "skipped": 0, "failed": 0}
+
+    for result in results.values():
+        status = result.get("status")
+        if status in counts:
+            counts[status] += 1
+
+    return counts
+
+
+def send_assessments_and_emails(*, process, invitations, actor_user, context="customer", on_progress=None):
+    """
+    Skickar tester i SOVA + mailar kandidaten med samma mall som kundflödet.
+    Används av både kund och admin.
+
+    context: "customer" eller "admin" (sparas i meta_data).
+
+    Sova-beställningarna körs parallellt (SOVA_ORDER_CONCURRENCY) och
+    mejl, EmailLog, ActivityEvent och AssessmentUsage skrivs i bulk per
+    chunk. on_progress(results) anropas efter varje chunk.
+    """
+    invitations = list(invitations)
+
+    for inv in invitations:
+        # candidate behövs för varje rad; undvik N+1 om anroparen glömt select_related
+        inv.candidate  # noqa: B018
+
+    run = _SendRun(
+        process=process,
+        actor_user=actor_user,
+        context=context,
+        on_progress=on_progress,
+    )
+    results = run.run(invitations)
+    counts = _summarise(results)
 
     return {
-        "sent_count": sent_count,
-        "skipped_count": skipped_count,
+        "sent_count": counts["sent"],
+        "skipped_count": counts["skipped"],
         "errors": [
-            {"invitation_id": inv.id, "email": inv.candidate.email, "error": getattr(inv, "_send_error", None)}
-            for inv in invitations
-            if getattr(inv, "_send_error", None)
+            {
+                "invitation_id": int(invitation_id),
+                "email": result.get("email"),
+                "error": result.get("error"),
+            }
+            for invitation_id, result in results.items()
+            if result.get("status") == "failed"
+        ],
+    }
+
+
+# ------------------------------------------------------------
+# Bulk-send jobs (progress + resume)
+# ------------------------------------------------------------
+
+def create_send_job(*, process, invitation_ids, actor_user, context="customer"):
+    invitation_ids = sorted({int(invitation_id) for invitation_id in invitation_ids})
+
+    return BulkSendJob.objects.create(
+        process=process,
+        created_by=actor_user,
+        context=context,
+        invitation_ids=invitation_ids,
+        total=len(invitation_ids),
+    )
+
+
+def _save_job_progress(job, results):
+    job.results.update(results)
+    counts = _summarise(job.results)
+
+    job.sent_count = counts["sent"]
+    job.skipped_count = counts["skipped"]
+    job.failed_count = counts["failed"]
+    job.heartbeat_at = timezone.now()
+
+    job.save(
+        update_fields=[
+            "results",
+            "sent_count",
+            "skipped_count",
+            "failed_count",
+            "heartbeat_at",
         ]
+    )
+
+
+@contextmanager
+def _job_heartbeat(job):
+    """
+    Renew the job's heartbeat from a background thread while the block
+    runs, so slow Sova orders do not make a healthy job look stale.
+    """
+
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(JOB_HEARTBEAT_INTERVAL):
+                BulkSendJob.objects.filter(
+                    pk=job.pk,
+                    status=BulkSendJob.Status.RUNNING,
+                ).update(
+                    heartbeat_at=timezone.now(),
+                )
+        except Exception:
+            logger.exception("Bulk send job %s: heartbeat failed", job.id)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(
+        target=beat,
+        name=f"bulk-send-heartbeat-{job.id}",
+        daemon=True,
+    )
+    thread.start()
+
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_send_job(job):
+    """
+    Run (or resume) a BulkSendJob in the current thread.
+
+    Only invitations without a "sent" or "skipped" result are handled,
+    so calling this again after a partial failure retries just the
+    failed or unprocessed candidates. Invitations that were ordered
+    from Sova in an earlier run are not ordered again.
+
+    Resume a job only after claim_send_job() returned True.
+    """
+
+    job.status = BulkSendJob.Status.RUNNING
+    job.started_at = job.started_at or timezone.now()
+    job.heartbeat_at = timezone.now()
+    job.finished_at = None
+    job.error = ""
+    job.save(update_fields=["status", "started_at", "heartbeat_at", "finished_at", "error"])
+
+    try:
+        invitations = (
+            TestInvitation.objects
+            .filter(
+                process=job.process,
+                id__in=job.pending_invitation_ids(),
+            )
+            .select_related("candidate", "process", "process__company", "process__org_unit")
+            .order_by("id")
+        )
+
+        run = _SendRun(
+            process=job.process,
+            actor_user=job.created_by,
+            context=job.context,
+            on_progress=lambda results: _save_job_progress(job, results),
+            previous_results=dict(job.results),
+        )
+
+        with _job_heartbeat(job):
+            run.run(invitations)
+
+    except Exception as e:
+        logger.exception("Bulk send job %s failed", job.id)
+        job.status = BulkSendJob.Status.FAILED
+        job.error = str(e)
+    else:
+        job.status = (
+            BulkSendJob.Status.COMPLETED_WITH_ERRORS
+            if job.failed_count
+            else BulkSendJob.Status.COMPLETED
+        )
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at"])
+
+    return job
+
+
+def _run_send_job_in_thread(job_id):
+    try:
+        job = BulkSendJob.objects.select_related("process", "created_by").get(pk=job_id)
+        run_send_job(job)
+    except Exception:
+        logger.exception("Bulk send job %s crashed", job_id)
+    finally:
+        connections.close_all()
+
+
+def start_send_job(job):
+    """
+    Start a job in a background thread so the HTTP request can return
+    immediately. Progress is polled from the job row. A job whose
+    thread dies is picked up again by resume_send_jobs.
+    """
+
+    thread = threading.Thread(
+        target=_run_send_job_in_thread,
+        args=(job.id,),
+        name=f"bulk-send-{job.id}",
+        daemon=True,
+    )
+
+    # Starta först när jobbraden är committad
+    transaction.on_commit(thread.start)
+
+    return job
+
+
+def is_job_stale(job, now=None):
+    now = now or timezone.now()
+
+    if job.status == BulkSendJob.Status.QUEUED:
+        # heartbeat_at is set when a resume claims the job.
+        return (job.heartbeat_at or job.created_at) < now - STALE_JOB_AFTER
+
+    if job.status == BulkSendJob.Status.RUNNING:
+        return (job.heartbeat_at or job.created_at) < now - STALE_JOB_AFTER
+
+    return False
+
+
+def can_resume_job(job, now=None):
+    return (
+        job.status in {
+            BulkSendJob.Status.COMPLETED_WITH_ERRORS,
+            BulkSendJob.Status.FAILED,
+        }
+        or is_job_stale(job, now=now)
+    )
+
+
+def claim_send_job(job):
+    """
+    Take over a resumable job for one runner.
+
+    The job row is claimed with one conditional UPDATE on the status and
+    heartbeat this caller saw. When two resumes race (a double click, or
+    resume_send_jobs next to a click on the page) only one of them
+    changes the row; the other gets False and must not run the job.
+    """
+
+    now = timezone.now()
+
+    if not can_resume_job(job, now=now):
+        return False
+
+    claimed = BulkSendJob.objects.filter(
+        pk=job.pk,
+        status=job.status,
+        heartbeat_at=job.heartbeat_at,
+    ).update(
+        status=BulkSendJob.Status.QUEUED,
+        heartbeat_at=now,
+    )
+
+    if claimed != 1:
+        return False
+
+    job.status = BulkSendJob.Status.QUEUED
+    job.heartbeat_at = now
+
+    return True
+
+
+def serialize_send_job(job):
+    return {
+        "id": job.id,
+        "status": job.status,
+        "status_label": job.get_status_display(),
+        "total": job.total,
+        "processed": job.processed_count,
+        "sent": job.sent_count,
+        "skipped": job.skipped_count,
+        "failed": job.failed_count,
+        "is_finished": job.is_finished,
+        "can_resume": can_resume_job(job),
+        "errors": job.errors(),
+        "error": job.error,
     }
+
+
+def get_visible_send_job(process, now=None):
+    """
+    The bulk send shown on the process page: the latest job while it is
+    running, recently finished, or waiting to be resumed.
+    """
+
+    now = now or timezone.now()
+    job = process.bulk_send_jobs.order_by("-created_at").first()
+
+    if not job:
+        return None
+
+    if not job.is_finished or can_resume_job(job):
+        return job
+
+    if job.finished_at and job.finished_at >= now - timedelta(minutes=10):
+        return job
+
+    return None
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.ai.prompt_templates import clear_ai_prompt_cache
+
+from .models import AIPromptTemplate
+
+
+@receiver(post_save, sender=AIPromptTemplate)
+@receiver(post_delete, sender=AIPromptTemplate)
+def clear_prompt_cache_on_change(sender, instance: AIPromptTemplate, **kwargs):
+    # Other workers pick the change up from the table fingerprint
+    # within AI_PROMPT_CACHE_CHECK_SECONDS.
+    clear_ai_prompt_cache()
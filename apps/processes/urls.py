@@ -23,6 +23,11 @@ urlpatterns = [
         name="remove_candidate_from_process",
     ),
     path("<int:pk>/send-tests/", views.process_send_tests, name="process_send_tests"),
+    path("<int:pk>/send-jobs/<int:job_id>/", views.process_send_job_status, name="process_send_job_status"),
+    path("<int:pk>/send-jobs/<int:job_id>/resume/", views.process_send_job_resume, name="process_send_job_resume"),
+    path("<int:pk>/ai-regeneration/", views.process_ai_regeneration_start, name="process_ai_regeneration_start"),
+    path("<int:pk>/ai-regeneration/<int:run_id>/", views.process_ai_regeneration_status, name="process_ai_regeneration_status"),
+    path("<int:process_id>/ai-jobs/<int:job_id>/", views.process_ai_generation_job, name="process_ai_generation_job"),
     path("<int:pk>/invitation-statuses/", views.process_invitation_statuses, name="process_invitation_statuses"),
     path("<int:pk>/archive/", views.process_archive, name="process_archive"),
     path("<int:pk>/unarchive/", views.process_unarchive, name="process_unarchive"),
@@ -290,6 +295,28 @@ urlpatterns = [
             "ai_update_plan"
         ),
     ),
+    path(
+        (
+            "<int:process_id>/candidate/"
+            "<int:candidate_id>/ai-insights/update-runs/"
+        ),
+        views.process_candidate_global_ai_update_start,
+        name=(
+            "process_candidate_global_"
+            "ai_update_start"
+        ),
+    ),
+    path(
+        (
+            "<int:process_id>/candidate/"
+            "<int:candidate_id>/ai-insights/update-runs/<int:run_id>/"
+        ),
+        views.process_candidate_global_ai_update_run,
+        name=(
+            "process_candidate_global_"
+            "ai_update_run"
+        ),
+    ),
     path(
         (
             "<int:process_id>/candidates/"
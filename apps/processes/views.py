@@ -1,6 +1,7 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
 from apps.core.integrations.sova import SovaClient
+from apps.projects.services.sova_catalogue import get_sova_accounts_with_projects
 from apps.projects.models import ProjectMeta
 from .forms import TestProcessCreateForm, CandidateCreateForm
 from .models import (
@@ -10,6 +11,10 @@ from .models import (
     SelfRegistration,
     ProcessLabel,
     HistoricalProcessCandidate,
+    BulkSendJob,
+    AIGenerationJob,
+    AIUpdateRun,
+    AIRegenerationRun,
 )
 from .purpose_utils import normalize_purpose_key
 from apps.reports.services.candidate_insights import (
@@ -150,9 +155,48 @@ from datetime import datetime, date, time
 from django.http import HttpResponse
 from apps.accounts.utils.permissions import filter_by_user_accounts, user_can_access_account
 from apps.accounts.utils.org_access import get_effective_orgunit_permissions, user_can_view_process, user_can_edit_process, get_company_for_user
-from django.http import HttpResponseForbidden
-
-from apps.processes.services.send_tests import send_assessments_and_emails
+from django.http import HttpResponseForbidden, Http404
+
+from apps.processes.services.send_tests import (
+    can_resume_job,
+    claim_send_job,
+    create_send_job,
+    get_visible_send_job,
+    run_send_job,
+    serialize_send_job,
+    start_send_job,
+)
+from apps.processes.services.ai_update_plan import (
+    build_candidate_ai_update_state,
+    build_global_ai_update_plan,
+)
+from apps.processes.services.ai_update_runs import (
+    create_update_run,
+    expire_update_run,
+    get_active_update_run,
+    is_update_run_stale,
+    serialize_update_run,
+    start_update_run,
+)
+from apps.processes.services.ai_generation_jobs import (
+    generation_response,
+    read_generation_job,
+    regenerate_stream_url,
+    resume_or_reclaim_generation,
+    serialize_generation_job,
+)
+from apps.processes.services.ai_content_variants import (
+    discard_ai_content_variants,
+)
+from apps.processes.services.ai_regeneration_runs import (
+    create_regeneration_run,
+    get_visible_regeneration_run,
+    outdated_invitations,
+    resume_regeneration_run,
+    schedule_process_regeneration,
+    serialize_regeneration_run,
+    start_regeneration_run,
+)
 from .purpose_context_config import get_purpose_context_config
 
 import json
@@ -2354,348 +2398,6 @@ def build_candidate_final_output(
         "has_content": has_content,
     }
 
-def build_candidate_ai_update_state(
-    *,
-    invitation,
-    process,
-    purpose_context=None,
-):
-    """
-    Build the shared update state for AI-generated candidate insights.
-
-    The global update banner should appear when existing AI content
-    was created using an earlier process purpose or context.
-
-    Sections that have never been generated are not included.
-    Historical candidates are not connected to global regeneration yet.
-    """
-
-    empty_state = {
-        "has_outdated_insights": False,
-        "sections": [],
-        "section_count": 0,
-        "purpose_changed": False,
-        "context_changed": False,
-    }
-
-    if getattr(
-        process,
-        "is_historical",
-        False,
-    ):
-        return empty_state
-
-    current_purpose = normalize_purpose_key(
-        getattr(
-            process,
-            "purpose",
-            "",
-        )
-        or ""
-    )
-
-    context_updated_at = getattr(
-        purpose_context,
-        "updated_at",
-        None,
-    )
-
-    section_config = [
-        {
-            "key": "overview",
-            "label": "AI Summary",
-            "result_field": "ai_purpose_fit",
-            "status_field": "ai_purpose_fit_status",
-            "generated_at_field": (
-                "ai_purpose_fit_generated_at"
-            ),
-            "purpose_field": (
-                "ai_purpose_fit_purpose"
-            ),
-        },
-        {
-            "key": "response_style_guidance",
-            "label": "Response-style guidance",
-            "result_field": (
-                "ai_response_style_guidance"
-            ),
-            "status_field": (
-                "ai_response_style_guidance_status"
-            ),
-            "generated_at_field": (
-                "ai_response_style_guidance_generated_at"
-            ),
-            "purpose_field": (
-                "ai_response_style_guidance_purpose"
-            ),
-        },
-        {
-            "key": "personality_interpretation",
-            "label": "Personality interpretation",
-            "result_field": (
-                "ai_personality_interpretation"
-            ),
-            "status_field": (
-                "ai_personality_interpretation_status"
-            ),
-            "generated_at_field": (
-                "ai_personality_interpretation_generated_at"
-            ),
-            "purpose_field": (
-                "ai_personality_interpretation_purpose"
-            ),
-        },
-        {
-            "key": "personality_questions",
-            "label": "Personality questions",
-            "result_field": (
-                "ai_personality_questions"
-            ),
-            "status_field": (
-                "ai_personality_questions_status"
-            ),
-            "generated_at_field": (
-                "ai_personality_questions_generated_at"
-            ),
-            "purpose_field": (
-                "ai_personality_questions_purpose"
-            ),
-        },
-        {
-            "key": "motivation_interpretation",
-            "label": "Motivation interpretation",
-            "result_field": (
-                "ai_motivation_interpretation"
-            ),
-            "status_field": (
-                "ai_motivation_interpretation_status"
-            ),
-            "generated_at_field": (
-                "ai_motivation_interpretation_generated_at"
-            ),
-            "purpose_field": (
-                "ai_motivation_interpretation_purpose"
-            ),
-        },
-        {
-            "key": "motivation_questions",
-            "label": "Motivation questions",
-            "result_field": (
-                "ai_motivation_questions"
-            ),
-            "status_field": (
-                "ai_motivation_questions_status"
-            ),
-            "generated_at_field": (
-                "ai_motivation_questions_generated_at"
-            ),
-            "purpose_field": (
-                "ai_motivation_questions_purpose"
-            ),
-        },
-        {
-            "key": "cognitive_interpretation",
-            "label": "Cognitive interpretation",
-            "result_field": (
-                "ai_cognitive_interpretation"
-            ),
-            "status_field": (
-                "ai_cognitive_interpretation_status"
-            ),
-            "generated_at_field": (
-                "ai_cognitive_interpretation_generated_at"
-            ),
-            "purpose_field": (
-                "ai_cognitive_interpretation_purpose"
-            ),
-        },
-        {
-            "key": "cognitive_questions",
-            "label": "Cognitive questions",
-            "result_field": (
-                "ai_cognitive_questions"
-            ),
-            "status_field": (
-                "ai_cognitive_questions_status"
-            ),
-            "generated_at_field": (
-                "ai_cognitive_questions_generated_at"
-            ),
-            "purpose_field": (
-                "ai_cognitive_questions_purpose"
-            ),
-        },
-        {
-            "key": "pre_interview_decision_support",
-            "label": "Pre-interview decision support",
-            "result_field": (
-                "ai_pre_interview_decision_support"
-            ),
-            "status_field": (
-                "ai_pre_interview_decision_support_status"
-            ),
-            "generated_at_field": (
-                "ai_pre_interview_decision_support_generated_at"
-            ),
-            "purpose_field": (
-                "ai_pre_interview_decision_support_purpose"
-            ),
-        },
-        {
-            "key": "post_interview_decision_support",
-            "label": "Post-interview decision support",
-            "result_field": (
-                "ai_post_interview_decision_support"
-            ),
-            "status_field": (
-                "ai_post_interview_decision_support_status"
-            ),
-            "generated_at_field": (
-                "ai_post_interview_decision_support_generated_at"
-            ),
-            "purpose_field": (
-                "ai_post_interview_decision_support_purpose"
-            ),
-        },
-    ]
-
-    analysed_sections = []
-
-    has_confirmed_process_change = False
-    has_purpose_change = False
-    has_context_change = False
-
-    for config in section_config:
-        saved_result = getattr(
-            invitation,
-            config["result_field"],
-            None,
-        )
-
-        # Do not include AI sections that have never been generated.
-        if not saved_result:
-            continue
-
-        status = str(
-            getattr(
-                invitation,
-                config["status_field"],
-                "",
-            )
-            or ""
-        ).strip().lower()
-
-        generated_at = getattr(
-            invitation,
-            config["generated_at_field"],
-            None,
-        )
-
-        purpose_field = config.get(
-            "purpose_field"
-        )
-
-        saved_purpose = ""
-
-        if purpose_field:
-            raw_saved_purpose = getattr(
-                invitation,
-                purpose_field,
-                "",
-            )
-
-            if raw_saved_purpose:
-                saved_purpose = (
-                    normalize_purpose_key(
-                        raw_saved_purpose
-                    )
-                )
-
-        purpose_changed = bool(
-            saved_purpose
-            and current_purpose
-            and saved_purpose != current_purpose
-        )
-
-        context_changed = bool(
-            context_updated_at
-            and generated_at
-            and context_updated_at > generated_at
-        )
-
-        if purpose_changed:
-            has_confirmed_process_change = True
-            has_purpose_change = True
-
-        if context_changed:
-            has_confirmed_process_change = True
-            has_context_change = True
-
-        analysed_sections.append({
-            **config,
-            "status": status,
-            "purpose_changed": purpose_changed,
-            "context_changed": context_changed,
-        })
-
-    # Do not show the global process-information banner merely because
-    # a section became outdated for another reason, such as changed
-    # interview notes or changed personality-trait selection.
-    if not has_confirmed_process_change:
-        return empty_state
-
-    outdated_sections = []
-
-    for section in analysed_sections:
-        needs_update = bool(
-            section["status"] == "outdated"
-            or section["purpose_changed"]
-            or section["context_changed"]
-        )
-
-        if not needs_update:
-            continue
-
-        reasons = []
-
-        if section["purpose_changed"]:
-            reasons.append(
-                "purpose"
-            )
-
-        if section["context_changed"]:
-            reasons.append(
-                "context"
-            )
-
-        if (
-            section["status"] == "outdated"
-            and not reasons
-        ):
-            reasons.append(
-                "dependent_content"
-            )
-
-        outdated_sections.append({
-            "key": section["key"],
-            "label": section["label"],
-            "status": section["status"],
-            "reasons": reasons,
-        })
-
-    return {
-        "has_outdated_insights": bool(
-            outdated_sections
-        ),
-        "sections": outdated_sections,
-        "section_count": len(
-            outdated_sections
-        ),
-        "purpose_changed": has_purpose_change,
-        "context_changed": has_context_change,
-    }
-
-
 def build_candidate_detail_context(
     process,
     invitation,
@@ -3684,6 +3386,18 @@ def build_candidate_detail_context(
             },
         ),
 
+        "global_ai_update_start_url": reverse(
+            (
+                "processes:"
+                "process_candidate_global_"
+                "ai_update_start"
+            ),
+            kwargs={
+                "process_id": process.id,
+                "candidate_id": candidate.id,
+            },
+        ),
+
         # Global AI update state
         "candidate_ai_update_state": (
             candidate_ai_update_state
@@ -4228,125 +3942,138 @@ def process_candidate_global_ai_update_plan(
         candidate_id=candidate_id,
     )
 
-    purpose_context = getattr(
-        process,
-        "role_context",
-        None,
-    )
-
-    update_state = (
-        build_candidate_ai_update_state(
-            invitation=invitation,
+    return JsonResponse(
+        build_global_ai_update_plan(
             process=process,
-            purpose_context=purpose_context,
+            invitation=invitation,
         )
     )
 
-    sections = []
 
-    regenerate_route_names = {
-        "overview": (
-            "process_candidate_purpose_fit_regenerate"
-        ),
+@login_required
+@require_POST
+def process_candidate_global_ai_update_start(
+    request,
+    process_id,
+    candidate_id,
+):
+    """
+    Regenerate every outdated AI section on the server.
 
-        "response_style_guidance": (
-            "process_candidate_"
-            "response_style_guidance_regenerate"
-        ),
+    Independent sections run in parallel and decision support waits
+    for the sections it reads. Returns the run, which the candidate
+    sheet polls for per-section progress.
+    """
 
-        "personality_interpretation": (
-            "process_candidate_personality_"
-            "interpretation_regenerate"
-        ),
+    process = get_object_or_404(
+        TestProcess,
+        pk=process_id,
+    )
 
-        "personality_questions": (
-            "process_candidate_personality_"
-            "questions_regenerate"
-        ),
+    if not user_can_access_process(
+        request.user,
+        process,
+    ):
+        return HttpResponseForbidden(
+            "You do not have access to this process."
+        )
 
-        "motivation_interpretation": (
-            "process_candidate_motivation_"
-            "interpretation_regenerate"
-        ),
+    if process.is_historical:
+        return JsonResponse(
+            {
+                "error": (
+                    "Global AI updating is not connected "
+                    "for historical candidates yet."
+                )
+            },
+            status=400,
+        )
 
-        "motivation_questions": (
-            "process_candidate_motivation_"
-            "questions_regenerate"
+    invitation = get_object_or_404(
+        TestInvitation.objects.select_related(
+            "candidate",
+            "process",
         ),
+        process=process,
+        candidate_id=candidate_id,
+    )
 
-        "cognitive_interpretation": (
-            "process_candidate_cognitive_"
-            "interpretation_regenerate"
-        ),
+    running_run = get_active_update_run(invitation)
 
-        "cognitive_questions": (
-            "process_candidate_cognitive_"
-            "questions_regenerate"
-        ),
+    if running_run:
+        return JsonResponse(
+            serialize_update_run(running_run),
+            status=202,
+        )
 
-        "pre_interview_decision_support": (
-            "process_candidate_pre_interview_"
-            "decision_support_regenerate"
-        ),
+    plan = build_global_ai_update_plan(
+        process=process,
+        invitation=invitation,
+    )
 
-        "post_interview_decision_support": (
-            "process_candidate_post_interview_"
-            "decision_support_regenerate"
-        ),
-    }
+    if not plan["sections"]:
+        return JsonResponse(
+            {
+                **plan,
+                "run": None,
+            }
+        )
 
+    run = create_update_run(
+        invitation=invitation,
+        user=request.user,
+        language_code=get_request_ai_language(
+            request
+        ),
+        plan_sections=plan["sections"],
+    )
 
-    sections = []
+    start_update_run(run)
 
-    for section in update_state["sections"]:
-        section_key = section["key"]
+    return JsonResponse(
+        serialize_update_run(run),
+        status=202,
+    )
 
-        route_name = regenerate_route_names.get(
-            section_key
-        )
 
-        if not route_name:
-            continue
+@login_required
+def process_candidate_global_ai_update_run(
+    request,
+    process_id,
+    candidate_id,
+    run_id,
+):
+    process = get_object_or_404(
+        TestProcess,
+        pk=process_id,
+    )
 
-        regenerate_url = reverse(
-            f"processes:{route_name}",
-            kwargs={
-                "process_id": process.id,
-                "candidate_id": candidate_id,
-            },
+    if not user_can_access_process(
+        request.user,
+        process,
+    ):
+        return HttpResponseForbidden(
+            "You do not have access to this process."
         )
 
-        sections.append({
-            "key": section_key,
-            "label": section["label"],
-            "reasons": section["reasons"],
-            "regenerate_url": regenerate_url,
-        })
+    run = get_object_or_404(
+        AIUpdateRun.objects.select_related("invitation"),
+        pk=run_id,
+        process=process,
+        invitation__candidate_id=candidate_id,
+    )
 
-    return JsonResponse(
-        {
-            "ok": True,
-            "has_updates": bool(
-                update_state[
-                    "has_outdated_insights"
-                ]
-            ),
-            "section_count": len(
-                sections
-            ),
-            "sections": sections,
-            "purpose_changed": bool(
-                update_state[
-                    "purpose_changed"
-                ]
-            ),
-            "context_changed": bool(
-                update_state[
-                    "context_changed"
-                ]
-            ),
-        }
+    # Polling a run whose worker stopped would otherwise spin forever.
+    if is_update_run_stale(run):
+        expire_update_run(run)
+        run.refresh_from_db()
+
+    response = JsonResponse(
+        serialize_update_run(run)
     )
+    response["Cache-Control"] = "no-cache"
+
+    return response
 
 
 @login_required
@@ -4423,6 +4150,7 @@ def process_candidate_pre_interview_decision_support_stream(
             "ai_pre_interview_decision_support_status"
         ),
         language_code=language_code,
+        allow_translation=True,
     )
 
     current_status = (
@@ -4504,16 +4232,17 @@ def process_candidate_pre_interview_decision_support_stream(
         return response
 
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "Pre-interview decision support "
-                    "is already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=invitation,
+            section="pre_interview_decision_support",
         )
 
+        if response is not None:
+            return response
+
     invitation.ai_pre_interview_decision_support_status = (
         "generating"
     )
@@ -4621,16 +4350,17 @@ def process_candidate_pre_interview_decision_support_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=invitation,
+        section="pre_interview_decision_support",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 
@@ -4706,16 +4436,18 @@ def process_candidate_pre_interview_decision_support_regenerate(
     return JsonResponse(
         {
             "ok": True,
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_pre_interview_"
-                    "decision_support_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_pre_interview_"
+                        "decision_support_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -4809,6 +4541,7 @@ def process_candidate_post_interview_decision_support_stream(
             "ai_post_interview_decision_support_status"
         ),
         language_code=language_code,
+        allow_translation=True,
     )
 
     current_status = (
@@ -4916,16 +4649,17 @@ def process_candidate_post_interview_decision_support_stream(
         return response
 
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "Post-interview decision support "
-                    "is already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=invitation,
+            section="post_interview_decision_support",
         )
 
+        if response is not None:
+            return response
+
     invitation.ai_post_interview_decision_support_status = (
         "generating"
     )
@@ -5056,16 +4790,17 @@ def process_candidate_post_interview_decision_support_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=invitation,
+        section="post_interview_decision_support",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 @login_required
@@ -5162,16 +4897,18 @@ def process_candidate_post_interview_decision_support_regenerate(
     return JsonResponse(
         {
             "ok": True,
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_post_interview_"
-                    "decision_support_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_post_interview_"
+                        "decision_support_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -5309,6 +5046,11 @@ def process_candidate_interview_notes_update(
         ]
     )
 
+    discard_ai_content_variants(
+        owner=invitation,
+        content_keys=["post_interview_decision_support"],
+    )
+
     return JsonResponse(
         {
             "ok": True,
@@ -5805,11 +5547,10 @@ def get_template_icon_class(tests, title=""):
 
 @login_required
 def process_create(request):
-    client = SovaClient()
     error = None
 
     try:
-        accounts = client.get_accounts_with_projects()
+        accounts = get_sova_accounts_with_projects()
     except Exception as e:
         accounts = []
         error = str(e)
@@ -6031,6 +5772,9 @@ def mark_candidate_ai_content_outdated(process):
         process=process,
     )
 
+    # Stored language variants were generated from the old context.
+    discard_ai_content_variants(process=process)
+
     summary_count = (
         invitations
         .exclude(ai_summary="")
@@ -6135,14 +5879,13 @@ def process_update(request, pk):
     locked = obj.is_template_locked()
     old_purpose = obj.purpose
 
-    client = SovaClient()
     error = None
 
     # --------------------------------------------------
-    # 1. Hämta Sova-projekt från API
+    # 1. Hämta Sova-projekt från den lagrade katalogen
     # --------------------------------------------------
     try:
-        accounts = client.get_accounts_with_projects()
+        accounts = get_sova_accounts_with_projects()
     except Exception as e:
         accounts = []
         error = str(e)
@@ -6348,6 +6091,12 @@ def process_update(request, pk):
                     result,
                 )
 
+                schedule_process_regeneration(
+                    obj,
+                    user=request.user,
+                    language_code=get_request_ai_language(request),
+                )
+
             messages.success(
                 request,
                 "The process was updated."
@@ -6476,6 +6225,12 @@ def process_role_context(request, pk):
                 print("PROCESS:", process.id)
                 print("AI CONTENT MARKED OUTDATED:", result)
 
+                schedule_process_regeneration(
+                    process,
+                    user=request.user,
+                    language_code=get_request_ai_language(request),
+                )
+
             messages.success(
                 request,
                 "The process context was saved."
@@ -6590,6 +6345,7 @@ def process_detail(request, pk):
             .filter(process=process)
             .select_related("candidate", "created_by")
             .prefetch_related("reports")
+            .without_ai_content()
             .order_by("-created_at")
         )
 
@@ -6623,6 +6379,7 @@ def process_detail(request, pk):
         invitations = (
             process.invitations
             .select_related("candidate")
+            .without_ai_content()
             .order_by("-created_at")
         )
 
@@ -6675,6 +6432,20 @@ def process_detail(request, pk):
 
     process_purpose = purpose_lookup.get(process.purpose)
 
+    latest_send_job = get_visible_send_job(process)
+
+    latest_ai_regeneration_run = get_visible_regeneration_run(process)
+    ai_outdated_candidate_count = 0
+
+    if latest_ai_regeneration_run:
+        resume_regeneration_run(latest_ai_regeneration_run)
+
+    if not process.is_historical and (
+        not latest_ai_regeneration_run
+        or latest_ai_regeneration_run.is_finished
+    ):
+        ai_outdated_candidate_count = outdated_invitations(process).count()
+
     context = {
         "process": process,
         "invitations": invitations,
@@ -6697,6 +6468,10 @@ def process_detail(request, pk):
             "not_started": not_started_count,
             "not_invited": not_invited_count,
         },
+        "latest_send_job": latest_send_job,
+        "latest_send_job_can_resume": bool(latest_send_job and can_resume_job(latest_send_job)),
+        "latest_ai_regeneration_run": latest_ai_regeneration_run,
+        "ai_outdated_candidate_count": ai_outdated_candidate_count,
     }
 
     return render(request, "customer/processes/process_detail.html", context)
@@ -7152,41 +6927,167 @@ def process_send_tests(request, pk):
     if not user_can_access_process(request.user, process):
         return HttpResponseForbidden("You do not have access to this process.")
 
-    if request.method != "POST":
-        return redirect("processes:process_detail", pk=process.pk)
+    if request.method != "POST":
+        return redirect("processes:process_detail", pk=process.pk)
+
+    invitation_ids = request.POST.getlist("invitation_ids")
+    if not invitation_ids:
+        messages.warning(request, "Välj minst en kandidat.")
+        return redirect("processes:process_detail", pk=process.pk)
+
+    invitation_ids = list(
+        TestInvitation.objects
+        .filter(process=process, id__in=invitation_ids)
+        .values_list("id", flat=True)
+    )
+
+    job = create_send_job(
+        process=process,
+        invitation_ids=invitation_ids,
+        actor_user=request.user,
+        context="customer",
+    )
+
+    if settings.BULK_SEND_ASYNC:
+        start_send_job(job)
+        messages.info(request, f"Skickar test till {job.total} kandidat(er). Förloppet visas i listan.")
+        return redirect("processes:process_detail", pk=process.pk)
+
+    job = run_send_job(job)
+
+    if job.sent_count:
+        messages.success(request, f"Skickade test till {job.sent_count} kandidat(er).")
+
+    for err in job.errors():
+        messages.error(request, f"Kunde inte skicka till {err['email']}: {err['error']}")
+
+    if job.sent_count == 0:
+        if job.skipped_count:
+            messages.info(request, "Inget skickades (alla markerade var redan skickade/igång/klara).")
+        else:
+            messages.warning(request, "Inget skickades. Kolla felmeddelanden ovan.")
+
+    return redirect("processes:process_detail", pk=process.pk)
+
+
+@login_required
+def process_send_job_status(request, pk, job_id):
+    process = get_object_or_404(TestProcess, pk=pk)
+
+    if not user_can_access_process(request.user, process):
+        return HttpResponseForbidden("You do not have access to this process.")
+
+    job = get_object_or_404(BulkSendJob, pk=job_id, process=process)
+
+    return JsonResponse(serialize_send_job(job))
+
+
+@login_required
+@require_POST
+def process_send_job_resume(request, pk, job_id):
+    process = get_object_or_404(TestProcess, pk=pk)
+
+    company = get_company_for_user(request.user)
+    if not company or process.company_id != company.id:
+        return HttpResponseForbidden("No access.")
+
+    if not user_can_edit_process(request.user, company, process):
+        return HttpResponseForbidden("Du har inte behörighet att skicka tester i denna process.")
+
+    job = get_object_or_404(BulkSendJob, pk=job_id, process=process)
+
+    if not claim_send_job(job):
+        messages.info(request, "Utskicket pågår redan eller är klart.")
+        return redirect("processes:process_detail", pk=process.pk)
+
+    start_send_job(job)
+
+    messages.info(request, f"Försöker igen för {len(job.pending_invitation_ids())} kandidat(er).")
+    return redirect("processes:process_detail", pk=process.pk)
+
+@login_required
+@require_POST
+def process_ai_regeneration_start(request, pk):
+    """
+    Regenerate the outdated AI sections of every candidate in the
+    process in the background, recently viewed candidates first.
+    """
+
+    process = get_object_or_404(TestProcess, pk=pk)
+
+    if process.is_historical:
+        return HttpResponseForbidden("Historical processes are read-only.")
+
+    if not user_can_access_process(request.user, process):
+        return HttpResponseForbidden("You do not have access to this process.")
+
+    run = create_regeneration_run(
+        process=process,
+        user=request.user,
+        language_code=get_request_ai_language(request),
+    )
+
+    if run is None:
+        messages.info(request, "All AI insights in this process are up to date.")
+        return redirect("processes:process_detail", pk=process.pk)
+
+    start_regeneration_run(run)
+
+    messages.info(
+        request,
+        f"Updating AI insights for {run.total} candidate(s). The progress is shown in the list.",
+    )
+    return redirect("processes:process_detail", pk=process.pk)
+
+
+@login_required
+def process_ai_regeneration_status(request, pk, run_id):
+    process = get_object_or_404(TestProcess, pk=pk)
+
+    if not user_can_access_process(request.user, process):
+        return HttpResponseForbidden("You do not have access to this process.")
+
+    run = get_object_or_404(AIRegenerationRun, pk=run_id, process=process)
+
+    response = JsonResponse(serialize_regeneration_run(run))
+    response["Cache-Control"] = "no-cache"
+
+    return response
+
+
+@login_required
+def process_ai_generation_job(request, process_id, job_id):
+    """
+    Poll an AI generation job. Returns the output written after
+    ?offset= and the offset to ask for next.
+    """
+
+    process = get_object_or_404(TestProcess, pk=process_id)
+
+    if not user_can_access_process(request.user, process):
+        return HttpResponseForbidden("You do not have access to this process.")
+
+    try:
+        offset = max(int(request.GET.get("offset") or 0), 0)
+    except ValueError:
+        offset = 0
 
-    invitation_ids = request.POST.getlist("invitation_ids")
-    if not invitation_ids:
-        messages.warning(request, "Välj minst en kandidat.")
-        return redirect("processes:process_detail", pk=process.pk)
+    if not AIGenerationJob.objects.filter(pk=job_id, process=process).exists():
+        raise Http404("AI generation job not found.")
 
-    invitations = (
-        TestInvitation.objects
-        .filter(process=process, id__in=invitation_ids)
-        .select_related("candidate")
-    )
+    job, chunk = read_generation_job(job_id, offset)
 
-    result = send_assessments_and_emails(
-        process=process,
-        invitations=invitations,
-        actor_user=request.user,
-        context="customer",
+    response = JsonResponse(
+        serialize_generation_job(
+            job,
+            offset=offset,
+            chunk=chunk,
+        )
     )
+    response["Cache-Control"] = "no-cache"
 
-    if result["sent_count"]:
-        messages.success(request, f"Skickade test till {result['sent_count']} kandidat(er).")
-
-    if result["errors"]:
-        for err in result["errors"]:
-            messages.error(request, f"Kunde inte skicka till {err['email']}: {err['error']}")
-
-    if result["sent_count"] == 0:
-        if result["skipped_count"]:
-            messages.info(request, "Inget skickades (alla markerade var redan skickade/igång/klara).")
-        else:
-            messages.warning(request, "Inget skickades. Kolla felmeddelanden ovan.")
+    return response
 
-    return redirect("processes:process_detail", pk=process.pk)
 
 @login_required
 def process_candidate_detail(request, process_id, candidate_id):
@@ -7252,6 +7153,11 @@ def process_candidate_detail(request, process_id, candidate_id):
             candidate_id=candidate_id,
         )
 
+        # Recently viewed candidates are regenerated first.
+        TestInvitation.objects.filter(pk=invitation.pk).update(
+            last_viewed_at=timezone.now(),
+        )
+
         mark_ai_content_outdated_if_language_changed(
             invitation,
             content_key="purpose_fit",
@@ -7364,7 +7270,7 @@ def process_invitation_statuses(request, pk):
     qs = (
         TestInvitation.objects
         .filter(process=process)
-        .select_related("candidate")
+        .without_ai_content()
         .order_by("created_at")
     )
 
@@ -7459,7 +7365,8 @@ def process_candidate_summary_stream(
             .prefetch_related(
                 "assessment_results__scores",
                 "assessment_results__import_file",
-            ),
+            )
+            .for_ai_section("summary"),
             process=process,
             candidate_id=candidate_id,
         )
@@ -7471,10 +7378,12 @@ def process_candidate_summary_stream(
     # ---------------------------------------------------------
     else:
         summary_owner = get_object_or_404(
-            TestInvitation.objects.select_related(
+            TestInvitation.objects
+            .select_related(
                 "candidate",
                 "process",
-            ),
+            )
+            .for_ai_section("summary"),
             process=process,
             candidate_id=candidate_id,
         )
@@ -7517,15 +7426,17 @@ def process_candidate_summary_stream(
     # PREVENT DUPLICATE GENERATION
     # ---------------------------------------------------------
     if summary_owner.ai_summary_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "Summary is already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=summary_owner,
+            section="summary",
         )
 
+        if response is not None:
+            return response
+
     summary_owner.ai_summary_status = "generating"
     summary_owner.save(
         update_fields=["ai_summary_status"]
@@ -7582,14 +7493,15 @@ def process_candidate_summary_stream(
 
             yield f"\n\n[Error: {str(error)}]"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=summary_owner,
+        section="summary",
+        language_code="",
+        body=generator,
         content_type="text/plain; charset=utf-8",
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 
@@ -7633,7 +7545,8 @@ def process_candidate_response_style_guidance_stream(
             .select_related(
                 "candidate",
                 "process",
-            ),
+            )
+            .for_ai_section("response_style_guidance"),
             process=process,
             candidate_id=candidate_id,
         )
@@ -7644,7 +7557,8 @@ def process_candidate_response_style_guidance_stream(
             .select_related(
                 "candidate",
                 "process",
-            ),
+            )
+            .for_ai_section("response_style_guidance"),
             process=process,
             candidate_id=candidate_id,
         )
@@ -7656,6 +7570,7 @@ def process_candidate_response_style_guidance_stream(
         result_field="ai_response_style_guidance",
         status_field="ai_response_style_guidance_status",
         language_code=language_code,
+        allow_translation=True,
     )
 
     # ---------------------------------------------------------
@@ -7762,16 +7677,17 @@ def process_candidate_response_style_guidance_stream(
     # PREVENT DUPLICATE GENERATION
     # ---------------------------------------------------------
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "Response-style guidance is already "
-                    "being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=guidance_owner,
+            section="response_style_guidance",
         )
 
+        if response is not None:
+            return response
+
     guidance_owner.ai_response_style_guidance_status = (
         "generating"
     )
@@ -7852,16 +7768,17 @@ def process_candidate_response_style_guidance_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=guidance_owner,
+        section="response_style_guidance",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 
@@ -7942,16 +7859,18 @@ def process_candidate_response_style_guidance_regenerate(
     return JsonResponse(
         {
             "ok": True,
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_"
-                    "response_style_guidance_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_"
+                        "response_style_guidance_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -8023,7 +7942,8 @@ def process_candidate_purpose_fit_stream(
             .prefetch_related(
                 "assessment_results__scores",
                 "assessment_results__import_file",
-            ),
+            )
+            .for_ai_section("purpose_fit"),
             process=process,
             candidate_id=candidate_id,
         )
@@ -8032,10 +7952,12 @@ def process_candidate_purpose_fit_stream(
 
     else:
         owner = get_object_or_404(
-            TestInvitation.objects.select_related(
+            TestInvitation.objects
+            .select_related(
                 "candidate",
                 "process",
-            ),
+            )
+            .for_ai_section("purpose_fit"),
             process=process,
             candidate_id=candidate_id,
         )
@@ -8052,6 +7974,7 @@ def process_candidate_purpose_fit_stream(
         result_field="ai_purpose_fit",
         status_field="ai_purpose_fit_status",
         language_code=language_code,
+        allow_translation=True,
     )
 
     print(
@@ -8139,20 +8062,16 @@ def process_candidate_purpose_fit_stream(
     # ---------------------------------------------------------
 
     if owner.ai_purpose_fit_status == "generating":
-        print(
-            "[PURPOSE FIT] Already marked as generating",
-            flush=True,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=owner,
+            section="purpose_fit",
         )
 
-        return JsonResponse(
-            {
-                "error": (
-                    "AI Overview is already "
-                    "being generated."
-                )
-            },
-            status=409,
-        )
+        if response is not None:
+            return response
 
     owner.ai_purpose_fit_status = "generating"
 
@@ -8261,16 +8180,17 @@ def process_candidate_purpose_fit_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=owner,
+        section="purpose_fit",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     print(
         "[PURPOSE FIT] Streaming response created",
         flush=True,
@@ -8340,26 +8260,27 @@ def process_candidate_purpose_fit_regenerate(
     return JsonResponse(
         {
             "ok": True,
-            "stream_url": reverse(
-                "processes:process_candidate_purpose_fit_stream",
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    "processes:process_candidate_purpose_fit_stream",
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
+                ),
             ),
         }
     )
 
 @login_required
 def process_create_v2(request):
-    client = SovaClient()
     error = None
 
     # --------------------------------------------------
-    # 1. Hämta Sova-projekt från API
+    # 1. Hämta Sova-projekt från den lagrade katalogen
     # --------------------------------------------------
     try:
-        accounts = client.get_accounts_with_projects()
+        accounts = get_sova_accounts_with_projects()
     except Exception as e:
         accounts = []
         error = str(e)
@@ -9608,12 +9529,14 @@ def process_candidate_summary_regenerate(
 
     return JsonResponse({
         "ok": True,
-        "stream_url": reverse(
-            "processes:process_candidate_summary_stream",
-            kwargs={
-                "process_id": process.id,
-                "candidate_id": candidate_id,
-            },
+        "stream_url": regenerate_stream_url(
+            reverse(
+                "processes:process_candidate_summary_stream",
+                kwargs={
+                    "process_id": process.id,
+                    "candidate_id": candidate_id,
+                },
+            ),
         ),
     })
 
@@ -9654,10 +9577,12 @@ def process_candidate_cognitive_interpretation_stream(
         )
 
     invitation = get_object_or_404(
-        TestInvitation.objects.select_related(
+        TestInvitation.objects
+        .select_related(
             "candidate",
             "process",
-        ),
+        )
+        .for_ai_section("cognitive_interpretation"),
         process=process,
         candidate_id=candidate_id,
     )
@@ -9671,6 +9596,7 @@ def process_candidate_cognitive_interpretation_stream(
         result_field="ai_cognitive_interpretation",
         status_field="ai_cognitive_interpretation_status",
         language_code=language_code,
+        allow_translation=True,
     )
 
     cognitive_results = extract_cognitive_results(
@@ -9760,16 +9686,17 @@ def process_candidate_cognitive_interpretation_stream(
         return response
 
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "The cognitive interpretation is "
-                    "already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=invitation,
+            section="cognitive_interpretation",
         )
 
+        if response is not None:
+            return response
+
     invitation.ai_cognitive_interpretation_status = (
         "generating"
     )
@@ -9850,16 +9777,17 @@ def process_candidate_cognitive_interpretation_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=invitation,
+        section="cognitive_interpretation",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 
@@ -9924,16 +9852,18 @@ def process_candidate_cognitive_interpretation_regenerate(
     return JsonResponse(
         {
             "ok": True,
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_cognitive_"
-                    "interpretation_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_cognitive_"
+                        "interpretation_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -9977,10 +9907,12 @@ def process_candidate_cognitive_questions_stream(
         )
 
     invitation = get_object_or_404(
-        TestInvitation.objects.select_related(
+        TestInvitation.objects
+        .select_related(
             "candidate",
             "process",
-        ),
+        )
+        .for_ai_section("cognitive_questions"),
         process=process,
         candidate_id=candidate_id,
     )
@@ -9994,6 +9926,7 @@ def process_candidate_cognitive_questions_stream(
         result_field="ai_cognitive_questions",
         status_field="ai_cognitive_questions_status",
         language_code=language_code,
+        allow_translation=True,
     )
 
     cognitive_results = extract_cognitive_results(
@@ -10084,16 +10017,17 @@ def process_candidate_cognitive_questions_stream(
         return response
 
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "The cognitive questions are "
-                    "already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=invitation,
+            section="cognitive_questions",
         )
 
+        if response is not None:
+            return response
+
     invitation.ai_cognitive_questions_status = (
         "generating"
     )
@@ -10175,16 +10109,17 @@ def process_candidate_cognitive_questions_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=invitation,
+        section="cognitive_questions",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 @login_required
@@ -10253,16 +10188,18 @@ def process_candidate_cognitive_questions_regenerate(
         {
             "ok": True,
 
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_cognitive_"
-                    "questions_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_cognitive_"
+                        "questions_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -10304,10 +10241,12 @@ def process_candidate_motivation_interpretation_stream(
         )
 
     invitation = get_object_or_404(
-        TestInvitation.objects.select_related(
+        TestInvitation.objects
+        .select_related(
             "candidate",
             "process",
-        ),
+        )
+        .for_ai_section("motivation_interpretation"),
         process=process,
         candidate_id=candidate_id,
     )
@@ -10321,6 +10260,7 @@ def process_candidate_motivation_interpretation_stream(
         result_field="ai_motivation_interpretation",
         status_field="ai_motivation_interpretation_status",
         language_code=language_code,
+        allow_translation=True,
     )
 
     motivation_results = extract_motivation_results(
@@ -10410,16 +10350,17 @@ def process_candidate_motivation_interpretation_stream(
         return response
 
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "The motivation interpretation is "
-                    "already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=invitation,
+            section="motivation_interpretation",
         )
 
+        if response is not None:
+            return response
+
     invitation.ai_motivation_interpretation_status = (
         "generating"
     )
@@ -10499,16 +10440,17 @@ def process_candidate_motivation_interpretation_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=invitation,
+        section="motivation_interpretation",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 
@@ -10572,16 +10514,18 @@ def process_candidate_motivation_interpretation_regenerate(
     return JsonResponse(
         {
             "ok": True,
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_motivation_"
-                    "interpretation_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_motivation_"
+                        "interpretation_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -10624,10 +10568,12 @@ def process_candidate_motivation_questions_stream(
         )
 
     invitation = get_object_or_404(
-        TestInvitation.objects.select_related(
+        TestInvitation.objects
+        .select_related(
             "candidate",
             "process",
-        ),
+        )
+        .for_ai_section("motivation_questions"),
         process=process,
         candidate_id=candidate_id,
     )
@@ -10641,6 +10587,7 @@ def process_candidate_motivation_questions_stream(
         result_field="ai_motivation_questions",
         status_field="ai_motivation_questions_status",
         language_code=language_code,
+        allow_translation=True,
     )
 
     motivation_results = extract_motivation_results(
@@ -10731,16 +10678,17 @@ def process_candidate_motivation_questions_stream(
         return response
 
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "The motivation questions are "
-                    "already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=invitation,
+            section="motivation_questions",
         )
 
+        if response is not None:
+            return response
+
     invitation.ai_motivation_questions_status = (
         "generating"
     )
@@ -10822,16 +10770,17 @@ def process_candidate_motivation_questions_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=invitation,
+        section="motivation_questions",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 
@@ -10900,16 +10849,18 @@ def process_candidate_motivation_questions_regenerate(
     return JsonResponse(
         {
             "ok": True,
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_motivation_"
-                    "questions_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_motivation_"
+                        "questions_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -10957,17 +10908,20 @@ def process_candidate_personality_interpretation_stream(
             .prefetch_related(
                 "assessment_results__scores",
                 "assessment_results__import_file",
-            ),
+            )
+            .for_ai_section("personality_interpretation"),
             process=process,
             candidate_id=candidate_id,
         )
 
     else:
         owner = get_object_or_404(
-            TestInvitation.objects.select_related(
+            TestInvitation.objects
+            .select_related(
                 "candidate",
                 "process",
-            ),
+            )
+            .for_ai_section("personality_interpretation"),
             process=process,
             candidate_id=candidate_id,
         )
@@ -10979,6 +10933,7 @@ def process_candidate_personality_interpretation_stream(
         result_field="ai_personality_interpretation",
         status_field="ai_personality_interpretation_status",
         language_code=language_code,
+        allow_translation=True,
     )
 
     # ---------------------------------------------------------
@@ -11083,16 +11038,17 @@ def process_candidate_personality_interpretation_stream(
     # ---------------------------------------------------------
 
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "The personality interpretation is "
-                    "already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=owner,
+            section="personality_interpretation",
         )
 
+        if response is not None:
+            return response
+
     owner.ai_personality_interpretation_status = (
         "generating"
     )
@@ -11178,16 +11134,17 @@ def process_candidate_personality_interpretation_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=owner,
+        section="personality_interpretation",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 
@@ -11257,16 +11214,18 @@ def process_candidate_personality_interpretation_regenerate(
         {
             "ok": True,
 
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_personality_"
-                    "interpretation_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_personality_"
+                        "interpretation_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -11305,16 +11264,19 @@ def process_candidate_personality_questions_stream(
             .prefetch_related(
                 "assessment_results__scores",
                 "assessment_results__import_file",
-            ),
+            )
+            .for_ai_section("personality_questions"),
             process=process,
             candidate_id=candidate_id,
         )
     else:
         invitation = get_object_or_404(
-            TestInvitation.objects.select_related(
+            TestInvitation.objects
+            .select_related(
                 "candidate",
                 "process",
-            ),
+            )
+            .for_ai_section("personality_questions"),
             process=process,
             candidate_id=candidate_id,
         )
@@ -11326,6 +11288,7 @@ def process_candidate_personality_questions_stream(
         result_field="ai_personality_questions",
         status_field="ai_personality_questions_status",
         language_code=language_code,
+        allow_translation=True,
     )
 
     personality_results = (
@@ -11414,16 +11377,17 @@ def process_candidate_personality_questions_stream(
         return response
 
     if current_status == "generating":
-        return JsonResponse(
-            {
-                "error": (
-                    "The personality questions are "
-                    "already being generated."
-                )
-            },
-            status=409,
+        # Attach to a running generation, or take over one whose
+        # worker stopped sending heartbeats.
+        response = resume_or_reclaim_generation(
+            request,
+            owner=invitation,
+            section="personality_questions",
         )
 
+        if response is not None:
+            return response
+
     invitation.ai_personality_questions_status = (
         "generating"
     )
@@ -11549,16 +11513,17 @@ def process_candidate_personality_questions_stream(
                 ensure_ascii=False,
             ) + "\n"
 
-    response = StreamingHttpResponse(
-        generator(),
+    response = generation_response(
+        request,
+        owner=invitation,
+        section="personality_questions",
+        language_code=language_code,
+        body=generator,
         content_type=(
             "application/x-ndjson; charset=utf-8"
         ),
     )
 
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-
     return response
 
 
@@ -11617,16 +11582,18 @@ def process_candidate_personality_questions_regenerate(
     return JsonResponse(
         {
             "ok": True,
-            "stream_url": reverse(
-                (
-                    "processes:"
-                    "process_candidate_personality_"
-                    "questions_stream"
+            "stream_url": regenerate_stream_url(
+                reverse(
+                    (
+                        "processes:"
+                        "process_candidate_personality_"
+                        "questions_stream"
+                    ),
+                    kwargs={
+                        "process_id": process.id,
+                        "candidate_id": candidate_id,
+                    },
                 ),
-                kwargs={
-                    "process_id": process.id,
-                    "candidate_id": candidate_id,
-                },
             ),
         }
     )
@@ -1,8 +1,22 @@
 from django.contrib import admin
-from .models import ProjectMeta
+from .models import ProjectMeta, SovaAccount, SovaProject
 
 
 @admin.register(ProjectMeta)
 class ProjectMetaAdmin(admin.ModelAdmin):
     list_display = ("provider", "account_code", "project_code", "updated_at")
-    search_fields = ("account_code", "project_code")
\ No newline at end of file
+    search_fields = ("account_code", "project_code")
+
+@admin.register(SovaAccount)
+class SovaAccountAdmin(admin.ModelAdmin):
+    list_display = ("code", "name", "sova_id", "refreshed_at")
+    search_fields = ("code", "name")
+    readonly_fields = ("refreshed_at",)
+
+
+@admin.register(SovaProject)
+class SovaProjectAdmin(admin.ModelAdmin):
+    list_display = ("code", "name", "account", "sova_id", "active", "refreshed_at")
+    list_filter = ("active", "account")
+    search_fields = ("code", "name", "account__code")
+    readonly_fields = ("refreshed_at",)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.projects.services.sova_catalogue import refresh_sova_catalogue
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the stored Sova account/project catalogue "
+        "from the Sova API."
+    )
+
+    def handle(self, *args, **options):
+        try:
+            account_count, project_count = refresh_sova_catalogue()
+        except Exception as e:
+            raise CommandError(f"Sova catalogue refresh failed: {e}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {account_count} accounts and "
+                f"{project_count} projects."
+            )
+        )
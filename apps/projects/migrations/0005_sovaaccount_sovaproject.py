@@ -0,0 +1,49 @@
+# Generated by Django 6.0.1 on 2026-10-17 20:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_projectmeta_icon'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SovaAccount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(default='sova', max_length=50)),
+                ('code', models.CharField(max_length=255)),
+                ('name', models.CharField(blank=True, default='', max_length=255)),
+                ('sova_id', models.CharField(blank=True, default='', max_length=100)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['position', 'code'],
+                'unique_together': {('provider', 'code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SovaProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=255)),
+                ('name', models.CharField(blank=True, default='', max_length=255)),
+                ('sova_id', models.CharField(blank=True, default='', max_length=100)),
+                ('active', models.BooleanField(default=False)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='projects', to='projects.sovaaccount')),
+            ],
+            options={
+                'ordering': ['position', 'code'],
+                'unique_together': {('account', 'code')},
+            },
+        ),
+    ]
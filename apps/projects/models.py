@@ -28,3 +28,60 @@ class ProjectMeta(models.Model):
     def __str__(self):
         return f"{self.provider}:{self.account_code}:{self.project_code}"
     
+
+
+class SovaAccount(models.Model):
+    """
+    Local copy of one Sova account, refreshed from the Sova API by
+    refresh_sova_catalogue. Read through
+    apps.projects.services.sova_catalogue instead of calling Sova.
+    """
+
+    provider = models.CharField(max_length=50, default="sova")
+    code = models.CharField(max_length=255)
+    name = models.CharField(max_length=255, blank=True, default="")
+    sova_id = models.CharField(max_length=100, blank=True, default="")
+
+    # Raw account dict from Sova, without its projects.
+    data = models.JSONField(default=dict, blank=True)
+
+    position = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("provider", "code")
+        ordering = ["position", "code"]
+
+    def __str__(self):
+        return f"{self.provider}:{self.code}"
+
+
+class SovaProject(models.Model):
+    """
+    Local copy of one Sova project within a SovaAccount.
+
+    Talena's own project metadata stays in ProjectMeta.
+    """
+
+    account = models.ForeignKey(
+        SovaAccount,
+        on_delete=models.CASCADE,
+        related_name="projects",
+    )
+    code = models.CharField(max_length=255)
+    name = models.CharField(max_length=255, blank=True, default="")
+    sova_id = models.CharField(max_length=100, blank=True, default="")
+    active = models.BooleanField(default=False)
+
+    # Raw project dict from Sova.
+    data = models.JSONField(default=dict, blank=True)
+
+    position = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("account", "code")
+        ordering = ["position", "code"]
+
+    def __str__(self):
+        return f"{self.account.code}:{self.code}"
@@ -0,0 +1,268 @@
+"""
+Cached Sova account/project catalogue.
+
+Reads go through three layers:
+
+1. A short-lived in-process cache (SOVA_CATALOGUE_CACHE_TTL seconds).
+2. The SovaAccount/SovaProject tables.
+3. The Sova API, only when the tables are empty or on an explicit
+   refresh.
+
+When the stored snapshot is older than SOVA_CATALOGUE_MAX_AGE the
+stored data is still returned and a refresh is started in a
+background thread (stale-while-revalidate). The
+refresh_sova_catalogue management command refreshes it on a schedule.
+"""
+
+import copy
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Max, Prefetch
+from django.utils import timezone
+
+from apps.projects.models import SovaAccount, SovaProject
+
+logger = logging.getLogger(__name__)
+
+
+PROVIDER = "sova"
+
+DEFAULT_CACHE_TTL = 60
+DEFAULT_MAX_AGE = 15 * 60
+
+
+_cache_lock = threading.Lock()
+_cache = {
+    "accounts": None,
+    "refreshed_at": None,
+    "loaded_at": 0.0,
+}
+
+_refresh_lock = threading.Lock()
+_refresh_thread = None
+
+
+def _cache_ttl():
+    return getattr(settings, "SOVA_CATALOGUE_CACHE_TTL", DEFAULT_CACHE_TTL)
+
+
+def _max_age():
+    return getattr(settings, "SOVA_CATALOGUE_MAX_AGE", DEFAULT_MAX_AGE)
+
+
+def invalidate_sova_catalogue_cache():
+    with _cache_lock:
+        _cache["accounts"] = None
+        _cache["refreshed_at"] = None
+        _cache["loaded_at"] = 0.0
+
+
+def _fetch_live_accounts():
+    from apps.core.integrations.sova import SovaClient
+
+    return SovaClient().get_accounts_with_projects()
+
+
+def refresh_sova_catalogue(accounts=None):
+    """
+    Fetch the catalogue from Sova (unless accounts is given) and store
+    it. Accounts and projects that Sova no longer returns are removed.
+
+    Returns (account_count, project_count).
+    """
+
+    if accounts is None:
+        accounts = _fetch_live_accounts()
+
+    now = timezone.now()
+    project_count = 0
+
+    with transaction.atomic():
+        seen_account_ids = []
+
+        for account_position, account in enumerate(accounts or []):
+            code = (account.get("code") or "").strip()
+
+            if not code:
+                continue
+
+            account_data = {
+                key: value
+                for key, value in account.items()
+                if key not in ("projects", "projects_error")
+            }
+
+            account_obj, _ = SovaAccount.objects.update_or_create(
+                provider=PROVIDER,
+                code=code,
+                defaults={
+                    "name": (account.get("name") or "").strip(),
+                    "sova_id": str(account.get("id") or ""),
+                    "data": account_data,
+                    "position": account_position,
+                    "refreshed_at": now,
+                },
+            )
+            seen_account_ids.append(account_obj.id)
+
+            if account.get("projects_error"):
+                # Keep the previously stored projects for an account
+                # whose projects could not be fetched this time.
+                project_count += account_obj.projects.count()
+                continue
+
+            seen_project_ids = []
+
+            for project_position, project in enumerate(account.get("projects") or []):
+                project_code = (project.get("code") or "").strip()
+
+                if not project_code:
+                    continue
+
+                project_obj, _ = SovaProject.objects.update_or_create(
+                    account=account_obj,
+                    code=project_code,
+                    defaults={
+                        "name": (project.get("name") or "").strip(),
+                        "sova_id": str(project.get("id") or ""),
+                        "active": bool(project.get("active")),
+                        "data": project,
+                        "position": project_position,
+                        "refreshed_at": now,
+                    },
+                )
+                seen_project_ids.append(project_obj.id)
+
+            project_count += len(seen_project_ids)
+
+            (
+                SovaProject.objects
+                .filter(account=account_obj)
+                .exclude(id__in=seen_project_ids)
+                .delete()
+            )
+
+        (
+            SovaAccount.objects
+            .filter(provider=PROVIDER)
+            .exclude(id__in=seen_account_ids)
+            .delete()
+        )
+
+    invalidate_sova_catalogue_cache()
+
+    return len(seen_account_ids), project_count
+
+
+def _load_stored_accounts():
+    """
+    Rebuild the get_accounts_with_projects() structure from the
+    stored catalogue. Returns (accounts, refreshed_at).
+    """
+
+    account_qs = (
+        SovaAccount.objects
+        .filter(provider=PROVIDER)
+        .prefetch_related(
+            Prefetch(
+                "projects",
+                queryset=SovaProject.objects.order_by("position", "code"),
+            )
+        )
+        .order_by("position", "code")
+    )
+
+    accounts = []
+
+    for account_obj in account_qs:
+        account = dict(account_obj.data or {})
+        account.setdefault("code", account_obj.code)
+        account["projects"] = [
+            dict(project_obj.data or {})
+            for project_obj in account_obj.projects.all()
+        ]
+        accounts.append(account)
+
+    refreshed_at = (
+        SovaAccount.objects
+        .filter(provider=PROVIDER)
+        .aggregate(latest=Max("refreshed_at"))["latest"]
+    )
+
+    return accounts, refreshed_at
+
+
+def _background_refresh():
+    try:
+        refresh_sova_catalogue()
+    except Exception:
+        logger.exception("Background Sova catalogue refresh failed")
+    finally:
+        connections.close_all()
+
+
+def _start_background_refresh():
+    """
+    Start at most one background refresh per process.
+    """
+
+    global _refresh_thread
+
+    with _refresh_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return False
+
+        _refresh_thread = threading.Thread(
+            target=_background_refresh,
+            name="sova-catalogue-refresh",
+            daemon=True,
+        )
+        _refresh_thread.start()
+
+    return True
+
+
+def get_sova_accounts_with_projects(*, force_refresh=False):
+    """
+    Drop-in replacement for SovaClient().get_accounts_with_projects().
+
+    Returns a fresh copy on every call, so callers may annotate the
+    dicts. Raises only when nothing is stored yet and the live fetch
+    fails.
+    """
+
+    if force_refresh:
+        refresh_sova_catalogue()
+
+    with _cache_lock:
+        cached = _cache["accounts"]
+        cached_refreshed_at = _cache["refreshed_at"]
+        is_fresh = (
+            cached is not None
+            and time.monotonic() - _cache["loaded_at"] < _cache_ttl()
+        )
+
+    if not is_fresh:
+        cached, cached_refreshed_at = _load_stored_accounts()
+
+        if not cached:
+            refresh_sova_catalogue()
+            cached, cached_refreshed_at = _load_stored_accounts()
+
+        with _cache_lock:
+            _cache["accounts"] = cached
+            _cache["refreshed_at"] = cached_refreshed_at
+            _cache["loaded_at"] = time.monotonic()
+
+    if (
+        cached_refreshed_at is not None
+        and (timezone.now() - cached_refreshed_at).total_seconds() > _max_age()
+    ):
+        _start_background_refresh()
+
+    return copy.deepcopy(cached)
+
@@ -1,5 +1,6 @@
 from django.shortcuts import render
 from apps.core.integrations.sova import SovaClient
+from .services.sova_catalogue import get_sova_accounts_with_projects
 import os
 from django.contrib.auth.decorators import login_required
 from .models import ProjectMeta
@@ -20,7 +21,9 @@ def sova_projects(request):
         debug["has_user"] = bool(os.getenv("SOVA_USERNAME"))
         debug["has_pass"] = bool(os.getenv("SOVA_PASSWORD"))
 
-        accounts = client.get_accounts_with_projects()
+        accounts = get_sova_accounts_with_projects(
+            force_refresh=request.GET.get("refresh") == "1",
+        )
         debug["accounts_len"] = len(accounts)
         for a in accounts:
             a["projects_len"] = len(a.get("projects", []))
@@ -41,7 +44,6 @@ def sova_projects(request):
 
 @login_required
 def sova_project_detail(request, account_code, project_code):
-    client = SovaClient()
     error = None
     project = None
 
@@ -53,9 +55,16 @@ def sova_project_detail(request, account_code, project_code):
         project_code=project_code.strip(),
     ).first()
 
-    # 2) Hämta projektet från SOVA
+    # 2) Hämta projektet från den lagrade SOVA-katalogen
     try:
-        projects = client.get_projects_for_account(account_code)
+        projects = next(
+            (
+                a.get("projects") or []
+                for a in get_sova_accounts_with_projects()
+                if (a.get("code") or "").strip() == account_code.strip()
+            ),
+            [],
+        )
         project = next(
             (
                 p for p in projects
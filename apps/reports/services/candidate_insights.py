@@ -7,6 +7,7 @@ from apps.core.ai.openai_client import (
     get_openai_client,
     get_chat_model,
 )
+from apps.core.ai.result_cache import discard_result, last_result_key
 
 
 def _clean_score_items(
@@ -537,6 +538,7 @@ def generate_general_candidate_insights(
     try:
         parsed = json.loads(content)
     except json.JSONDecodeError as exc:
+        discard_result(last_result_key())
         raise ValueError(
             "OpenAI returned invalid JSON for general candidate insights."
         ) from exc
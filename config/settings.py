@@ -59,6 +59,118 @@ SOVA_WEBHOOK_PROD_SECRET = os.getenv(
     "",
 )
 
+# Store incoming Sova webhooks in the WebhookDelivery inbox and let the
+# process_webhook_deliveries worker apply them. Off by default: the
+# deliveries are then applied inside the request. Only turn it on where
+# the worker runs (manage.py process_webhook_deliveries --loop).
+SOVA_WEBHOOK_INBOX_ENABLED = env_bool("SOVA_WEBHOOK_INBOX_ENABLED", "False")
+
+# Sova account/project catalogue (apps.projects.services.sova_catalogue).
+# Seconds a worker keeps the catalogue in memory, and seconds before the
+# stored copy is refreshed from Sova in the background.
+SOVA_CATALOGUE_CACHE_TTL = int(os.getenv("SOVA_CATALOGUE_CACHE_TTL", "60"))
+SOVA_CATALOGUE_MAX_AGE = int(os.getenv("SOVA_CATALOGUE_MAX_AGE", "900"))
+
+# Seconds a stored Sova project-candidates snapshot is used before it
+# is fetched again (apps.core.integrations.sova_results).
+SOVA_RESULTS_SNAPSHOT_TTL = int(os.getenv("SOVA_RESULTS_SNAPSHOT_TTL", "60"))
+
+# Bulk send of assessments (apps.processes.services.send_tests).
+# Sova orders in flight at once, and whether the send runs in a
+# background thread while the process page polls for progress.
+SOVA_ORDER_CONCURRENCY = int(os.getenv("SOVA_ORDER_CONCURRENCY", "6"))
+BULK_SEND_ASYNC = env_bool("BULK_SEND_ASYNC", "True")
+
+# AI section generation (apps.processes.services.ai_generation_jobs).
+# The stream views run generations in a per-process worker pool and the
+# browser polls the persisted output. Set AI_GENERATION_JOBS to False to
+# stream inside the request instead.
+AI_GENERATION_JOBS = env_bool("AI_GENERATION_JOBS", "True")
+# Seconds without output before a running generation is considered
+# abandoned and the next request may take it over.
+AI_GENERATION_LEASE_SECONDS = int(os.getenv("AI_GENERATION_LEASE_SECONDS", "120"))
+
+# Generate a candidate's AI sections as soon as Sova reports the
+# assessments completed (apps.processes.services.ai_pregeneration).
+# Sections generated at once per process, and the language used
+# (defaults to LANGUAGE_CODE).
+AI_PREGENERATE_ON_COMPLETION = env_bool("AI_PREGENERATE_ON_COMPLETION", "False")
+AI_PREGENERATION_CONCURRENCY = int(os.getenv("AI_PREGENERATION_CONCURRENCY", "3"))
+AI_PREGENERATION_LANGUAGE = os.getenv("AI_PREGENERATION_LANGUAGE", "")
+
+# Sections regenerated at once by "update all AI insights"
+# (apps.processes.services.ai_update_runs).
+AI_UPDATE_RUN_CONCURRENCY = int(os.getenv("AI_UPDATE_RUN_CONCURRENCY", "4"))
+
+# Regenerate every candidate's outdated AI sections in the background
+# after a process's purpose or context changes (apps.processes.services.
+# ai_regeneration_runs), instead of waiting for each candidate to be
+# opened. Candidates updated at once; a 429 lowers this temporarily.
+AI_REGENERATE_ON_PROCESS_CHANGE = env_bool("AI_REGENERATE_ON_PROCESS_CHANGE", "False")
+AI_REGENERATION_CONCURRENCY = int(os.getenv("AI_REGENERATION_CONCURRENCY", "3"))
+
+# Generation worker pool size per process. By default room for a full
+# process-wide regeneration (AI_REGENERATION_CONCURRENCY candidates of
+# AI_UPDATE_RUN_CONCURRENCY sections each) plus recruiters' own requests.
+AI_GENERATION_WORKERS = int(os.getenv(
+    "AI_GENERATION_WORKERS",
+    str(AI_REGENERATION_CONCURRENCY * AI_UPDATE_RUN_CONCURRENCY + 8),
+))
+
+# Switching a candidate's AI sections to another language restores the
+# stored variant in that language (apps.processes.services.
+# ai_content_variants). With AI_TRANSLATE_LANGUAGE_VARIANTS a missing
+# language is translated from the saved content instead of generated,
+# inside the section's stream request, so AI_TRANSLATION_TIMEOUT keeps
+# that request short; a timed-out section is generated instead.
+AI_TRANSLATE_LANGUAGE_VARIANTS = env_bool("AI_TRANSLATE_LANGUAGE_VARIANTS", "False")
+AI_TRANSLATION_TIMEOUT = float(os.getenv("AI_TRANSLATION_TIMEOUT", "30"))
+
+# Active AIPromptTemplate overrides are cached per worker
+# (apps.core.ai.prompt_templates). Saves clear the local cache; other
+# workers check for changes at most this often. 0 disables the cache.
+AI_PROMPT_CACHE_CHECK_SECONDS = float(os.getenv("AI_PROMPT_CACHE_CHECK_SECONDS", "5"))
+
+# Answers to identical chat completion requests are reused from the
+# AIResultCache table (apps.core.ai.result_cache). Change
+# AI_RESULT_CACHE_VERSION to retire every stored answer at once.
+AI_RESULT_CACHE = env_bool("AI_RESULT_CACHE", "True")
+AI_RESULT_CACHE_VERSION = os.getenv("AI_RESULT_CACHE_VERSION", "1")
+AI_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("AI_RESULT_CACHE_MAX_ENTRIES", "5000"))
+AI_RESULT_CACHE_MAX_AGE_DAYS = int(os.getenv("AI_RESULT_CACHE_MAX_AGE_DAYS", "30"))
+
+# Shared OpenAI clients (apps.core.ai.openai_client). Seconds before a
+# request (or a pause in a stream) times out, retries on connection
+# errors, 429 and 5xx, and the connection pool kept alive per process.
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_HTTP2 = env_bool("OPENAI_HTTP2", "True")
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))
+
+# Shared OpenAI budget for all workers (apps.core.ai.rate_limits), per
+# model. Set to a little below the organisation's limits; 0 turns the
+# budget off. Background work may use AI_RATE_LIMIT_BACKGROUND_SHARE of
+# it, and callers wait at most AI_RATE_LIMIT_MAX_WAIT_* seconds for
+# budget before sending anyway.
+AI_RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv("AI_RATE_LIMIT_REQUESTS_PER_MINUTE", "0"))
+AI_RATE_LIMIT_TOKENS_PER_MINUTE = int(os.getenv("AI_RATE_LIMIT_TOKENS_PER_MINUTE", "0"))
+AI_RATE_LIMIT_COMPLETION_ESTIMATE = int(os.getenv("AI_RATE_LIMIT_COMPLETION_ESTIMATE", "1500"))
+AI_RATE_LIMIT_BACKGROUND_SHARE = float(os.getenv("AI_RATE_LIMIT_BACKGROUND_SHARE", "0.8"))
+AI_RATE_LIMIT_MAX_WAIT_INTERACTIVE = int(os.getenv("AI_RATE_LIMIT_MAX_WAIT_INTERACTIVE", "120"))
+AI_RATE_LIMIT_MAX_WAIT_BACKGROUND = int(os.getenv("AI_RATE_LIMIT_MAX_WAIT_BACKGROUND", "900"))
+
+# Record tokens, latency and retries of every model call as AICallMetric
+# rows (apps.core.ai.telemetry), shown on the admin AI usage page.
+AI_CALL_METRICS = env_bool("AI_CALL_METRICS", "True")
+
+# cognitive_questions and motivation_questions ask for JSON-schema
+# constrained answers (apps.core.ai.structured_output). Malformed JSON is
+# repaired locally before a second model call either way.
+AI_STRUCTURED_OUTPUT = env_bool("AI_STRUCTURED_OUTPUT", "True")
+
 # --- Database --- #
 DATABASE_URL = os.getenv("DATABASE_URL", "").strip()
 DB_HOST = (os.getenv("DB_HOST") or "").strip()
@@ -268,6 +380,13 @@ AUTH_PASSWORD_VALIDATORS = [
 
 SOVA_WEBHOOK_DEBUG_TO_FILE = os.environ.get("SOVA_WEBHOOK_DEBUG_TO_FILE", "False") == "True"
 
+# Webhook capture store (apps.core.integrations.webhook_capture), used
+# when SOVA_WEBHOOK_DEBUG_TO_FILE is on. Captures are gzip files; the
+# oldest are evicted once the directory exceeds the byte budget.
+SOVA_WEBHOOK_CAPTURE_DIR = os.getenv("SOVA_WEBHOOK_CAPTURE_DIR", os.path.join(BASE_DIR, "debug_webhooks"))
+SOVA_WEBHOOK_CAPTURE_MAX_BYTES = int(os.getenv("SOVA_WEBHOOK_CAPTURE_MAX_BYTES", str(50 * 1024 * 1024)))
+SOVA_WEBHOOK_CAPTURE_SAMPLE_RATE = float(os.getenv("SOVA_WEBHOOK_CAPTURE_SAMPLE_RATE", "1.0"))
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -0,0 +1,161 @@
+/*
+ * Talena AI generation jobs
+ *
+ * The AI stream views run generations in a background worker and,
+ * when asked with the X-AI-Job header, answer 202 with a job instead
+ * of holding the request open. talenaAIFetch polls that job and
+ * returns a normal fetch Response whose body streams the generated
+ * output, so existing stream readers keep working unchanged.
+ *
+ * Saved results, 4xx errors and 409 "already generating" responses
+ * are returned exactly as the server sent them. If a section is
+ * already generating, the server answers with the running job and
+ * its output is replayed from the start.
+ *
+ * Polls that fail (network drop, deploy restart) are retried from the
+ * last received offset, so no output is lost or repeated.
+ */
+(function () {
+  const POLL_INTERVAL_MS = 400;
+  const MAX_POLL_RETRIES = 8;
+
+  function sleep(ms) {
+    return new Promise(
+      (resolve) => setTimeout(resolve, ms)
+    );
+  }
+
+  function failureChunk(job) {
+    const message =
+      job.error
+      || "The AI generation stopped unexpectedly.";
+
+    if (
+      (job.content_type || "").indexOf("ndjson") !== -1
+    ) {
+      return JSON.stringify({
+        type: "error",
+        message: message,
+      }) + "\n";
+    }
+
+    return "\n\n[Error: " + message + "]";
+  }
+
+  function jobBody(job) {
+    const encoder =
+      new TextEncoder();
+
+    let offset =
+      job.next_offset || 0;
+
+    let failures = 0;
+
+    async function poll() {
+      const separator =
+        job.poll_url.indexOf("?") === -1 ? "?" : "&";
+
+      const response = await fetch(
+        job.poll_url + separator + "offset=" + offset,
+        {
+          method: "GET",
+          credentials: "same-origin",
+          headers: {
+            "X-Requested-With": "XMLHttpRequest",
+          },
+        }
+      );
+
+      if (!response.ok) {
+        throw new Error(
+          "Could not read the AI generation."
+        );
+      }
+
+      return response.json();
+    }
+
+    return new ReadableStream({
+      async pull(controller) {
+        while (true) {
+          let data;
+
+          try {
+            data = await poll();
+            failures = 0;
+
+          } catch (error) {
+            failures += 1;
+
+            if (failures > MAX_POLL_RETRIES) {
+              controller.error(error);
+              return;
+            }
+
+            await sleep(POLL_INTERVAL_MS * failures);
+            continue;
+          }
+
+          offset = data.next_offset;
+
+          if (data.chunk) {
+            controller.enqueue(
+              encoder.encode(data.chunk)
+            );
+          }
+
+          if (data.finished) {
+            if (data.status === "failed") {
+              controller.enqueue(
+                encoder.encode(failureChunk(data))
+              );
+            }
+
+            controller.close();
+            return;
+          }
+
+          if (data.chunk) {
+            return;
+          }
+
+          await sleep(POLL_INTERVAL_MS);
+        }
+      },
+    });
+  }
+
+  async function talenaAIFetch(url, options) {
+    options = options || {};
+
+    const headers =
+      new Headers(options.headers || {});
+
+    headers.set("X-AI-Job", "1");
+
+    const response = await fetch(
+      url,
+      Object.assign({}, options, { headers: headers })
+    );
+
+    if (response.status !== 202) {
+      return response;
+    }
+
+    const job =
+      await response.json();
+
+    return new Response(
+      jobBody(job),
+      {
+        status: 200,
+        headers: {
+          "Content-Type": job.content_type,
+          "X-AI-Job-Id": String(job.id),
+        },
+      }
+    );
+  }
+
+  window.talenaAIFetch = talenaAIFetch;
+})();
@@ -478,7 +478,7 @@
           );
 
           const response =
-            await fetch(
+            await window.talenaAIFetch(
               url,
               {
                 method: "GET",